@@ -1,9 +1,12 @@
+import { gunzipSync } from "node:zlib";
 import { parseHours } from "./hours";
 import { findNutritionKey } from "./nutrition";
 import type { HalalMenu, Restaurant } from "./types";
 
+// The gzip copy the scrape workflow commits next to halal_menus.txt
+// (raw.githubusercontent serves it as plain bytes, so it is gunzipped here).
 const MENU_URL =
-  "https://raw.githubusercontent.com/Naimy441/duke_halal/main/outputs/halal_menus.txt";
+  "https://raw.githubusercontent.com/Naimy441/duke_halal/main/outputs/halal_menus.txt.gz";
 
 // GitHub Actions re-scrapes twice daily; refresh at most every 30 minutes.
 const REVALIDATE_SECONDS = 1800;
@@ -59,7 +62,7 @@ export function parseHalalMenus(text: string): HalalMenu {
 async function fetchMenuText(): Promise<string> {
   const res = await fetch(MENU_URL, { next: { revalidate: REVALIDATE_SECONDS } });
   if (!res.ok) throw new Error(`Failed to fetch halal menus: ${res.status}`);
-  return res.text();
+  return gunzipSync(Buffer.from(await res.arrayBuffer())).toString("utf8");
 }
 
 async function readLocalMenuText(): Promise<string | null> {
@@ -1,13 +1,14 @@
 // Extracts nutrition facts for halal items from the repo's scrape output
-// (../outputs/restaurants/*.json) into a compact data/nutrition.json that the
-// app bundles statically. Re-run after a fresh nutrition scrape:
+// (the minified shards in ../outputs/restaurants/min/*.json) into a compact
+// data/nutrition.json that the app bundles statically. Re-run after a fresh
+// nutrition scrape (nutri_split.py refreshes the minified shards):
 //   node scripts/extract-nutrition.mjs
 import { readdirSync, readFileSync, writeFileSync, mkdirSync } from "node:fs";
 import { fileURLToPath } from "node:url";
 import path from "node:path";
 
 const here = path.dirname(fileURLToPath(import.meta.url));
-const restaurantsDir = path.resolve(here, "../../outputs/restaurants");
+const restaurantsDir = path.resolve(here, "../../outputs/restaurants/min");
 const outFile = path.resolve(here, "../data/nutrition.json");
 
 const normalize = (s) =>
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+End-to-end crawl benchmark against the local mock NetNutrition site.
+
+Starts mock_netnutrition.py at the requested size and latency, runs each
+scraper against it in a scratch directory (so the real outputs/ and docs/ are
+never touched) and appends one entry per scraper to
+outputs/bench/crawl_results.json: wall time, items, items per second,
+WebDriver calls and the requests the mock served. Entries carry the git
+revision, so runs before and after a change can be compared directly.
+
+    python src/bench_crawl.py --units 30 --menus 10 --items 50 --latency-ms 50
+    python src/bench_crawl.py --http --scrapers nutri_scrape -- --workers 1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from mock_netnutrition import MockSite, start_server, add_site_arguments
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = "outputs/bench/crawl_results.json"
+SCRAPERS = ("bot_scrape", "full_scrape", "nutri_scrape")
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _mock_request(base_url, path, method="GET"):
+    root = base_url.split("/nn-prod/")[0]
+    request = urllib.request.Request(root + path, method=method, data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read() or b"{}")
+
+
+def run_scraper(scraper, base_url, http, extra_args):
+    """Run one scraper in a scratch directory and return its metrics"""
+    with tempfile.TemporaryDirectory(prefix=f"bench_{scraper}_") as workdir:
+        os.makedirs(os.path.join(workdir, "outputs"))
+        os.makedirs(os.path.join(workdir, "docs", "outputs"))
+        metrics_path = os.path.join(workdir, "metrics.json")
+        command = [sys.executable, os.path.join(SRC_DIR, f"{scraper}.py"),
+                   "--base-url", base_url, "--metrics", metrics_path,
+                   # the mock doesn't throttle, so measure the crawl itself (pass -- --rate N to compare)
+                   "--rate", "0"]
+        if http:
+            command.append("--http")
+        if scraper == "nutri_scrape":
+            command.append("--no-label-cache")
+        command.extend(extra_args)
+
+        _mock_request(base_url, "/__reset", "POST")
+        start = time.perf_counter()
+        completed = subprocess.run(command, cwd=workdir, capture_output=True, text=True)
+        wall = time.perf_counter() - start
+        if completed.returncode != 0:
+            print(completed.stdout[-2000:])
+            print(completed.stderr[-2000:])
+            raise SystemExit(f"[X] {scraper} exited with {completed.returncode}")
+
+        with open(metrics_path, "r", encoding="utf-8") as f:
+            metrics = json.load(f)
+        metrics["process_wall_seconds"] = round(wall, 3)
+        metrics["mock_requests"] = _mock_request(base_url, "/__stats")
+        return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against a local mock NetNutrition",
+                                     epilog="Arguments after -- are passed to every scraper.")
+    add_site_arguments(parser)
+    parser.add_argument("--http", action="store_true", help="benchmark the browserless crawl")
+    parser.add_argument("--scrapers", nargs="+", default=list(SCRAPERS), choices=SCRAPERS)
+    parser.add_argument("--label", default="", help="free-form note stored with the results")
+    parser.add_argument("extra", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    extra_args = [a for a in args.extra if a != "--"]
+
+    site = MockSite(args.units, args.menus, args.items)
+    server, base_url = start_server(site, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    print(f"[✓] Mock NetNutrition at {base_url}")
+
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "label": args.label,
+        "site": {"units": args.units, "menus": args.menus, "items": args.items,
+                 "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms},
+        "mode": "http" if args.http else "chrome",
+        "scraper_args": extra_args,
+        "results": {},
+    }
+    try:
+        for scraper in args.scrapers:
+            print(f"[⚙] Running {scraper}...")
+            entry["results"][scraper] = run_scraper(scraper, base_url, args.http, extra_args)
+    finally:
+        server.shutdown()
+
+    print(f"\n{'scraper':<14}{'wall s':>9}{'items':>8}{'items/s':>9}{'WebDriver':>11}{'requests':>10}")
+    for scraper, m in entry["results"].items():
+        print(f"{scraper:<14}{m['wall_seconds']:>9.1f}{m['items']:>8}{m['items_per_second']:>9.1f}"
+              f"{m['webdriver_calls']['total']:>11}{sum(m['mock_requests'].values()):>10}")
+
+    history = []
+    if os.path.exists(RESULTS_PATH):
+        with open(RESULTS_PATH, "r", encoding="utf-8") as f:
+            history = json.load(f)
+    history.append(entry)
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    print(f"\n[✓] Results appended to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+ICS parsing benchmark: ics_parser.py against the regex extraction
+get_muslim_calendar.py used before it.
+
+Builds a synthetic DukeGroups-style feed (CRLF line ends, lines folded at 75
+octets, long descriptions, a mix of UTC and TZID start times and, unless
+--recurring 0, some weekly recurring events), then times parsing it into
+sorted events both ways, a few times over, and records the best time and the
+number of events each way could place in time (the regex version sorted any
+start it could not read, like a TZID one, to the very end). The streaming
+parser is also timed reading the feed in 64 KB chunks, as from a download.
+The three take turns run by run, so a busy machine slows them alike.
+Entries are appended to outputs/bench/ics_parse.json with the git revision.
+
+    python src/bench_ics.py --events 5000 --recurring 50 --runs 5
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+
+from ics_parser import parse_events
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = "outputs/bench/ics_parse.json"
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _fold(line):
+    """RFC 5545 folding: at most 75 characters per physical line"""
+    parts = [line[:75]]
+    for i in range(75, len(line), 74):
+        parts.append(" " + line[i:i + 74])
+    return "\r\n".join(parts)
+
+
+def synthetic_feed(events, recurring, tzid_every=3):
+    start = datetime(2026, 10, 1, 18, 0)
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//CampusGroups//EN"]
+    for i in range(events):
+        when = start + timedelta(hours=7 * i)
+        lines += ["BEGIN:VEVENT", f"UID:event-{i}@duke.campusgroups.com", f"DTSTAMP:{start:%Y%m%dT%H%M%S}Z",
+                  f"SUMMARY:Community Event {i + 1}\\, with dinner"]
+        if i % tzid_every == 0:
+            lines += [f"DTSTART;TZID=America/New_York:{when:%Y%m%dT%H%M%S}",
+                      f"DTEND;TZID=America/New_York:{when + timedelta(hours=2):%Y%m%dT%H%M%S}"]
+        else:
+            lines += [f"DTSTART:{when:%Y%m%dT%H%M%S}Z", f"DTEND:{when + timedelta(hours=2):%Y%m%dT%H%M%S}Z"]
+        if i < recurring:
+            lines.append("RRULE:FREQ=WEEKLY;COUNT=12")
+        lines += [
+            "DESCRIPTION:" + "Join us for dinner and a talk on community and service. . . " * 4
+            + f"Everyone is welcome!\\nRSVP at https://duke.campusgroups.com/rsvp?id={1000 + i}",
+            "LOCATION:Center for Muslim Life\\, West Campus",
+            f"URL:https://duke.campusgroups.com/event/{1000 + i}",
+            "END:VEVENT",
+        ]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(_fold(line) for line in lines) + "\r\n"
+
+
+# The extraction get_muslim_calendar.py used before ics_parser.py, kept as the baseline
+def _find_field(field, block):
+    match = re.search(rf"{field}(?:;[^:]*)*:(.*)", block)
+    return match.group(1).strip() if match else ""
+
+
+def _regex_datetime(dt_str):
+    try:
+        return datetime.strptime(dt_str, "%Y%m%dT%H%M%SZ")
+    except ValueError:
+        return datetime.max
+
+
+def regex_parse(ics_text):
+    blocks = re.findall(r"BEGIN:VEVENT(.*?)END:VEVENT", ics_text, re.DOTALL)
+    events = [{field.lower(): _find_field(field, block)
+               for field in ("SUMMARY", "DESCRIPTION", "LOCATION", "URL", "DTSTART", "DTEND")}
+              for block in blocks]
+    events.sort(key=lambda e: _regex_datetime(e["dtstart"]))
+    return events
+
+
+def measure(parsers, runs):
+    """
+    Time each of parsers ({name: function}) runs times, taking turns so that
+    load on the machine falls on all of them alike; returns {name: (result, times)}
+    """
+    times = {name: [] for name in parsers}
+    results = {}
+    for _ in range(runs):
+        for name, parse in parsers.items():
+            start = time.perf_counter()
+            results[name] = parse()
+            times[name].append(time.perf_counter() - start)
+    return {name: (results[name], {"best_ms": round(min(t) * 1000, 2), "mean_ms": round(sum(t) / len(t) * 1000, 2)})
+            for name, t in times.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming ICS parser against the old regex extraction")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--recurring", type=int, default=50, help="of those, weekly events with 12 occurrences")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--label", default="", help="free-form note stored with the results")
+    args = parser.parse_args()
+
+    feed = synthetic_feed(args.events, args.recurring)
+    window_end = datetime(2026, 10, 1, tzinfo=timezone.utc) + timedelta(days=3650)
+    chunks = [feed[i:i + 65536] for i in range(0, len(feed), 65536)]
+    print(f"[⚙] Feed: {args.events} events ({args.recurring} recurring), {len(feed) / 1024:.0f} KB")
+
+    measured = measure({
+        "regex": lambda: regex_parse(feed),
+        "ics_parser": lambda: parse_events(feed, window_end=window_end),
+        "ics_parser, 64 KB chunks": lambda: parse_events(iter(chunks), window_end=window_end),
+    }, args.runs)
+    (regex_events, regex_times), (parsed, parser_times), (streamed, stream_times) = measured.values()
+    assert parsed == streamed
+
+    results = {
+        "regex": dict(regex_times, events=len(regex_events),
+                      unreadable_starts=sum(_regex_datetime(e["dtstart"]) == datetime.max for e in regex_events)),
+        "ics_parser": dict(parser_times, events=len(parsed), unreadable_starts=0),
+        "ics_parser, 64 KB chunks": dict(stream_times, events=len(streamed), unreadable_starts=0),
+    }
+    print(f"\n{'parser':<28}{'best ms':>10}{'mean ms':>10}{'events':>9}{'no start':>10}")
+    for name, r in results.items():
+        print(f"{name:<28}{r['best_ms']:>10.1f}{r['mean_ms']:>10.1f}{r['events']:>9}{r['unreadable_starts']:>10}")
+
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "label": args.label,
+        "data": {"events": args.events, "recurring": args.recurring, "feed_kb": round(len(feed) / 1024, 1)},
+        "results": results,
+    }
+    history = []
+    if os.path.exists(RESULTS_PATH):
+        with open(RESULTS_PATH, "r", encoding="utf-8") as f:
+            history = json.load(f)
+    history.append(entry)
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    print(f"\n[✓] Results appended to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
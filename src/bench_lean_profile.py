@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Before/after measurement for the lean crawl profile (see browser_session.py).
+
+Boots headless Chrome with the default and the lean profile in turn, loads
+NetNutrition, gets past the disclaimer and opens the first few units, and
+records for each run:
+  - seconds to the unit list and to each opened unit's panel
+  - requests made and bytes transferred (Resource Timing entries)
+  - JS heap and DOM node count (DevTools Performance.getMetrics)
+  - resident memory of the whole Chrome process tree (Linux /proc)
+Results are averaged per profile, printed side by side and saved to
+outputs/bench/lean_profile.json.
+
+    python src/bench_lean_profile.py --runs 3 --units 5
+"""
+
+import argparse
+import json
+import os
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+
+import crawl_engine
+from browser_session import driver_path, block_resources
+from page_waits import PageWaits, DISCLAIMER_BUTTON
+
+URL = "https://netnutrition.cbord.com/nn-prod/Duke"
+RESULTS_PATH = "outputs/bench/lean_profile.json"
+
+_RESOURCES_JS = """
+var entries = performance.getEntriesByType("resource").concat(performance.getEntriesByType("navigation"));
+var bytes = 0;
+entries.forEach(function (e) { bytes += e.transferSize || 0; });
+return [entries.length, bytes];
+"""
+
+
+def _children(pid):
+    kids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                # the command name may contain spaces, so split after its closing paren
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == pid:
+            kids.append(int(entry))
+    return kids
+
+
+def tree_rss_mb(pid):
+    """Resident memory of pid and all its descendants, in MB (0 where /proc is unavailable)"""
+    if not os.path.isdir("/proc"):
+        return 0.0
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        pending.extend(_children(current))
+    return total_kb / 1024
+
+
+def measure(lean, units):
+    start = time.perf_counter()
+    driver = webdriver.Chrome(service=Service(driver_path(warm=True)), options=crawl_engine.build_options(lean))
+    try:
+        if lean:
+            block_resources(driver)
+        driver.execute_cdp_cmd("Performance.enable", {})
+        driver.get(URL)
+        waits = PageWaits(driver)
+        waits.page_ready()
+        if waits.is_visible(DISCLAIMER_BUTTON):
+            waits.click_and_wait_for_units(driver.find_element(By.CSS_SELECTOR, DISCLAIMER_BUTTON))
+        to_units = time.perf_counter() - start
+
+        panel_seconds = []
+        unit_count = len(driver.find_elements(By.CSS_SELECTOR, ".card.unit"))
+        for index in range(min(units, unit_count)):
+            link = driver.find_elements(By.CSS_SELECTOR, ".card.unit")[index].find_element(By.TAG_NAME, "a")
+            t = time.perf_counter()
+            waits.click_and_wait_for_panel(link)
+            panel_seconds.append(time.perf_counter() - t)
+            back = driver.find_elements(By.XPATH, '//a[contains(text(), "Back")]')
+            if back:
+                waits.click_and_wait_for_units(back[0])
+
+        requests_made, transferred = driver.execute_script(_RESOURCES_JS)
+        metrics = {m["name"]: m["value"] for m in driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]}
+        return {
+            "seconds_to_unit_list": to_units,
+            "avg_panel_seconds": sum(panel_seconds) / len(panel_seconds) if panel_seconds else 0.0,
+            "requests": requests_made,
+            "transferred_kb": transferred / 1024,
+            "js_heap_mb": metrics.get("JSHeapUsedSize", 0) / (1024 * 1024),
+            "dom_nodes": metrics.get("Nodes", 0),
+            "chrome_rss_mb": tree_rss_mb(driver.service.process.pid),
+        }
+    finally:
+        driver.quit()
+
+
+def average(runs):
+    return {key: sum(r[key] for r in runs) / len(runs) for key in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the default and lean Chrome crawl profiles")
+    parser.add_argument("--runs", type=int, default=3, help="browser boots per profile")
+    parser.add_argument("--units", type=int, default=5, help="units to open per boot")
+    args = parser.parse_args()
+
+    results = {}
+    for name, lean in (("default", False), ("lean", True)):
+        runs = []
+        for i in range(args.runs):
+            print(f"[⚙] {name} profile, run {i + 1}/{args.runs}...")
+            runs.append(measure(lean, args.units))
+        results[name] = {"runs": runs, "average": average(runs)}
+
+    before, after = results["default"]["average"], results["lean"]["average"]
+    print(f"\n{'metric':<22}{'default':>12}{'lean':>12}{'change':>10}")
+    for key in before:
+        change = ((after[key] - before[key]) / before[key] * 100) if before[key] else 0
+        print(f"{key:<22}{before[key]:>12.2f}{after[key]:>12.2f}{change:>9.0f}%")
+
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump({"measured_at": time.time(), "runs_per_profile": args.runs,
+                   "units_per_run": args.units, "profiles": results}, f, indent=2)
+    print(f"\n[✓] Results written to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
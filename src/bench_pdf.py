@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+PDF build benchmark for halal_menus.pdf, all_menus.pdf and muslim_calendar.pdf.
+
+Builds each PDF from a synthetic data set the size of a full crawl (by default
+30 restaurants x 5 categories x 20 meals = 3000 all_menus.pdf rows, every
+third one halal, and a 60-event calendar feed) into a scratch directory, a few
+times over, and records the best build time, peak Python memory (tracemalloc)
+and output size. With pypdf installed, the sectioned builds the sinks use
+(see pdf_sections.py) are measured too, both from an empty fragment cache
+and with one restaurant changed since the previous build. Entries are
+appended to outputs/bench/pdf_render.json with the git revision, so runs
+before and after a change can be compared directly.
+
+    python src/bench_pdf.py --restaurants 30 --categories 5 --meals 20 --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import get_muslim_calendar
+import pdf_sections
+from menu_outputs import write_halal_pdf, write_all_pdf, write_sectioned_pdf
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = "outputs/bench/pdf_render.json"
+DATE_TODAY = "Friday, October 16, 2026"
+
+_DISHES = ("Grilled Chicken", "Beef Brisket", "Falafel Wrap", "Lamb Kofta", "Veggie Curry",
+           "Tomato Basil Soup", "Caesar Salad", "Jasmine Rice", "Roasted Potatoes", "Chocolate Chip Cookie")
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def synthetic_menus(restaurants, categories, meals):
+    """(all_menus, halal_menus, hours) shaped like the menu sinks' data"""
+    all_menus, halal_menus, hours = {}, {}, {}
+    n = 0
+    for r in range(restaurants):
+        restaurant = f"Restaurant {r + 1:02d}"
+        hours[restaurant] = "7:30 AM - 10:00 PM"
+        for c in range(categories):
+            category = f"Category {c + 1}"
+            rows = []
+            for m in range(meals):
+                n += 1
+                rows.append((f"{_DISHES[n % len(_DISHES)]} with Seasonal Sides #{n}", n % 3 == 0))
+            all_menus.setdefault(restaurant, {})[category] = rows
+            halal = [name for name, is_halal in rows if is_halal]
+            if halal:
+                halal_menus.setdefault(restaurant, {})[category] = halal
+    return all_menus, halal_menus, hours
+
+
+def synthetic_ics(events):
+    start = datetime(2026, 10, 1, 18, 0)
+    blocks = ["BEGIN:VCALENDAR"]
+    for i in range(events):
+        when = start + timedelta(days=i // 2, hours=i % 2)
+        blocks.append("\n".join([
+            "BEGIN:VEVENT",
+            f"SUMMARY:Community Event {i + 1}",
+            f"DESCRIPTION:Join us for dinner and a talk. . . Everyone is welcome!\\nRSVP at "
+            f"https://duke.campusgroups.com/rsvp?id={1000 + i}",
+            "LOCATION:Center for Muslim Life",
+            f"DTSTART:{when:%Y%m%dT%H%M%SZ}",
+            f"DTEND:{when + timedelta(hours=2):%Y%m%dT%H%M%SZ}",
+            "END:VEVENT",
+        ]))
+    blocks.append("END:VCALENDAR")
+    return "\n".join(blocks)
+
+
+def _sectioned_build(kind, menus, hours, cache_dir, cold):
+    """A build of the sectioned PDF from an empty cache, or with only the first restaurant changed"""
+    first = next(iter(menus))
+    builds = itertools.count()
+
+    def build(path):
+        if cold:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        # A different hours line makes the first restaurant's fragment stale
+        changed = dict(hours, **{first: f"{hours[first]} (build {next(builds)})"})
+        with contextlib.redirect_stdout(io.StringIO()):
+            write_sectioned_pdf(kind, menus, changed, path, DATE_TODAY, cache_dir=cache_dir)
+    return build
+
+
+def measure(build, path, runs):
+    """Best wall time, and peak traced memory of one build, for build(path)"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        build(path)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    build(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"best_seconds": round(min(times), 3), "mean_seconds": round(sum(times) / len(times), 3),
+            "peak_mb": round(peak / (1024 * 1024), 1), "size_kb": round(os.path.getsize(path) / 1024, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark building the menu and calendar PDFs")
+    parser.add_argument("--restaurants", type=int, default=30)
+    parser.add_argument("--categories", type=int, default=5, help="categories per restaurant")
+    parser.add_argument("--meals", type=int, default=20, help="meals per category")
+    parser.add_argument("--events", type=int, default=60, help="calendar events")
+    parser.add_argument("--runs", type=int, default=3, help="timed builds per PDF")
+    parser.add_argument("--label", default="", help="free-form note stored with the results")
+    args = parser.parse_args()
+
+    all_menus, halal_menus, hours = synthetic_menus(args.restaurants, args.categories, args.meals)
+    ics_text = synthetic_ics(args.events)
+    builds = {
+        "halal_menus.pdf": lambda path: write_halal_pdf(halal_menus, hours, path, DATE_TODAY),
+        "all_menus.pdf": lambda path: write_all_pdf(all_menus, hours, path, DATE_TODAY),
+        "muslim_calendar.pdf": lambda path: get_muslim_calendar.build_calendar(ics_text, path, force=True),
+    }
+
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": _git_revision(),
+        "label": args.label,
+        "data": {"restaurants": args.restaurants, "categories": args.categories, "meals": args.meals,
+                 "all_menus_rows": sum(len(m) for c in all_menus.values() for m in c.values()),
+                 "events": args.events},
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="bench_pdf_") as workdir:
+        if pdf_sections.available():
+            cache_dir = os.path.join(workdir, "sections")
+            for kind, menus in (("halal", halal_menus), ("all", all_menus)):
+                builds[f"{kind}_menus.pdf sectioned, cold"] = _sectioned_build(kind, menus, hours, cache_dir, cold=True)
+                builds[f"{kind}_menus.pdf sectioned, 1 changed"] = _sectioned_build(kind, menus, hours, cache_dir, cold=False)
+        for name, build in builds.items():
+            print(f"[⚙] Building {name}...")
+            entry["results"][name] = measure(build, os.path.join(workdir, name.split()[0]), args.runs)
+
+    print(f"\n{'pdf':<38}{'best s':>9}{'mean s':>9}{'peak MB':>10}{'KB':>9}")
+    for name, r in entry["results"].items():
+        print(f"{name:<38}{r['best_seconds']:>9.3f}{r['mean_seconds']:>9.3f}{r['peak_mb']:>10.1f}{r['size_kb']:>9.1f}")
+
+    history = []
+    if os.path.exists(RESULTS_PATH):
+        with open(RESULTS_PATH, "r", encoding="utf-8") as f:
+            history = json.load(f)
+    history.append(entry)
+    os.makedirs(os.path.dirname(RESULTS_PATH), exist_ok=True)
+    with open(RESULTS_PATH, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    print(f"\n[✓] Results appended to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
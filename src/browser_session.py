@@ -0,0 +1,138 @@
+"""
+Warm-start pieces for the Chrome crawls.
+
+A cold start asks webdriver-manager to check (and maybe download) the
+chromedriver for the installed Chrome, then loads NetNutrition and clicks
+through the mobile disclaimer. With --warm-start the crawl instead reuses the
+chromedriver path remembered from the last run (or the one pinned in
+$CHROMEDRIVER_PATH) without any network check, and restores the NetNutrition
+cookies saved after the disclaimer was last accepted, so the unit list comes up
+directly. If the restored state turns out to be stale the disclaimer simply
+shows again and is clicked as usual, and if the remembered chromedriver no
+longer matches Chrome (after a Chrome update) the crawl forgets it and
+resolves a fresh one.
+
+The lean crawl profile (--lean) trims what Chrome loads: image, font and media
+requests plus known third-party trackers are blocked through DevTools, and
+the window is small with GPU work turned off. The scrapers only read DOM text
+and img alt attributes, which survive blocking. First-party stylesheets are
+still loaded, because page_waits.py decides whether the disclaimer and the
+nutrition dialog are showing from computed visibility, which needs the site's
+CSS.
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+DRIVER_CACHE = "outputs/cache/chromedriver.json"
+COOKIE_FILE = "outputs/cache/netnutrition_cookies.json"
+
+# Network.setBlockedURLs patterns for the lean profile
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*newrelic.com*", "*nr-data.net*",
+]
+
+LEAN_WINDOW_SIZE = "1024,768"
+
+LEAN_ARGUMENTS = [
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-renderer-backgrounding",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,BackForwardCache",
+    "--blink-settings=imagesEnabled=false",
+    "--mute-audio",
+]
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[!] Ignoring unreadable {path}: {e}")
+        return default
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def driver_path(warm=False):
+    """Path to chromedriver: pinned, remembered (warm) or freshly resolved by webdriver-manager"""
+    pinned = os.environ.get("CHROMEDRIVER_PATH")
+    if pinned:
+        return pinned
+    if warm:
+        cached = _read_json(DRIVER_CACHE, {}).get("path")
+        if cached and os.access(cached, os.X_OK):
+            return cached
+    path = ChromeDriverManager().install()
+    _write_json(DRIVER_CACHE, {"path": path, "saved_at": time.time()})
+    return path
+
+
+def forget_driver_path():
+    """Drop the remembered chromedriver path, e.g. once it no longer matches the installed Chrome"""
+    try:
+        os.remove(DRIVER_CACHE)
+    except FileNotFoundError:
+        pass
+
+
+def restore_cookies(driver):
+    """
+    Load the saved NetNutrition cookies into a fresh browser before its first
+    page load (through DevTools, which unlike add_cookie() needs no open page).
+    Returns how many were restored.
+    """
+    now = time.time()
+    cookies = []
+    for c in _read_json(COOKIE_FILE, []):
+        if c.get("expiry") and c["expiry"] < now:
+            continue
+        param = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if k in c}
+        if c.get("expiry"):
+            param["expires"] = c["expiry"]
+        cookies.append(param)
+    if cookies:
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+    return len(cookies)
+
+
+def save_cookies(driver):
+    """Remember the current NetNutrition cookies for the next warm start"""
+    _write_json(COOKIE_FILE, driver.get_cookies())
+
+
+def apply_lean_options(options):
+    """Add the lean profile's command-line switches and content settings"""
+    for argument in LEAN_ARGUMENTS:
+        options.add_argument(argument)
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    return options
+
+
+def block_resources(driver):
+    """Start blocking the lean profile's URL patterns in this browser"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
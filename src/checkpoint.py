@@ -0,0 +1,87 @@
+"""
+Crash-safe progress checkpoints for the long nutrition crawl.
+
+After every menu and every finished unit the crawling process rewrites its
+own state file (atomically, via a temp file and os.replace), so a Chrome
+crash or runner timeout loses at most the menu in flight. A run started with
+--resume loads every state file left behind and skips the units and menus they
+cover; their meals are already in the item stream (see item_stream.py), so the
+checkpoint only records progress, not data. Each process (including parallel
+workers) writes its own part file, so workers never contend for one file. Part
+files are named by run as well as pid, so a resumed run never overwrites the
+progress of the run it resumes, even if one of its processes gets a pid that
+run used; all of them are removed once a run completes.
+"""
+
+import glob
+import json
+import os
+import tempfile
+import uuid
+
+DEFAULT_DIR = "outputs/cache/checkpoint"
+
+
+class Checkpoint:
+    def __init__(self, directory=DEFAULT_DIR, resume=False):
+        self.directory = directory
+        self.done_units = set()  # units finished by earlier runs
+        self.done_menus = {}     # unit -> set of menus finished by earlier runs
+        self.state = {"units": [], "menus": {}}  # this process' progress
+        self.run_id = uuid.uuid4().hex[:12]
+        if resume:
+            self._load_previous()
+        else:
+            self.clear()
+
+    def _load_previous(self):
+        parts = sorted(glob.glob(os.path.join(self.directory, "part_*.json")))
+        for path in parts:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[!] Skipping unreadable checkpoint {path}: {e}")
+                continue
+            self.done_units.update(state.get("units", []))
+            for unit, menus in state.get("menus", {}).items():
+                self.done_menus.setdefault(unit, set()).update(menus)
+        if parts:
+            print(f"[↻] Resuming: {len(self.done_units)} units and "
+                  f"{sum(len(m) for m in self.done_menus.values())} menus already done")
+
+    def _path(self):
+        # Resolved at write time: forked workers share this object but not a pid
+        return os.path.join(self.directory, f"part_{self.run_id}_{os.getpid()}.json")
+
+    def _write(self):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._path())
+
+    def unit_done(self, unit):
+        """True if an earlier run finished this unit"""
+        return unit in self.done_units
+
+    def menu_done(self, unit, menu):
+        """True if an earlier run finished this menu"""
+        return menu in self.done_menus.get(unit, ())
+
+    def record_menu(self, unit, menu):
+        self.state["menus"].setdefault(unit, []).append(menu)
+        self._write()
+
+    def record_unit(self, unit):
+        self.state["units"].append(unit)
+        # The unit's menus are covered by the unit entry now
+        self.state["menus"].pop(unit, None)
+        self._write()
+
+    def clear(self):
+        """Forget all progress (fresh run, or after a run completes)"""
+        for path in glob.glob(os.path.join(self.directory, "part_*.json")):
+            os.remove(path)
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Compact and pre-compressed variants of the published data files.
+
+halal_menus.txt and the restaurant shards are written as plain text and
+pretty-printed JSON. For every published file this writes:
+
+    outputs/halal_menus.txt.gz / .br               next to a text file
+    outputs/restaurants/min/cafe.json              minified JSON, in a min/ folder
+    outputs/restaurants/min/cafe.json.gz / .br     so *.json globs over the
+                                                   readable files are unaffected
+
+The variants are committed with their sources: the web app fetches
+halal_menus.txt.gz and its extract-nutrition script reads the minified shards.
+(The app's own data/nutrition.json is bundled, and minified, at build.)
+
+gzip is written at level 9 (with a zero timestamp, so unchanged content gives
+identical bytes) and brotli at quality 11 when the brotli package is
+installed. Files are compressed in a process pool, a variant is only
+rewritten when its content changed, and minified shards of files that no
+longer exist are removed. A size report (readable, minified, gzip and brotli
+bytes per file, with totals) is printed and saved to outputs/size_report.json.
+
+    python src/compress_outputs.py                       # everything in PUBLISHED
+    python src/compress_outputs.py outputs/halal_menus.txt
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PUBLISHED = (
+    "outputs/halal_menus.txt",
+    "outputs/restaurants/*.json",
+)
+REPORT_PATH = "outputs/size_report.json"
+MIN_DIR = "min"
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def served_path(path):
+    """Where the compact form of path lives: a min/ sibling folder for JSON, the file itself otherwise"""
+    if path.endswith(".json"):
+        return os.path.join(os.path.dirname(path), MIN_DIR, os.path.basename(path))
+    return path
+
+
+def _write_if_changed(path, data):
+    """Write data to path (atomically) unless it already holds exactly that; returns whether it wrote"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _current(path, payload, decompress):
+    """Whether the compressed file at path already decompresses to payload"""
+    try:
+        with open(path, "rb") as f:
+            return decompress(f.read()) == payload
+    except (OSError, ValueError, EOFError) + ((brotli.error,) if brotli else ()):
+        return False
+
+
+def compress_file(path):
+    """Write path's variants; returns its size report row"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    target = served_path(path)
+    row = {"path": path, "bytes": len(raw), "minified": None, "gzip": None, "brotli": None, "written": []}
+
+    payload = raw
+    if target != path:
+        payload = json.dumps(json.loads(raw), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        row["minified"] = len(payload)
+        if _write_if_changed(target, payload):
+            row["written"].append(target)
+
+    # Compressing is the slow part, so it is skipped when the file is current
+    gz_path = target + ".gz"
+    if not _current(gz_path, payload, gzip.decompress):
+        _write_if_changed(gz_path, gzip.compress(payload, compresslevel=GZIP_LEVEL, mtime=0))
+        row["written"].append(gz_path)
+    row["gzip"] = os.path.getsize(gz_path)
+
+    if brotli is not None:
+        br_path = target + ".br"
+        if not _current(br_path, payload, brotli.decompress):
+            _write_if_changed(br_path, brotli.compress(payload, quality=BROTLI_QUALITY))
+            row["written"].append(br_path)
+        row["brotli"] = os.path.getsize(br_path)
+    return row
+
+
+def prune_variants(directory, sources):
+    """Remove minified variants in directory/min/ whose source JSON is not in sources"""
+    min_dir = os.path.join(directory, MIN_DIR)
+    if not os.path.isdir(min_dir):
+        return []
+    keep = {os.path.basename(source) for source in sources}
+    removed = []
+    for entry in os.listdir(min_dir):
+        base = entry[:-3] if entry.endswith((".gz", ".br")) else entry
+        if base not in keep:
+            os.remove(os.path.join(min_dir, entry))
+            removed.append(entry)
+    return removed
+
+
+def publish(patterns=PUBLISHED, workers=None):
+    """
+    Write the variants of every file matching patterns (missing files are
+    skipped) and prune stale variants where a pattern is a glob. Returns
+    the size report rows.
+    """
+    paths = []
+    globbed = {}
+    for pattern in patterns:
+        matches = sorted(p for p in glob.glob(pattern) if os.path.basename(os.path.dirname(p)) != MIN_DIR)
+        if glob.has_magic(pattern):
+            globbed.setdefault(os.path.dirname(pattern), []).extend(matches)
+        paths.extend(p for p in matches if p not in paths)
+
+    if len(paths) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(paths))) as pool:
+            rows = list(pool.map(compress_file, paths))
+    else:
+        rows = [compress_file(path) for path in paths]
+
+    for directory, sources in globbed.items():
+        for entry in prune_variants(directory, sources):
+            print(f"[✓] Removed stale {os.path.join(directory, MIN_DIR, entry)}")
+    return rows
+
+
+def _ratio(size, total):
+    return f"{size / total:>6.1%}" if size is not None and total else "     -"
+
+
+def print_report(rows):
+    def kb(size):
+        return f"{size / 1024:>9.1f}" if size is not None else "        -"
+
+    print(f"{'file':<52}{'KB':>9}{'min KB':>9}{'gz KB':>9}{'br KB':>9}{'ratio':>8}")
+    for row in rows:
+        smallest = row["brotli"] if row["brotli"] is not None else row["gzip"]
+        print(f"{row['path']:<52}{kb(row['bytes'])}{kb(row['minified'])}{kb(row['gzip'])}{kb(row['brotli'])}"
+              f"  {_ratio(smallest, row['bytes'])}")
+    totals = summarize(rows)
+    print(f"{'total':<52}{kb(totals['bytes'])}{kb(totals['minified'])}{kb(totals['gzip'])}{kb(totals['brotli'])}"
+          f"  {_ratio(totals['brotli'] if totals['brotli'] is not None else totals['gzip'], totals['bytes'])}")
+    written = sum(len(row["written"]) for row in rows)
+    print(f"[✓] {written} variant files written, the rest were current")
+
+
+def summarize(rows):
+    """Total readable, minified, gzip and brotli bytes (minified counts the readable size of non-JSON files)"""
+    return {
+        "files": len(rows),
+        "bytes": sum(row["bytes"] for row in rows),
+        "minified": sum(row["minified"] if row["minified"] is not None else row["bytes"] for row in rows),
+        "gzip": sum(row["gzip"] for row in rows),
+        "brotli": sum(row["brotli"] for row in rows) if brotli is not None else None,
+    }
+
+
+def write_report(rows, path=REPORT_PATH):
+    report = {"totals": summarize(rows),
+              "files": [{k: v for k, v in row.items() if k != "written"} for row in rows]}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write minified, gzip and brotli variants of the published files")
+    parser.add_argument("patterns", nargs="*", default=list(PUBLISHED), help="files or globs (default: PUBLISHED)")
+    parser.add_argument("--workers", type=int, help="compression processes (default: one per CPU)")
+    parser.add_argument("--report", default=REPORT_PATH)
+    args = parser.parse_args()
+
+    if brotli is None:
+        print("[!] brotli is not installed; writing gzip variants only")
+    rows = publish(args.patterns, args.workers)
+    print_report(rows)
+    write_report(rows, args.report)
+    print(f"[✓] Size report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
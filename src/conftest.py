@@ -0,0 +1,3 @@
+# test_get_timings.py is a script that queries the live campus hours site as
+# soon as it is imported, not a test module
+collect_ignore = ["test_get_timings.py"]
@@ -0,0 +1,24 @@
+"""
+One crawl for every output: halal_menus.txt/.pdf, all_menus.txt/.pdf and
+nutri_menus.json (plus the menus.db SQLite store), instead of running bot_scrape.py, full_scrape.py and
+nutri_scrape.py one after another.
+"""
+
+import argparse
+
+import crawl_engine
+from item_stream import NutriJsonSink
+from menu_db import MenuDbSink
+from menu_outputs import HalalMenusSink, AllMenusSink
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape NetNutrition once into the halal, all-items and nutrition outputs")
+    crawl_engine.add_arguments(parser)
+    args = crawl_engine.parse_arguments(parser)
+
+    sinks = [HalalMenusSink(), AllMenusSink(), NutriJsonSink("outputs/nutri_menus.json"), MenuDbSink()]
+    crawl_engine.run(args, "all_outputs", sinks)
+
+
+if __name__ == "__main__":
+    main()
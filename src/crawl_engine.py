@@ -0,0 +1,509 @@
+"""
+The one NetNutrition crawl behind every scraper.
+
+bot_scrape.py, full_scrape.py and nutri_scrape.py used to walk the same units
+and menus three times with their own copies of the row handling. Now a single
+walk (in Chrome, or over HTTP with --http) writes every item, with its halal
+flag read from the row icons and optionally its nutrition label, to the item
+stream (see item_stream.py). Afterwards the stream is replayed restaurant by
+restaurant into output sinks, so one pass can produce halal_menus.txt/.pdf,
+all_menus.txt/.pdf and nutri_menus.json together (see crawl_all.py).
+
+A sink is any object with open(hours), add(restaurant, categories), close()
+and an `outputs` tuple of the files it writes; categories maps each category
+to its meal records {"name", "is_halal", "nutrition"}.
+"""
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import NoSuchElementException, SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options
+from datetime import datetime
+import os
+import time
+
+from menu_rows import extract_menu_rows
+from nutrition_label import parse_nutrition_label
+from page_waits import PageWaits, NUTRITION_DIALOG, DISCLAIMER_BUTTON
+from browser_session import (driver_path, forget_driver_path, restore_cookies, save_cookies,
+                             apply_lean_options, block_resources, LEAN_WINDOW_SIZE)
+from parallel_crawl import crawl_in_parallel
+from menu_snapshot import MenuSnapshot, group_menu, AUTO_MENU
+from checkpoint import Checkpoint, DEFAULT_DIR as CHECKPOINT_DIR
+from label_cache import LabelCache, DEFAULT_TTL_DAYS
+from item_stream import ItemStream, iter_restaurants, count_items
+from nn_client import NetNutritionClient, FixtureSession, BASE_URL, crawl as crawl_http
+import run_metrics
+import menu_history
+from dining_hours import get_dining_hours
+from startup import run_startup
+from retry_scheduler import RetryScheduler, TokenBucket, throttle_driver, DEFAULT_ATTEMPTS, DEFAULT_RATE
+import get_muslim_calendar
+
+SKIP_CLOSED_RESTAURANTS = False
+NUTRITION_HTML_JS = "var d = document.getElementById('cbo_nn_nutritionDialogInner'); return d ? d.outerHTML : null;"
+
+def build_options(lean=False):
+    options = Options()
+    options.add_argument("--headless=new")            # Run in headless mode
+    options.add_argument("--no-first-run")
+    options.add_argument("--no-default-browser-check")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--no-sandbox")               # Needed for GitHub Actions
+    options.add_argument("--disable-dev-shm-usage")      # Prevents issues with limited /dev/shm space
+    options.add_argument(f"--window-size={LEAN_WINDOW_SIZE if lean else '1920,1080'}")
+    if lean:
+        apply_lean_options(options)
+    return options
+
+driver = None
+waits = None
+label_cache = None
+snapshot = None
+checkpoint = None
+stream = None
+with_nutrition = True
+warm_start = False
+lean = False
+base_url = BASE_URL
+metrics_path = None
+scheduler = None
+request_rate = None  # clicks/page loads per second for this process (None: unlimited)
+finished_menus = set()  # (unit, menu) streamed by this process
+
+def start_browser():
+    """Boot a Chrome driver for this process and get it to the unit list"""
+    global driver, waits
+    print("Initializing Chrome driver...")
+    start = time.perf_counter()
+    with run_metrics.stage("driver_boot"):
+        try:
+            driver = webdriver.Chrome(service=Service(driver_path(warm=warm_start)), options=build_options(lean))
+        except SessionNotCreatedException as e:
+            if not warm_start or os.environ.get("CHROMEDRIVER_PATH"):
+                raise
+            # The remembered chromedriver predates a Chrome update: resolve a matching one
+            print(f"[!] Remembered chromedriver doesn't fit this Chrome, resolving it again: {e.msg}")
+            forget_driver_path()
+            driver = webdriver.Chrome(service=Service(driver_path()), options=build_options(lean))
+        run_metrics.count_webdriver_calls(driver)
+        if lean:
+            block_resources(driver)
+        if warm_start:
+            restore_cookies(driver)
+        # Page loads and clicks share one bucket
+        limiter = TokenBucket(request_rate) if request_rate else None
+        if limiter is not None:
+            throttle_driver(driver, limiter)
+        waits = PageWaits(driver, limiter=limiter)
+    load_unit_list()
+    modes = [m for m, on in (("warm start", warm_start), ("lean", lean)) if on]
+    print(f"[⏱] Unit list ready {time.perf_counter() - start:.1f}s after launch"
+          f"{' (' + ', '.join(modes) + ')' if modes else ''}")
+    return driver
+
+def load_unit_list():
+    """(Re)load NetNutrition and get past the disclaimer to the unit list"""
+    with run_metrics.stage("page_load"):
+        driver.get(base_url)
+        waits.page_ready()
+    print("Page loaded.")
+
+    # Step 1: Dismiss modal, unless restored cookies already got us past it
+    with run_metrics.stage("modal_dismissal"):
+        if waits.is_visible(DISCLAIMER_BUTTON):
+            safe_click(By.XPATH, '//button[contains(@onclick, "setIgnoreMobileDisc")]', "Continue button", wait=waits.click_and_wait_for_units)
+            save_cookies(driver)
+
+def finish_worker():
+    """
+    Run this worker's outstanding retries, then flush its label cache, menu
+    snapshot and metrics before it exits
+    """
+    if scheduler is not None:
+        if driver is not None:
+            scheduler.run()
+        scheduler.report(prefix="  ")
+        run_metrics.record_tasks(scheduler.outcomes)
+    if label_cache is not None:
+        label_cache.save()
+        label_cache.report(prefix="  ")
+    if snapshot is not None:
+        snapshot.save(merge=True)
+        snapshot.report(prefix="  ")
+    if metrics_path is not None:
+        run_metrics.save_part(metrics_path)
+
+def count_units():
+    return len(driver.find_elements(By.CSS_SELECTOR, ".card.unit"))
+
+def safe_click(by, selector, desc="element", wait=None):
+    try:
+        elem = driver.find_element(by, selector)
+        (wait or waits.click)(elem)
+        return True
+    except Exception as e:
+        print(f"[X] Could not click {desc}: {e}")
+        return False
+
+def scrape_nutrition_modal():
+    """
+    Scrape nutrition information from the modal dialog: its markup is read in
+    one WebDriver call and parsed locally (see nutrition_label.py)
+    """
+    try:
+        # The click already waited for the modal to load
+        html = driver.execute_script(NUTRITION_HTML_JS)
+        if not html:
+            return None
+        return parse_nutrition_label(html)
+    except Exception as e:
+        print(f"      [X] Could not read the nutrition label: {e}")
+        return None
+
+def close_nutrition_modal():
+    """Close the nutrition dialog (whether or not scraping it worked)"""
+    # Close the modal using the specific close button
+    try:
+        close_button = driver.find_element(By.ID, "btn_nn_nutrition_close")
+        waits.click_and_wait_modal_closed(close_button)
+    except Exception as close_error:
+        print(f"      [X] Could not close the nutrition label ({close_error}), pressing Escape")
+        # Fallback: try pressing Escape key
+        try:
+            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
+            waits.until_hidden(NUTRITION_DIALOG, "modal_closed")
+        except Exception as e:
+            print(f"      [X] Escape did not close the nutrition label either: {e}")
+
+def scrape_meal(row):
+    """Build a meal record, opening its nutrition label if the row has one"""
+    nutrition_data = None
+    if not with_nutrition:
+        return {"name": row["name"], "is_halal": row["is_halal"], "nutrition": None}
+    if row["nutrition_id"] and label_cache is not None:
+        nutrition_data = label_cache.get(row["nutrition_id"], row["name"])
+    if row["nutrition_id"] and nutrition_data is None:
+        try:
+            with run_metrics.stage("nutrition_open"):
+                nutrition_link = driver.find_element(By.ID, row["nutrition_id"])
+                waits.click_and_wait_for_modal(nutrition_link)
+
+            # Scrape nutrition data from modal
+            with run_metrics.stage("nutrition_parse"):
+                nutrition_data = scrape_nutrition_modal()
+            with run_metrics.stage("nutrition_close"):
+                close_nutrition_modal()
+            if label_cache is not None:
+                label_cache.put(row["nutrition_id"], row["name"], nutrition_data)
+        except Exception as e:
+            print(f"      [X] Nutrition label failed for {row['name']}: {e}")
+
+    return {
+        "name": row["name"],
+        "is_halal": row["is_halal"],
+        "nutrition": nutrition_data
+    }
+
+BACK_LINK = '//a[contains(text(), "Back")]'
+
+def go_back(wait):
+    """Click the panel's Back link, raising if it isn't there"""
+    wait(driver.find_element(By.XPATH, BACK_LINK))
+
+def menu_finished(name, label):
+    """True if this run or an earlier one already streamed the menu"""
+    return (name, label) in finished_menus or (checkpoint is not None and checkpoint.menu_done(name, label))
+
+def open_unit(index):
+    """Click the index-th unit on the unit list and return its name"""
+    link = driver.find_elements(By.CSS_SELECTOR, ".card.unit")[index].find_element(By.TAG_NAME, "a")
+    name = link.text.strip()
+    waits.click_and_wait_for_panel(link)
+    return name
+
+def menu_links():
+    try:
+        menu_data_list = driver.find_element(By.ID, "cbo_nn_menuDataList")
+        card_blocks = menu_data_list.find_elements(By.CSS_SELECTOR, "div.card-block")
+        if card_blocks:
+            return card_blocks[0].find_elements(By.CSS_SELECTOR, "a.cbo_nn_menuLink")
+    except NoSuchElementException:
+        pass
+    return []
+
+def scrape_menu(index, name, i):
+    """
+    From the unit's menu list, stream its i-th menu and return to the list.
+    Returns the menu's label.
+    """
+    # Looked up again every time to avoid stale references
+    menu_link = menu_links()[i]
+    label = menu_link.text.strip()
+    if menu_finished(name, label):
+        return label
+    with run_metrics.stage("menu", f"{name} / {label}"):
+        waits.click_and_wait_for_panel(menu_link)
+
+        item_panel = driver.find_element(By.ID, "itemPanel")
+        panel_text = item_panel.text
+        menu_data = {}
+        if "There are no items available" in panel_text:
+            pass
+        else:
+
+            with run_metrics.stage("row_parse"):
+                rows = extract_menu_rows(driver)
+            menu_data = group_menu(snapshot, name, label, rows, True, scrape_meal, labels=label_cache)
+        stream.write_menu(index, name, i, label, menu_data)
+    finished_menus.add((name, label))
+    if checkpoint is not None:
+        checkpoint.record_menu(name, label)
+
+    go_back(waits.click_and_wait_for_menus)
+    return label
+
+def scrape_auto_menu(index, name):
+    """Stream a unit that shows its items straight away, without a menu list"""
+    try:
+        item_panel = driver.find_element(By.ID, "itemPanel")
+    except NoSuchElementException:
+        return
+    if "There are no items available" in item_panel.text:
+        return
+    with run_metrics.stage("menu", f"{name} / {AUTO_MENU}"):
+        with run_metrics.stage("row_parse"):
+            rows = extract_menu_rows(driver)
+        stream.write_menu(index, name, 0, AUTO_MENU, group_menu(snapshot, name, AUTO_MENU, rows, False, scrape_meal,
+                                                            labels=label_cache))
+
+def unit_task(index):
+    """
+    Stream every menu of the index-th unit and go back to the unit list;
+    returns the unit's name. A menu that fails is handed to the scheduler as a
+    task of its own and the rest of the unit carries on.
+    """
+    unit = driver.find_elements(By.CSS_SELECTOR, ".card.unit")[index]
+    status = unit.find_element(By.CLASS_NAME, "badge").text.lower()
+    if SKIP_CLOSED_RESTAURANTS and "open" not in status:
+        return None
+
+    name = unit.find_element(By.TAG_NAME, "a").text.strip()
+    if checkpoint is not None and checkpoint.unit_done(name):
+        return name
+    open_unit(index)
+
+    menu_count = len(menu_links())
+    if not menu_count:
+        scrape_auto_menu(index, name)
+    menus_complete = True
+    for i in range(menu_count):
+        try:
+            scrape_menu(index, name, i)
+        except Exception as e:
+            scheduler.defer(f"{name} / menu {i + 1}", menu_task, index, i, error=e)
+            menus_complete = False
+            # The failure reloaded the unit list; get back to this unit's menus
+            open_unit(index)
+
+    go_back(waits.click_and_wait_for_units)
+    if checkpoint is not None and menus_complete:
+        checkpoint.record_unit(name)
+    return name
+
+def menu_task(index, i):
+    """Retry of a single menu: open its unit from the unit list, stream it, go back"""
+    name = open_unit(index)
+    label = scrape_menu(index, name, i)
+    go_back(waits.click_and_wait_for_units)
+    return label
+
+def crawl_unit(index):
+    """
+    Scrape every menu of the index-th dining unit into the item stream and
+    return (name, None); the meals themselves only live on disk. If the unit
+    fails, it is re-queued with the scheduler (name is None then), and any
+    retries whose backoff has passed run before this returns.
+    """
+    start = time.perf_counter()
+    name = scheduler.call(f"unit #{index + 1}", unit_task, index)
+    # labelled afterwards, the unit's name is only known once it is read from the page
+    run_metrics.record("unit", time.perf_counter() - start, name)
+    scheduler.run(wait=False)
+    return name, None
+
+
+def fetch_calendar_feed():
+    """The calendar ICS text, or None if it can't be downloaded (the crawl goes on)"""
+    try:
+        return get_muslim_calendar.fetch_ics()
+    except Exception as e:
+        print(f"[X] Error fetching calendar feed: {e}")
+        return None
+
+
+def add_arguments(parser, nutrition=True):
+    """The crawl options every scraper accepts (plus the label cache ones with nutrition)"""
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of headless Chrome workers crawling units in parallel")
+    parser.add_argument("--http", action="store_true",
+                        help="crawl NetNutrition's AJAX endpoints directly instead of driving Chrome")
+    parser.add_argument("--fixtures", metavar="DIR",
+                        help="with --http, replay recorded responses from DIR instead of the live site")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="NetNutrition site to crawl (e.g. a local mock_netnutrition.py server)")
+    parser.add_argument("--metrics", metavar="FILE", default=run_metrics.DEFAULT_PATH,
+                        help="where to write this run's stage timings, item count and WebDriver calls "
+                             "(default: %(default)s)")
+    parser.add_argument("--history", metavar="FILE", default=menu_history.DEFAULT_DB,
+                        help="SQLite menu history to record today's menus in, '' to skip (default: %(default)s)")
+    parser.add_argument("--require-history", action="store_true",
+                        help="fail instead of starting a new history when the --history file doesn't exist")
+    parser.add_argument("--delta", action="store_true",
+                        help="only re-scrape menus whose items changed since the last run")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted Chrome crawl from its last checkpoint")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="reuse the last chromedriver path and saved cookies instead of a cold browser start")
+    parser.add_argument("--lean", action="store_true",
+                        help="block images, fonts and trackers and run Chrome with a small window and no GPU")
+    parser.add_argument("--calendar", action="store_true",
+                        help="also build the Muslim Life calendar PDF, downloading its feed during startup")
+    parser.add_argument("--retries", type=int, default=DEFAULT_ATTEMPTS - 1,
+                        help="times a failed unit or menu is retried (with exponential backoff) before giving up")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="most requests (clicks, page loads, HTTP calls) per second across all workers; "
+                             "0 for no limit (default: %(default)s)")
+    if nutrition:
+        parser.add_argument("--no-label-cache", action="store_true",
+                            help="open every nutrition label instead of reusing cached ones")
+        parser.add_argument("--label-ttl-days", type=float, default=DEFAULT_TTL_DAYS,
+                            help="re-scrape cached labels older than this many days")
+
+
+def parse_arguments(parser):
+    """parser.parse_args(), rejecting option combinations the crawl can't honour"""
+    args = parser.parse_args()
+    if args.resume and args.http:
+        # The HTTP crawl keeps no checkpoint; resuming would only duplicate the item stream
+        parser.error("--resume only applies to Chrome crawls; an --http crawl always starts over")
+    if args.require_history and not args.history:
+        parser.error("--require-history needs a --history file")
+    if args.require_history and not os.path.exists(args.history):
+        # A missing file would otherwise become a fresh, empty history without anyone noticing
+        parser.error(f"--require-history: no menu history at {args.history}")
+    return args
+
+
+def run(args, job, sinks, nutrition=True, stream_path=None):
+    """
+    Crawl every unit once and feed the result to each sink.
+
+    Campus Hours, the calendar feed (with --calendar) and, for a single-browser
+    crawl, Chrome itself are all started together before the crawl (see
+    startup.py); parallel workers boot their own browsers.
+
+    job names this crawl's caches (outputs/cache/<job>_snapshot.json, its
+    checkpoint directory and, unless stream_path is given, its item stream), so
+    scrapers with different outputs never reuse each other's partial state.
+    """
+    global label_cache, snapshot, checkpoint, stream, with_nutrition, warm_start, lean, base_url, metrics_path
+    global scheduler, request_rate
+    run_start = time.perf_counter()
+    with_nutrition = nutrition
+    warm_start = args.warm_start
+    lean = args.lean
+    base_url = args.base_url
+    metrics_path = args.metrics
+    # Each parallel worker gets its share of the rate limit (and its own copy of the scheduler)
+    request_rate = args.rate / max(1, args.workers) if args.rate > 0 and not args.fixtures else None
+    scheduler = RetryScheduler(attempts=args.retries + 1, recover=None if args.http else load_unit_list)
+
+    startup_tasks = {"hours": run_metrics.timed("hours_fetch", get_dining_hours)}
+    if args.calendar:
+        startup_tasks["calendar feed"] = run_metrics.timed("calendar_fetch", fetch_calendar_feed)
+    if not args.http and args.workers <= 1:
+        startup_tasks["browser"] = start_browser
+    started = run_startup(startup_tasks)
+    dining_hours = started["hours"]
+
+    if nutrition and not args.no_label_cache:
+        label_cache = LabelCache(ttl_days=args.label_ttl_days)
+    if args.delta and nutrition and label_cache is None:
+        # Without the cache nothing tells an unchanged menu's labels are still current
+        print("[!] --delta needs the label cache to reuse nutrition menus; re-scraping every menu")
+    elif args.delta:
+        snapshot = MenuSnapshot(f"outputs/cache/{job}_snapshot.json")
+        # Date and hours are printed in the outputs too, so they count as changes
+        snapshot.meta = {"date": datetime.today().strftime('%A, %B %d, %Y'), "hours": dining_hours}
+    if not args.http:
+        checkpoint = Checkpoint(os.path.join(CHECKPOINT_DIR, job), resume=args.resume)
+
+    # Meals are appended to the stream as each menu finishes (a resumed run
+    # keeps what the interrupted one already wrote)
+    stream = ItemStream(stream_path or f"outputs/cache/{job}_items.ndjson", append=args.resume)
+    stream.write_meta(dining_hours)
+
+    # Step 3: Iterate through open dining units
+    if args.http:
+        session = FixtureSession(args.fixtures, base_url=base_url) if args.fixtures else None
+        limiter = TokenBucket(args.rate) if request_rate else None
+        crawl_http(NetNutritionClient(session, base_url=base_url, limiter=limiter), with_nutrition=nutrition,
+                   label_cache=label_cache, snapshot=snapshot, on_menu=stream.write_menu, scheduler=scheduler)
+        finish_worker()
+    elif args.workers > 1:
+        # Flushed first, so the forked workers don't each carry a copy of the startup samples
+        if metrics_path is not None:
+            run_metrics.save_part(metrics_path)
+        crawl_in_parallel(args.workers, start_browser, crawl_unit, count_units, finish_worker)
+    else:
+        # The browser was booted during startup
+        for index in range(count_units()):
+            crawl_unit(index)
+        finish_worker()
+        driver.quit()
+        waits.report()
+    stream.close()
+
+    # Parallel workers keep their own snapshot copies, so only a single-process
+    # run knows for sure that nothing changed
+    outputs = [path for sink in sinks for path in sink.outputs]
+    unchanged = snapshot is not None and (args.http or args.workers <= 1) and not snapshot.changed()
+    if unchanged and all(os.path.exists(path) for path in outputs):
+        print("[Δ] No menu changed since the last run — keeping the existing outputs")
+    else:
+        with run_metrics.stage("outputs"):
+            for sink in sinks:
+                sink.open(dining_hours)
+            for restaurant, categories in iter_restaurants(stream.path):
+                for sink in sinks:
+                    sink.add(restaurant, categories)
+            for sink in sinks:
+                sink.close()
+
+    if args.history:
+        with run_metrics.stage("history"):
+            counts = menu_history.record_stream(stream.path, args.history, job=job)
+        print(f"[✓] History: {counts['menus']} menus recorded, {counts['new_spans']} new or changed")
+
+    if args.calendar and started["calendar feed"] is not None:
+        # Like its download, a calendar that can't be built doesn't cost the crawl its outputs
+        try:
+            with run_metrics.stage("calendar_build"):
+                event_count = get_muslim_calendar.build_calendar(started["calendar feed"])
+            print(f"[✓] Calendar with {event_count} events in 'muslim_calendar.pdf'")
+        except Exception as e:
+            print(f"[X] Error building calendar: {e}")
+
+    # The crawl made it all the way through, so there's nothing left to resume
+    if checkpoint is not None:
+        checkpoint.clear()
+
+    if metrics_path is not None:
+        metrics = run_metrics.write_metrics(metrics_path, time.perf_counter() - run_start, count_items(stream.path),
+                                            {"job": job, "mode": "http" if args.http else "chrome",
+                                             "workers": args.workers})
+        run_metrics.print_summary(metrics)
+        print(f"[✓] Metrics written to {metrics_path}")
@@ -1,24 +1,25 @@
+import os
 import requests
 import re
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 from xml.sax.saxutils import escape
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Table
-)
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
+from reportlab.platypus import Paragraph, Spacer
+
+from pdf_render import styles, event_info_table, divider, build_pdf, content_hash, published_hash
+from ics_parser import parse_events, DEFAULT_TZ
+
+ICS_URL = "https://duke.campusgroups.com/ics?group_ids=28807%2C28808%2C28704%2C28600%2C72105%2C73950&school=duke"
+OUTPUT_PDF = "docs/outputs/muslim_calendar.pdf"
+DISPLAY_TZ = ZoneInfo(DEFAULT_TZ)
+# Occurrences of recurring events are listed from now to this far ahead (one-off events all are)
+EXPAND_DAYS = 120
 
 # --- Download ICS feed ---
-ics_url = "https://duke.campusgroups.com/ics?group_ids=28807%2C28808%2C28704%2C28600%2C72105%2C73950&school=duke"
-ics_text = requests.get(ics_url).text
-events_raw = re.findall(r"BEGIN:VEVENT(.*?)END:VEVENT", ics_text, re.DOTALL)
+def fetch_ics():
+    return requests.get(ICS_URL).text
 
 # --- Helper Functions ---
-def find_field(field, block):
-    match = re.search(rf"{field}(?:;[^:]*)*:(.*)", block)
-    return match.group(1).strip() if match else ""
-
 def clean_description(raw_desc):
     raw_desc = re.sub(r'---.*', '', raw_desc, flags=re.DOTALL)
     desc = raw_desc.replace('\\n', '\n')
@@ -27,97 +28,81 @@ def clean_description(raw_desc):
     desc = re.sub(r'\n+', '\n', desc)
     return desc.strip()
 
-def parse_event_block(block):
-    return {
-        "summary": find_field("SUMMARY", block),
-        "description": find_field("DESCRIPTION", block),
-        "location": find_field("LOCATION", block),
-        "url": find_field("URL", block),
-        "start": find_field("DTSTART", block),
-        "end": find_field("DTEND", block),
-    }
-
-def format_datetime(dt_str):
-    try:
-        dt = datetime.strptime(dt_str, "%Y%m%dT%H%M%SZ")
-        return dt.strftime("%A, %B %d, %Y %I:%M %p")
-    except:
-        return dt_str
-
-def parse_datetime(dt_str):
-    try:
-        return datetime.strptime(dt_str, "%Y%m%dT%H%M%SZ")
-    except:
-        return datetime.max
-
-# --- Parse and Sort Events ---
-events = [parse_event_block(b) for b in events_raw]
-events.sort(key=lambda e: parse_datetime(e["start"]))
-
-# --- Duke Blue ---
-DUKE_BLUE = colors.HexColor("#012169")
-
-# --- Styles ---
-styles = getSampleStyleSheet()
-styles.add(ParagraphStyle(name='Header', fontSize=20, leading=24, textColor=DUKE_BLUE, spaceAfter=20))
-styles.add(ParagraphStyle(name='EventTitle', fontSize=14, leading=16, spaceBefore=12, spaceAfter=6, textColor=DUKE_BLUE, fontName="Helvetica-Bold"))
-styles.add(ParagraphStyle(name='EventInfo', fontSize=11, leading=14))
-styles.add(ParagraphStyle(name='Description', fontSize=10, leading=13, spaceAfter=10))
-
-# --- Document ---  
-doc = SimpleDocTemplate("docs/outputs/muslim_calendar.pdf", pagesize=letter,
-                        rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
-story = []
-
-story.append(Paragraph("Upcoming Duke Muslim Life Events", styles['Header']))
-
-for event in events:
-    story.append(Paragraph(event["summary"], styles['EventTitle']))
-
-    start = format_datetime(event["start"])
-    end = format_datetime(event["end"])
-    location = event["location"]
-
-    # RSVP
-    rsvp_match = re.search(r'https?:\/\/duke\.campusgroups\.com\/rsvp\?id=\d+', event["description"])
-    rsvp_url = rsvp_match.group(0) if rsvp_match else event["url"]
-
-    # Cleaned description
-    desc_clean = clean_description(event["description"])
-    desc_html = escape(desc_clean).replace('\n', '<br/>')
-
-    # Event info table
-    event_info_data = [
-        [Paragraph("<b>When:</b>", styles["EventInfo"]), Paragraph(f"{start} to {end}", styles["EventInfo"])],
-        [Paragraph("<b>Where:</b>", styles["EventInfo"]), Paragraph(location, styles["EventInfo"])],
-    ]
-    if rsvp_url:
-        event_info_data.append([Paragraph("<b>RSVP:</b>", styles["EventInfo"]), Paragraph(rsvp_url, styles["EventInfo"])])
-
-    table = Table(event_info_data, colWidths=[60, 360])
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
-        ("BOX", (0, 0), (-1, -1), 0.25, DUKE_BLUE),
-        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
-        ("VALIGN", (0, 0), (-1, -1), "TOP"),
-        ("LEFTPADDING", (0, 0), (-1, -1), 6),
-        ("RIGHTPADDING", (0, 0), (-1, -1), 6),
-        ("TOPPADDING", (0, 0), (-1, -1), 4),
-        ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
-    ]))
-    story.append(table)
-
-    # Description
-    if desc_html:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(f"<br/>{desc_html}", styles['Description']))
-
-    # Divider
-    story.append(Spacer(1, 8))
-    story.append(Table([[""]], colWidths=[450], style=[
-        ('LINEABOVE', (0, 0), (-1, -1), 0.4, DUKE_BLUE),
-    ]))
-    story.append(Spacer(1, 12))
-
-# --- Save ---
-doc.build(story)
\ No newline at end of file
+def format_datetime(moment, all_day=False):
+    local = moment.astimezone(DISPLAY_TZ)
+    return local.strftime("%A, %B %d, %Y" if all_day else "%A, %B %d, %Y %I:%M %p")
+
+def format_when(event):
+    if not event.all_day:
+        return f"{format_datetime(event.start)} to {format_datetime(event.end)}"
+    # An all-day event's DTEND is the day after its last day
+    first = format_datetime(event.start, all_day=True)
+    last = format_datetime(max(event.start, event.end - timedelta(days=1)), all_day=True)
+    return first if first == last else f"{first} to {last}"
+
+def parse_feed(ics_text, now=None):
+    """The feed's events (recurring ones expanded from now to EXPAND_DAYS ahead), sorted by start"""
+    now = now or datetime.now(timezone.utc)
+    return parse_events(ics_text, recurrence_window=(now, now + timedelta(days=EXPAND_DAYS)))
+
+def build_calendar(ics_text, path=OUTPUT_PDF, force=False):
+    """
+    Render the events of ics_text to path and return how many there are.
+    Rendering is skipped when path was already built from the same events
+    (unless force), since the feed's own timestamps change on every download.
+    """
+    # --- Parse and Sort Events ---
+    events = parse_feed(ics_text)
+
+    digest = content_hash("calendar", [e._asdict() for e in events])
+    if not force and published_hash(path) == digest:
+        print(f"[=] {os.path.basename(path)} already shows these {len(events)} events, not re-rendered")
+        return len(events)
+
+    s = styles()
+    story = []
+
+    story.append(Paragraph("Upcoming Duke Muslim Life Events", s["header"]))
+
+    for event in events:
+        story.append(Paragraph(escape(event.summary), s["event_title"]))
+
+        when = format_when(event)
+        location = escape(event.location)
+
+        # RSVP
+        rsvp_match = re.search(r'https?:\/\/duke\.campusgroups\.com\/rsvp\?id=\d+', event.description)
+        rsvp_url = rsvp_match.group(0) if rsvp_match else event.url
+
+        # Cleaned description
+        desc_clean = clean_description(event.description)
+        desc_html = escape(desc_clean).replace('\n', '<br/>')
+
+        # Event info table
+        event_info_data = [
+            [Paragraph("<b>When:</b>", s["event_info"]), Paragraph(when, s["event_info"])],
+            [Paragraph("<b>Where:</b>", s["event_info"]), Paragraph(location, s["event_info"])],
+        ]
+        if rsvp_url:
+            event_info_data.append([Paragraph("<b>RSVP:</b>", s["event_info"]), Paragraph(rsvp_url, s["event_info"])])
+
+        table = event_info_table(event_info_data)
+        story.append(table)
+
+        # Description
+        if desc_html:
+            story.append(Spacer(1, 6))
+            story.append(Paragraph(f"<br/>{desc_html}", s["description"]))
+
+        # Divider
+        story.append(Spacer(1, 8))
+        story.append(divider())
+        story.append(Spacer(1, 12))
+
+    # --- Save ---
+    build_pdf(path, story, digest=digest, rightMargin=40, leftMargin=40, topMargin=40, bottomMargin=40)
+    return len(events)
+
+
+if __name__ == "__main__":
+    build_calendar(fetch_ics())
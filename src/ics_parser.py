@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Streaming parser for iCalendar (ICS) feeds like the DukeGroups one.
+
+The feed is read one unfolded content line at a time, from a string or from
+any iterable of text chunks (e.g. a streamed HTTP response), so it never has
+to be searched as one block:
+
+- folded lines (a CRLF or LF followed by a space or tab) are joined;
+- every property is split into name, parameters (quoted values included)
+  and value, and TEXT values are unescaped (\\n, \\, \\; \\\\);
+- DTSTART/DTEND/RECURRENCE-ID/EXDATE in UTC ("...Z"), with a TZID, floating
+  (taken as DEFAULT_TZ) or all-day (VALUE=DATE) all become aware UTC
+  datetimes, and DURATION stands in for a missing DTEND;
+- recurring events (RRULE: FREQ DAILY/WEEKLY/MONTHLY/YEARLY with INTERVAL,
+  COUNT, UNTIL, BYDAY, BYMONTHDAY and BYMONTH) are expanded into their
+  occurrences within a window, in the event's own time zone so they keep
+  their wall-clock time across DST, minus EXDATEs and with RECURRENCE-ID
+  overrides swapped in. A rule that can't be read (say INTERVAL=x) is
+  reported and its event kept as the single DTSTART occurrence.
+
+Events come out as Event records. One without a readable DTSTART is
+skipped and counted, rather than sorted to the end.
+
+    python src/ics_parser.py feed.ics [--days 90]
+"""
+
+import argparse
+import calendar
+import re
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+DEFAULT_TZ = "America/New_York"
+# How far ahead a recurring event is expanded when no window end is given
+DEFAULT_HORIZON = timedelta(days=365)
+# Upper bound on RRULE periods walked for one event, whatever the rule says
+MAX_PERIODS = 10000
+
+# Windows zone names some calendar exports use instead of IANA ones
+WINDOWS_ZONES = {
+    "Eastern Standard Time": "America/New_York",
+    "Central Standard Time": "America/Chicago",
+    "Mountain Standard Time": "America/Denver",
+    "Pacific Standard Time": "America/Los_Angeles",
+    "UTC": "UTC",
+}
+
+_NAME = re.compile(r"([A-Za-z0-9-]+)([;:])")
+_DURATION = re.compile(r"([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+_BYDAY = re.compile(r"([+-]?\d+)?(MO|TU|WE|TH|FR|SA|SU)$")
+_WEEKDAYS = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+_DATE_PROPERTIES = frozenset(("DTSTART", "DTEND", "RECURRENCE-ID", "EXDATE"))
+_TEXT_PROPERTIES = frozenset(("SUMMARY", "DESCRIPTION", "LOCATION", "UID", "URL", "RRULE", "DURATION"))
+_ZONES = {}
+
+
+class Event(NamedTuple):
+    uid: str
+    summary: str
+    description: str
+    location: str
+    url: str
+    start: datetime                 # aware, UTC
+    end: datetime                   # aware, UTC
+    all_day: bool = False
+    tzid: str = None                # the zone DTSTART was given in (None for UTC)
+    rrule: str = None               # set on a recurring event's occurrences too
+    recurrence_id: datetime = None  # which occurrence of a recurring event this is
+
+
+def unfold_lines(source):
+    """Unfolded content lines of source, a string or an iterable of text chunks"""
+    if isinstance(source, str):
+        source = (source,)
+    pending = ""
+    for chunk in source:
+        pending += chunk
+        # A line is only complete once the next one has started (it may be a continuation)
+        cut = len(pending) - 1
+        while True:
+            cut = pending.rfind("\n", 0, cut)
+            if cut < 0 or pending[cut + 1] not in " \t":
+                break
+        if cut < 0:
+            continue
+        block, pending = pending[:cut], pending[cut + 1:]
+        yield from _unfold_block(block)
+    if pending:
+        yield from _unfold_block(pending)
+
+
+def _unfold_block(block):
+    if "\r" in block:
+        # The block ends just before a line break, which may be a CRLF's "\n"
+        block = block.replace("\r\n", "\n").rstrip("\r")
+    for line in block.replace("\n ", "").replace("\n\t", "").split("\n"):
+        if line:
+            yield line
+
+
+def split_property(line):
+    """("DTSTART", {"TZID": "America/New_York"}, "20261016T180000") from a content line"""
+    colon = line.find(":")
+    if colon < 0:
+        return line.upper(), {}, ""
+    head = line[:colon]
+    if '"' in head:
+        # A quoted parameter value may itself contain ":" or ";"
+        in_quotes = False
+        for i, ch in enumerate(line):
+            if ch == '"':
+                in_quotes = not in_quotes
+            elif ch == ":" and not in_quotes:
+                colon = i
+                break
+        head = line[:colon]
+    value = line[colon + 1:]
+    if ";" not in head:
+        return head.upper(), {}, value
+    params = {}
+    name, _, rest = head.partition(";")
+    for param in _split_unquoted(rest, ";"):
+        key, _, param_value = param.partition("=")
+        params[key.upper()] = param_value.strip('"')
+    return name.upper(), params, value
+
+
+def _split_unquoted(text, separator):
+    if '"' not in text:
+        return text.split(separator)
+    parts, start, in_quotes = [], 0, False
+    for i, ch in enumerate(text):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == separator and not in_quotes:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def unescape_text(value):
+    if "\\" not in value:
+        return value
+    # "\\" is set aside first, so that "\\n" stays a backslash followed by "n"
+    return (value.replace("\\\\", "\0").replace("\\n", "\n").replace("\\N", "\n")
+            .replace("\\,", ",").replace("\\;", ";").replace("\0", "\\"))
+
+
+def zone(tzid, default=DEFAULT_TZ):
+    """ZoneInfo for a TZID (IANA or a common Windows name), falling back to default"""
+    key = (tzid, default)
+    tz = _ZONES.get(key)
+    if tz is None:
+        try:
+            tz = ZoneInfo(WINDOWS_ZONES.get(tzid, tzid)) if tzid else ZoneInfo(default)
+        except (ZoneInfoNotFoundError, ValueError):
+            tz = ZoneInfo(default)
+        _ZONES[key] = tz
+    return tz
+
+
+def parse_value_datetime(value, params, default_tz=DEFAULT_TZ):
+    """
+    (aware UTC datetime, local naive datetime, tz, all_day) for an ICS
+    DATE or DATE-TIME value; raises ValueError when it is unreadable
+    """
+    value = value.strip()
+    if len(value) == 8 or params.get("VALUE") == "DATE":
+        local = datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+        tz = zone(params.get("TZID"), default_tz)
+        return local.replace(tzinfo=tz).astimezone(timezone.utc), local, tz, True
+    if len(value) < 15 or value[8] != "T":
+        raise ValueError(f"not an ICS date-time: {value!r}")
+    local = datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]),
+                     int(value[9:11]), int(value[11:13]), int(value[13:15]))
+    if value.endswith("Z"):
+        return local.replace(tzinfo=timezone.utc), local, timezone.utc, False
+    tz = zone(params.get("TZID"), default_tz)
+    return local.replace(tzinfo=tz).astimezone(timezone.utc), local, tz, False
+
+
+def parse_duration(value):
+    match = _DURATION.match(value.strip())
+    if not match:
+        raise ValueError(f"not an ICS duration: {value!r}")
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0),
+                         minutes=int(minutes or 0), seconds=int(seconds or 0))
+    return -duration if sign == "-" else duration
+
+
+def parse_rrule(value):
+    rule = {}
+    for part in value.split(";"):
+        key, _, part_value = part.partition("=")
+        rule[key.upper()] = part_value.upper()
+    return rule
+
+
+class _Component:
+    """One VEVENT's properties, as collected line by line"""
+    __slots__ = ("text", "dates", "exdates")
+
+    def __init__(self):
+        self.text = {}
+        self.dates = {}
+        self.exdates = []
+
+
+def _build_event(component, default_tz):
+    text = component.text
+    start_value = component.dates.get("DTSTART")
+    if start_value is None:
+        raise ValueError("no DTSTART")
+    start, local_start, tz, all_day = parse_value_datetime(*start_value, default_tz)
+    if "DTEND" in component.dates:
+        end = parse_value_datetime(*component.dates["DTEND"], default_tz)[0]
+    elif "DURATION" in text:
+        end = start + parse_duration(text["DURATION"])
+    else:
+        end = start + (timedelta(days=1) if all_day else timedelta())
+    recurrence_id = None
+    if "RECURRENCE-ID" in component.dates:
+        recurrence_id = parse_value_datetime(*component.dates["RECURRENCE-ID"], default_tz)[0]
+    event = Event(
+        uid=text.get("UID", ""),
+        summary=unescape_text(text.get("SUMMARY", "")),
+        description=unescape_text(text.get("DESCRIPTION", "")),
+        location=unescape_text(text.get("LOCATION", "")),
+        url=text.get("URL", ""),
+        start=start,
+        end=end,
+        all_day=all_day,
+        tzid=None if tz is timezone.utc else str(tz),
+        rrule=text.get("RRULE"),
+        recurrence_id=recurrence_id,
+    )
+    exdates = set()
+    for params, value in component.exdates:
+        for item in value.split(","):
+            exdates.add(parse_value_datetime(item, params, default_tz)[0])
+    return event, local_start, tz, exdates
+
+
+def iter_events(source, window_start=None, window_end=None, default_tz=DEFAULT_TZ, stats=None,
+                recurrence_window=None):
+    """
+    Events of an ICS feed (a string or iterable of text chunks), recurring
+    ones expanded to their occurrences. With a window, only events that
+    overlap [window_start, window_end) are yielded. recurrence_window, a
+    (start, end) pair, further limits the occurrences of recurring events
+    (and their overrides) alone; it defaults to the window. Single events
+    are yielded as soon as they are read; recurring events and their
+    overrides at the end of the feed. stats, if given, is a dict that gets
+    "events", "skipped" and "bad_rules".
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("events", 0)
+    stats.setdefault("skipped", 0)
+    stats.setdefault("bad_rules", 0)
+    recurrence_start, recurrence_end = recurrence_window or (window_start, window_end)
+    recurring = []
+    overrides = {}
+    component = None
+    depth = 0  # nested components inside a VEVENT (VALARM), whose properties are not the event's
+
+    for line in unfold_lines(source):
+        match = _NAME.match(line)
+        if match is None:
+            continue
+        name = match.group(1).upper()
+        if name == "BEGIN":
+            if component is None:
+                if line[6:].upper() == "VEVENT":
+                    component = _Component()
+                    depth = 0
+            else:
+                depth += 1
+            continue
+        if component is None:
+            continue
+        if name == "END":
+            if depth:
+                depth -= 1
+                continue
+            try:
+                event, local_start, tz, exdates = _build_event(component, default_tz)
+            except (ValueError, KeyError):
+                stats["skipped"] += 1
+                component = None
+                continue
+            component = None
+            if event.recurrence_id is not None:
+                overrides[(event.uid, event.recurrence_id)] = event
+            elif event.rrule:
+                recurring.append((event, local_start, tz, exdates))
+            elif _overlaps(event, window_start, window_end):
+                stats["events"] += 1
+                yield event
+            continue
+        # Only the properties an Event is built from are split any further
+        if depth or (name not in _TEXT_PROPERTIES and name not in _DATE_PROPERTIES):
+            continue
+        if match.group(2) == ":":
+            params, value = {}, line[match.end():]
+        else:
+            _, params, value = split_property(line)
+        if name in _TEXT_PROPERTIES:
+            if name not in component.text:
+                component.text[name] = value
+        elif name == "EXDATE":
+            component.exdates.append((params, value))
+        else:
+            component.dates[name] = (value, params)
+
+    for event, local_start, tz, exdates in recurring:
+        try:
+            occurrences = list(expand(event, local_start, tz, exdates, recurrence_start, recurrence_end))
+        except (ValueError, KeyError) as e:
+            print(f"[!] Unreadable RRULE {event.rrule!r} on {event.summary!r} ({e}); listing its first occurrence only")
+            stats["bad_rules"] += 1
+            occurrences = [event._replace(recurrence_id=event.start)]
+        for occurrence in occurrences:
+            occurrence = overrides.pop((event.uid, occurrence.recurrence_id), occurrence)
+            if _overlaps(occurrence, window_start, window_end):
+                stats["events"] += 1
+                yield occurrence
+    # Overrides of occurrences the rule doesn't produce (e.g. moved into the window)
+    for event in overrides.values():
+        if _overlaps(event, recurrence_start, recurrence_end) and _overlaps(event, window_start, window_end):
+            stats["events"] += 1
+            yield event
+
+
+def parse_events(source, window_start=None, window_end=None, default_tz=DEFAULT_TZ, recurrence_window=None):
+    """All events of an ICS feed (see iter_events), sorted by start"""
+    stats = {}
+    events = sorted(iter_events(source, window_start, window_end, default_tz, stats, recurrence_window),
+                    key=lambda e: (e.start, e.summary))
+    if stats["skipped"]:
+        print(f"[!] Skipped {stats['skipped']} calendar events without a readable start")
+    return events
+
+
+def _overlaps(event, window_start, window_end):
+    if window_start is not None and max(event.end, event.start) < window_start:
+        return False
+    if window_end is not None and event.start >= window_end:
+        return False
+    return True
+
+
+def _month_days(year, month, rule, local_start):
+    """Days of one month a MONTHLY (or YEARLY, by month) rule selects"""
+    days_in_month = calendar.monthrange(year, month)[1]
+    days = set()
+    if "BYMONTHDAY" in rule:
+        for item in rule["BYMONTHDAY"].split(","):
+            day = int(item)
+            day = day if day > 0 else days_in_month + day + 1
+            if 1 <= day <= days_in_month:
+                days.add(day)
+    if "BYDAY" in rule:
+        first_weekday = date(year, month, 1).weekday()
+        for item in rule["BYDAY"].split(","):
+            match = _BYDAY.match(item)
+            if not match:
+                continue
+            weekday = _WEEKDAYS[match.group(2)]
+            matching = list(range(1 + (weekday - first_weekday) % 7, days_in_month + 1, 7))
+            if match.group(1):
+                ordinal = int(match.group(1))
+                if -len(matching) <= ordinal <= len(matching) and ordinal:
+                    days.add(matching[ordinal - 1 if ordinal > 0 else ordinal])
+            else:
+                days.update(matching)
+    if "BYMONTHDAY" not in rule and "BYDAY" not in rule and local_start.day <= days_in_month:
+        days.add(local_start.day)
+    return sorted(days)
+
+
+def _candidates(rule, local_start):
+    """Local start times a rule produces, in order, from local_start's period on"""
+    frequency = rule.get("FREQ")
+    interval = max(1, int(rule.get("INTERVAL", 1)))
+    start_time = local_start.time()
+    for period in range(MAX_PERIODS):
+        if frequency == "DAILY":
+            yield local_start + timedelta(days=period * interval)
+        elif frequency == "WEEKLY":
+            week_start = local_start.date() - timedelta(days=local_start.weekday()) + timedelta(weeks=period * interval)
+            weekdays = sorted(_WEEKDAYS[d[-2:]] for d in rule["BYDAY"].split(",")) if "BYDAY" in rule else [local_start.weekday()]
+            for weekday in weekdays:
+                yield datetime.combine(week_start + timedelta(days=weekday), start_time)
+        elif frequency in ("MONTHLY", "YEARLY"):
+            if frequency == "MONTHLY":
+                months = local_start.month - 1 + period * interval
+                year_months = [(local_start.year + months // 12, months % 12 + 1)]
+            else:
+                year = local_start.year + period * interval
+                by_month = rule.get("BYMONTH")
+                year_months = [(year, int(m)) for m in by_month.split(",")] if by_month else [(year, local_start.month)]
+            for year, month in sorted(year_months):
+                for day in _month_days(year, month, rule, local_start):
+                    yield datetime.combine(date(year, month, day), start_time)
+        else:
+            # An unsupported frequency: just the first instance
+            yield local_start
+            return
+
+
+def expand(event, local_start, tz, exdates=(), window_start=None, window_end=None):
+    """
+    Occurrences of a recurring event (each an Event with recurrence_id set) up
+    to the window's end; raises ValueError or KeyError for a rule it can't read
+    """
+    rule = parse_rrule(event.rrule)
+    duration = event.end - event.start
+    count = int(rule["COUNT"]) if "COUNT" in rule else None
+    until = None
+    if "UNTIL" in rule:
+        until = parse_value_datetime(rule["UNTIL"], {"TZID": str(tz)} if tz is not timezone.utc else {})[0]
+    horizon = window_end if window_end is not None else event.start + DEFAULT_HORIZON
+
+    produced = 0
+    for local in _candidates(rule, local_start):
+        if local < local_start:
+            continue
+        start = local.replace(tzinfo=tz).astimezone(timezone.utc)
+        if (until is not None and start > until) or start >= horizon:
+            return
+        produced += 1
+        if count is not None and produced > count:
+            return
+        if start in exdates:
+            continue
+        if window_start is None or start + duration >= window_start:
+            yield event._replace(start=start, end=start + duration, recurrence_id=start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse an ICS file and list its events")
+    parser.add_argument("path", help="ICS file, or - for stdin")
+    parser.add_argument("--days", type=int, default=90, help="expand recurring events this many days ahead")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    source = sys.stdin if args.path == "-" else open(args.path, "r", encoding="utf-8")
+    with source:
+        events = parse_events(iter(lambda: source.read(1 << 16), ""),
+                              recurrence_window=(None, now + timedelta(days=args.days)))
+    local_tz = ZoneInfo(DEFAULT_TZ)
+    for event in events:
+        when = event.start.astimezone(local_tz)
+        print(f"{when:%a %Y-%m-%d}{'' if event.all_day else f' {when:%H:%M}'}  {event.summary}"
+              f"{'  (recurring)' if event.rrule else ''}")
+    print(f"[✓] {len(events)} events")
+
+
+if __name__ == "__main__":
+    main()
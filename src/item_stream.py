@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Streaming NDJSON output for nutri_scrape.py.
+
+Instead of holding every meal and its nutrition label in memory until the end
+of a two-hour crawl, each finished menu is appended to outputs/nutri_items.ndjson
+as one JSON line per meal. Whatever made it to disk survives a crash, and
+nutri_menus.json is assembled from the stream afterwards (or on demand by
+running this file) one restaurant at a time.
+
+Every line is either
+  {"type": "meta", "hours": {...}}                      (dining hours for the run)
+  {"type": "item", "unit_index", "menu_index", "batch",
+   "restaurant", "menu", "category", "meal": {name, is_halal, nutrition}}
+A menu written twice (e.g. re-scraped after --resume) keeps its latest batch.
+"""
+
+import json
+import os
+from datetime import datetime
+
+DEFAULT_STREAM = "outputs/nutri_items.ndjson"
+DEFAULT_OUTPUT = "outputs/nutri_menus.json"
+
+
+class ItemStream:
+    def __init__(self, path=DEFAULT_STREAM, append=False):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | (0 if append else os.O_TRUNC)
+        # O_APPEND + one write per menu keeps lines from parallel workers intact
+        self.fd = os.open(path, flags, 0o644)
+        self.batches = 0
+        self.items = 0
+
+    def _write_lines(self, records):
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8")
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+
+    def write_meta(self, hours):
+        self._write_lines([{"type": "meta", "hours": hours}])
+
+    def write_menu(self, unit_index, restaurant, menu_index, menu, menu_data):
+        """Append every meal of one scraped menu"""
+        self.batches += 1
+        batch = f"{os.getpid()}-{self.batches}"
+        records = [
+            {"type": "item", "unit_index": unit_index, "menu_index": menu_index, "batch": batch,
+             "restaurant": restaurant, "menu": menu, "category": category, "meal": meal}
+            for category, meals in menu_data.items()
+            for meal in meals
+        ]
+        if records:
+            self._write_lines(records)
+            self.items += len(records)
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _index_stream(stream_path):
+    """
+    First pass: remember where each item line lives, without keeping the meals.
+    Returns (hours, entries) with entries as (unit_index, menu_index, seq, offset,
+    restaurant, category) for the latest batch of every (restaurant, menu).
+    """
+    hours = {}
+    latest_batch = {}
+    candidates = []
+    with open(stream_path, "rb") as f:
+        seq = 0
+        while True:
+            offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn last line from a crash; everything before it is fine
+                continue
+            if record.get("type") == "meta":
+                hours = record.get("hours") or {}
+                continue
+            key = (record["restaurant"], record["menu"])
+            latest_batch[key] = record["batch"]
+            candidates.append((record["unit_index"], record["menu_index"], seq, offset,
+                               record["restaurant"], record["category"], key, record["batch"]))
+            seq += 1
+
+    entries = [c[:6] for c in candidates if latest_batch[c[6]] == c[7]]
+    entries.sort()
+    return hours, entries
+
+
+def count_items(stream_path=DEFAULT_STREAM):
+    """Meals in the stream, counting each menu's latest batch only"""
+    return len(_index_stream(stream_path)[1])
+
+
+def iter_restaurants(stream_path=DEFAULT_STREAM):
+    """
+    Yield (restaurant, {category: [meals]}) from the stream in unit order,
+    reading back one restaurant's meals at a time
+    """
+    _, entries = _index_stream(stream_path)
+
+    # Group line offsets by restaurant (in unit order) and category (first appearance)
+    restaurants = {}
+    for _, _, _, offset, restaurant, category in entries:
+        restaurants.setdefault(restaurant, {}).setdefault(category, []).append(offset)
+
+    with open(stream_path, "rb") as src:
+        for restaurant, categories in restaurants.items():
+            meals_by_category = {}
+            for category, offsets in categories.items():
+                meals = []
+                for offset in offsets:
+                    src.seek(offset)
+                    meals.append(json.loads(src.readline())["meal"])
+                meals_by_category[category] = meals
+            yield restaurant, meals_by_category
+
+
+def iter_menus(stream_path=DEFAULT_STREAM):
+    """
+    Yield (restaurant, menu, {category: [meals]}) from the stream in unit and
+    menu order, one menu's meals at a time
+    """
+    _, entries = _index_stream(stream_path)
+    with open(stream_path, "rb") as src:
+        current = None
+        meals_by_category = {}
+        for _, _, _, offset, restaurant, category in entries:
+            src.seek(offset)
+            record = json.loads(src.readline())
+            key = (restaurant, record["menu"])
+            if key != current:
+                if current is not None:
+                    yield current[0], current[1], meals_by_category
+                current = key
+                meals_by_category = {}
+            meals_by_category.setdefault(category, []).append(record["meal"])
+        if current is not None:
+            yield current[0], current[1], meals_by_category
+
+
+class NutriJsonSink:
+    """Writes nutri_menus.json one restaurant at a time (a crawl_engine sink)"""
+
+    def __init__(self, path=DEFAULT_OUTPUT):
+        self.path = path
+        self.outputs = (path,)
+
+    def open(self, hours):
+        self.hours = hours
+        self.restaurants = 0
+        self.items = 0
+        self.tmp_path = self.path + ".tmp"
+        self.out = open(self.tmp_path, "w", encoding="utf-8")
+        self.out.write("{\n")
+        self.out.write(f'  "timestamp": {json.dumps(datetime.now().isoformat())},\n')
+        self.out.write('  "restaurants": [')
+
+    def add(self, restaurant, categories):
+        restaurant_data = {
+            "name": restaurant,
+            "hours": self.hours.get(restaurant, "Hours not available"),
+            "categories": [{"name": c, "meals": meals} for c, meals in categories.items() if meals],
+        }
+        if not restaurant_data["categories"]:
+            return
+        # Same layout json.dump(indent=2) gives the whole document
+        block = json.dumps(restaurant_data, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+        self.out.write(("," if self.restaurants else "") + "\n    " + block)
+        self.restaurants += 1
+        self.items += sum(len(meals) for meals in categories.values())
+
+    def close(self):
+        self.out.write("\n  ]\n}" if self.restaurants else "]\n}")
+        self.out.close()
+        os.replace(self.tmp_path, self.path)
+        print(f"[✓] Data written to {os.path.basename(self.path)} "
+              f"({self.items} items, {self.restaurants} restaurants)")
+
+
+def assemble_json(stream_path=DEFAULT_STREAM, output_path=DEFAULT_OUTPUT, hours=None):
+    """Write nutri_menus.json from the stream, holding one restaurant at a time"""
+    if hours is None:
+        hours, _ = _index_stream(stream_path)
+    sink = NutriJsonSink(output_path)
+    sink.open(hours)
+    for restaurant, categories in iter_restaurants(stream_path):
+        sink.add(restaurant, categories)
+    sink.close()
+    return sink.restaurants, sink.items
+
+
+if __name__ == "__main__":
+    print(f"🔄 Assembling {DEFAULT_OUTPUT} from {DEFAULT_STREAM}...")
+    assemble_json()
@@ -0,0 +1,120 @@
+"""
+On-disk cache of parsed nutrition labels, shared across scraper runs.
+
+Labels rarely change from one day to the next, so nutri_scrape.py looks each
+item up here by its NetNutrition `showNutrition_<id>` link id before opening
+the nutrition modal. Entries expire after a TTL, the cache is capped at a
+fixed number of entries (least recently used go first), and every entry keeps
+a fingerprint of its label so a refresh can tell whether the label changed.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+DEFAULT_PATH = "outputs/cache/nutrition_labels.json"
+DEFAULT_TTL_DAYS = 7
+DEFAULT_MAX_ENTRIES = 10000
+
+
+def fingerprint(nutrition_data):
+    """Stable content hash of a parsed label"""
+    blob = json.dumps(nutrition_data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()
+
+
+class LabelCache:
+    def __init__(self, path=DEFAULT_PATH, ttl_days=DEFAULT_TTL_DAYS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.entries = self._read()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.changed = 0
+        self.dirty = set()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError) as e:
+            print(f"[!] Ignoring unreadable label cache {self.path}: {e}")
+            return {}
+
+    def get(self, nutrition_id, item_name):
+        """Cached label for this item, or None if missing, expired or for a different item"""
+        entry = self.entries.get(nutrition_id)
+        if entry is None or entry["item"] != item_name:
+            self.misses += 1
+            return None
+        now = time.time()
+        if now - entry["fetched_at"] > self.ttl:
+            self.expired += 1
+            self.misses += 1
+            return None
+        entry["used_at"] = now
+        self.dirty.add(nutrition_id)
+        self.hits += 1
+        return entry["label"]
+
+    def label_fingerprint(self, nutrition_id, item_name):
+        """Fingerprint of the label get() would return (None if it would miss), without counting a lookup"""
+        entry = self.entries.get(nutrition_id)
+        if entry is None or entry["item"] != item_name or time.time() - entry["fetched_at"] > self.ttl:
+            return None
+        return entry["fingerprint"]
+
+    def put(self, nutrition_id, item_name, nutrition_data):
+        if not nutrition_data:
+            return
+        fp = fingerprint(nutrition_data)
+        old = self.entries.get(nutrition_id)
+        if old is not None and old["fingerprint"] != fp:
+            self.changed += 1
+        now = time.time()
+        self.entries[nutrition_id] = {
+            "item": item_name,
+            "fingerprint": fp,
+            "fetched_at": now,
+            "used_at": now,
+            "label": nutrition_data,
+        }
+        self.dirty.add(nutrition_id)
+
+    def save(self):
+        """Merge with whatever is on disk (other workers may have saved), evict, write atomically"""
+        if not self.dirty:
+            return
+        merged = self._read()
+        for key in self.dirty:
+            ours = self.entries[key]
+            theirs = merged.get(key)
+            if theirs is None or theirs["fetched_at"] <= ours["fetched_at"]:
+                merged[key] = ours
+            else:
+                theirs["used_at"] = max(theirs["used_at"], ours["used_at"])
+
+        if len(merged) > self.max_entries:
+            keep = sorted(merged, key=lambda k: merged[k]["used_at"], reverse=True)[:self.max_entries]
+            merged = {k: merged[k] for k in keep}
+
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "entries": merged}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self.entries = merged
+        self.dirty.clear()
+
+    def report(self, prefix=""):
+        lookups = self.hits + self.misses
+        rate = (self.hits / lookups * 100) if lookups else 0
+        print(f"{prefix}[🗃] Label cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), "
+              f"{self.expired} expired, {self.changed} changed, {len(self.entries)} entries")
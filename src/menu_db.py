@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+SQLite store of the crawled menus and nutrition labels.
+
+nutri_menus.json is one pretty-printed document, so a question like "which
+halal items contain sesame" means loading and walking all of it. The nutrition
+crawls now also load outputs/menus.db, a normalized database:
+
+    restaurants (id, name, hours)
+    categories  (id, restaurant_id, name, position)
+    meals       (id, restaurant_id, category_id, name, is_halal, calories,
+                 serving_size, servings_per_container, ingredients, allergens)
+    nutrients   (meal_id, name, amount, unit, daily_value_percent, secondary)
+    ingredients (meal_id, position, ingredient)   -- the label's list, split
+
+with indexes on restaurant, halal flag and calories, and an FTS5 index over
+meal names, ingredients and allergens (plain LIKE matching where SQLite was
+built without FTS5). The database is written to a temporary file in one bulk
+transaction, indexed after the load, and moved into place, so readers never
+see a half-built store.
+
+    python src/menu_db.py build                 # from outputs/nutri_items.ndjson
+    python src/menu_db.py build --json outputs/nutri_menus.json
+    python src/menu_db.py search sesame --halal
+    python src/menu_db.py search "chicken" --restaurant Marketplace --max-calories 400
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+from item_stream import iter_restaurants, _index_stream, DEFAULT_STREAM
+
+DEFAULT_DB = "outputs/menus.db"
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE restaurants (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    hours TEXT
+);
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY,
+    restaurant_id INTEGER NOT NULL REFERENCES restaurants(id),
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE meals (
+    id INTEGER PRIMARY KEY,
+    restaurant_id INTEGER NOT NULL REFERENCES restaurants(id),
+    category_id INTEGER NOT NULL REFERENCES categories(id),
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    is_halal INTEGER NOT NULL,
+    calories REAL,
+    serving_size TEXT,
+    servings_per_container INTEGER,
+    ingredients TEXT,
+    allergens TEXT
+);
+CREATE TABLE nutrients (
+    meal_id INTEGER NOT NULL REFERENCES meals(id),
+    name TEXT NOT NULL,
+    amount REAL,
+    unit TEXT,
+    daily_value_percent REAL,
+    secondary INTEGER NOT NULL
+);
+CREATE TABLE ingredients (
+    meal_id INTEGER NOT NULL REFERENCES meals(id),
+    position INTEGER NOT NULL,
+    ingredient TEXT NOT NULL
+);
+"""
+
+# Created after the bulk load, which is faster than maintaining them row by row
+INDEXES = """
+CREATE INDEX meals_restaurant ON meals (restaurant_id, category_id);
+CREATE INDEX meals_halal ON meals (is_halal, restaurant_id);
+CREATE INDEX meals_calories ON meals (calories);
+CREATE INDEX nutrients_meal ON nutrients (meal_id);
+CREATE INDEX nutrients_name_amount ON nutrients (name, amount);
+CREATE INDEX ingredients_meal ON ingredients (meal_id);
+CREATE INDEX ingredients_ingredient ON ingredients (ingredient COLLATE NOCASE);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE meals_fts USING fts5(
+    name, ingredients, allergens,
+    content='meals', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+"""
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def split_ingredients(text):
+    """Top-level comma-separated ingredients; commas inside (...) or [...] stay with their ingredient"""
+    if not text:
+        return []
+    parts = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(text):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]" and depth:
+            depth -= 1
+        elif ch == "," and not depth:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [p.strip(" .;") for p in parts if p.strip(" .;")]
+
+
+class MenuDb:
+    """Bulk loader: add() restaurants one at a time, then close() to index and publish"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        # Transactions are managed explicitly: the whole load is one BEGIN ... COMMIT
+        self.conn = sqlite3.connect(self.tmp_path, isolation_level=None)
+        # A fresh file that is only published once complete needs no journal
+        self.conn.execute("PRAGMA journal_mode = OFF")
+        self.conn.execute("PRAGMA synchronous = OFF")
+        self.conn.executescript(SCHEMA)
+        try:
+            self.conn.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            print("[!] SQLite has no FTS5 here; search will fall back to LIKE")
+            self.fts = False
+        self.conn.execute("BEGIN")
+        self.restaurants = 0
+        self.meals = 0
+
+    def add(self, restaurant, hours, categories):
+        cur = self.conn.cursor()
+        cur.execute("INSERT INTO restaurants (name, hours) VALUES (?, ?)", (restaurant, hours))
+        restaurant_id = cur.lastrowid
+        self.restaurants += 1
+        for position, (category, meals) in enumerate(categories.items()):
+            if not meals:
+                continue
+            cur.execute("INSERT INTO categories (restaurant_id, name, position) VALUES (?, ?, ?)",
+                        (restaurant_id, category, position))
+            category_id = cur.lastrowid
+            nutrient_rows = []
+            ingredient_rows = []
+            for meal_position, meal in enumerate(meals):
+                nutrition = meal.get("nutrition") or {}
+                serving = nutrition.get("serving_info") or {}
+                cur.execute(
+                    "INSERT INTO meals (restaurant_id, category_id, position, name, is_halal, calories,"
+                    " serving_size, servings_per_container, ingredients, allergens)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (restaurant_id, category_id, meal_position, meal["name"], int(bool(meal.get("is_halal"))),
+                     _number(nutrition.get("calories")), serving.get("serving_size"),
+                     serving.get("servings_per_container"), nutrition.get("ingredients"),
+                     nutrition.get("allergens")))
+                meal_id = cur.lastrowid
+                self.meals += 1
+                for secondary, key in ((0, "nutrition_facts"), (1, "secondary_nutrients")):
+                    for name, info in (nutrition.get(key) or {}).items():
+                        nutrient_rows.append((meal_id, name, _number(info.get("amount")), info.get("unit"),
+                                              _number(info.get("daily_value_percent")), secondary))
+                ingredient_rows.extend((meal_id, i, ingredient)
+                                       for i, ingredient in enumerate(split_ingredients(nutrition.get("ingredients"))))
+            cur.executemany("INSERT INTO nutrients VALUES (?, ?, ?, ?, ?, ?)", nutrient_rows)
+            cur.executemany("INSERT INTO ingredients VALUES (?, ?, ?)", ingredient_rows)
+
+    def close(self, meta=None):
+        cur = self.conn.cursor()
+        meta = dict(meta or {}, built_at=time.strftime("%Y-%m-%dT%H:%M:%S"), fts=str(self.fts).lower())
+        cur.executemany("INSERT INTO meta VALUES (?, ?)", [(k, str(v)) for k, v in meta.items()])
+        cur.execute("COMMIT")
+        cur.executescript(INDEXES)
+        if self.fts:
+            cur.execute("INSERT INTO meals_fts (meals_fts) VALUES ('rebuild')")
+        cur.execute("ANALYZE")
+        self.conn.close()
+        os.replace(self.tmp_path, self.path)
+
+
+class MenuDbSink:
+    """Loads the crawl into outputs/menus.db (a crawl_engine sink)"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.outputs = (path,)
+
+    def open(self, hours):
+        self.hours = hours
+        self.db = MenuDb(self.path)
+
+    def add(self, restaurant, categories):
+        if any(categories.values()):
+            self.db.add(restaurant, self.hours.get(restaurant, "Hours not available"), categories)
+
+    def close(self):
+        self.db.close()
+        print(f"[✓] Database written to {os.path.basename(self.path)} "
+              f"({self.db.meals} items, {self.db.restaurants} restaurants)")
+
+
+def build_from_json(json_path, db_path=DEFAULT_DB):
+    """Load an existing nutri_menus.json (or a restaurant shard list in that shape)"""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    db = MenuDb(db_path)
+    for restaurant in data.get("restaurants", []):
+        categories = {c["name"]: c.get("meals", []) for c in restaurant.get("categories", [])}
+        db.add(restaurant["name"], restaurant.get("hours"), categories)
+    db.close({"source": json_path, "source_timestamp": data.get("timestamp", "")})
+    return db
+
+
+def build_from_stream(stream_path=DEFAULT_STREAM, db_path=DEFAULT_DB):
+    """Load the crawl's item stream, one restaurant at a time"""
+    sink = MenuDbSink(db_path)
+    hours, _ = _index_stream(stream_path)
+    sink.open(hours)
+    for restaurant, categories in iter_restaurants(stream_path):
+        sink.add(restaurant, categories)
+    sink.close()
+    return sink.db
+
+
+def _fts_query(text):
+    # Every word must match (as a prefix), with FTS5 syntax characters neutralised
+    return " ".join('"' + word.replace('"', '""') + '"*' for word in text.split())
+
+
+def search(conn, text, halal=None, restaurant=None, max_calories=None, limit=50):
+    """
+    Meals whose name, ingredients or allergens match every word of text, as
+    dicts with restaurant, category, name, is_halal, calories and allergens
+    """
+    conditions = []
+    params = []
+    fts = conn.execute("SELECT value FROM meta WHERE key = 'fts'").fetchone()
+    if text and fts and fts[0] == "true":
+        conditions.append("m.id IN (SELECT rowid FROM meals_fts WHERE meals_fts MATCH ?)")
+        params.append(_fts_query(text))
+    elif text:
+        for word in text.split():
+            conditions.append("(m.name LIKE ? OR m.ingredients LIKE ? OR m.allergens LIKE ?)")
+            params.extend([f"%{word}%"] * 3)
+    if halal is not None:
+        conditions.append("m.is_halal = ?")
+        params.append(int(halal))
+    if restaurant:
+        conditions.append("r.name = ?")
+        params.append(restaurant)
+    if max_calories is not None:
+        conditions.append("m.calories <= ?")
+        params.append(max_calories)
+    sql = ("SELECT r.name, c.name, m.name, m.is_halal, m.calories, m.allergens"
+           " FROM meals m JOIN restaurants r ON r.id = m.restaurant_id JOIN categories c ON c.id = m.category_id"
+           + (" WHERE " + " AND ".join(conditions) if conditions else "")
+           + " ORDER BY r.id, c.position, m.position LIMIT ?")
+    rows = conn.execute(sql, params + [limit]).fetchall()
+    return [{"restaurant": r, "category": c, "name": n, "is_halal": bool(h), "calories": cal, "allergens": a}
+            for r, c, n, h, cal, a in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the SQLite menu and nutrition store")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="(re)build the database from the item stream or a JSON file")
+    build.add_argument("--stream", default=DEFAULT_STREAM)
+    build.add_argument("--json", help="load this nutri_menus.json instead of the item stream")
+    find = commands.add_parser("search", help="full-text search over meal names, ingredients and allergens")
+    find.add_argument("text", nargs="?", default="")
+    find.add_argument("--halal", action="store_true", help="only halal meals")
+    find.add_argument("--restaurant")
+    find.add_argument("--max-calories", type=float)
+    find.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        db = build_from_json(args.json, args.db) if args.json else build_from_stream(args.stream, args.db)
+        print(f"[⏱] {db.meals} items loaded in {time.perf_counter() - start:.2f}s")
+        return
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    start = time.perf_counter()
+    results = search(conn, args.text, halal=True if args.halal else None, restaurant=args.restaurant,
+                     max_calories=args.max_calories, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for meal in results:
+        calories = f"{meal['calories']:.0f} kcal" if meal["calories"] is not None else "? kcal"
+        print(f"{'[H]' if meal['is_halal'] else '   '} {meal['restaurant']} / {meal['category']}: "
+              f"{meal['name']} ({calories})")
+    print(f"[⏱] {len(results)} results in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
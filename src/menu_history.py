@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Dated history of what every menu served, in outputs/history.db (SQLite).
+
+Each run overwrites halal_menus.txt and the restaurant JSON, so the only
+history is git's copies of whole files. After every crawl this records the
+day's menus instead, stored by content so that storage grows with how much
+the menus change, not with the number of days:
+
+    menus       (hash, items)                       one row per distinct item set
+    menu_items  (menu_hash, position, category, name, is_halal)
+    labels      (hash, body)                        distinct nutrition labels (zlib JSON)
+    label_spans (name, label_hash, first_date, last_date)
+    spans       (unit, menu, menu_hash, first_date, last_date)
+    days        (date, recorded_at, job)            the dates a crawl was recorded
+
+A menu whose items are the same as on the previous recorded day just extends
+its span's last_date; only a new or changed menu adds a span (and, if that
+item set was never seen before, its items). Nutrition labels are handled the
+same way per item name, so a label that changes and later changes back gets
+a new span rather than one covering the days in between. Rows are never
+deleted or rewritten other than extending a span (a span only ever grows),
+and a day recorded twice (a second run with changed menus) keeps both
+versions, so a date shows everything served on it. Recording a day that an
+unchanged menu's span already covers changes nothing.
+
+    python src/menu_history.py record [--stream outputs/nutri_items.ndjson] [--date 2026-10-16]
+    python src/menu_history.py served Marketplace 2026-10-16 [--halal]
+    python src/menu_history.py frequency "Chicken Shawarma"
+    python src/menu_history.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from datetime import date as Date
+
+from item_stream import iter_menus, DEFAULT_STREAM
+
+DEFAULT_DB = "outputs/history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS menus (
+    hash TEXT PRIMARY KEY,
+    items INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS menu_items (
+    menu_hash TEXT NOT NULL REFERENCES menus(hash),
+    position INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_halal INTEGER NOT NULL,
+    PRIMARY KEY (menu_hash, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS menu_items_name ON menu_items (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS labels (
+    hash TEXT PRIMARY KEY,
+    body BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS label_spans (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    label_hash TEXT NOT NULL REFERENCES labels(hash),
+    first_date TEXT NOT NULL,
+    last_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS label_spans_name ON label_spans (name, label_hash, last_date);
+CREATE TABLE IF NOT EXISTS spans (
+    id INTEGER PRIMARY KEY,
+    unit TEXT NOT NULL,
+    menu TEXT NOT NULL,
+    menu_hash TEXT NOT NULL REFERENCES menus(hash),
+    first_date TEXT NOT NULL,
+    last_date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS spans_unit ON spans (unit, first_date);
+CREATE INDEX IF NOT EXISTS spans_menu ON spans (unit, menu, menu_hash, last_date);
+CREATE INDEX IF NOT EXISTS spans_hash ON spans (menu_hash);
+CREATE TABLE IF NOT EXISTS days (
+    date TEXT PRIMARY KEY,
+    recorded_at TEXT NOT NULL,
+    job TEXT
+);
+"""
+
+
+def _hash(value):
+    payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def menu_items(categories):
+    """The item set that identifies a menu: [category, name, is_halal] rows in menu order"""
+    return [[category, meal["name"], bool(meal.get("is_halal"))]
+            for category, meals in categories.items() for meal in meals]
+
+
+def connect(path=DEFAULT_DB):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    # Databases from before label_spans kept one date range per (name, label)
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_labels'").fetchone():
+        with conn:
+            conn.execute("INSERT INTO label_spans (name, label_hash, first_date, last_date)"
+                         " SELECT name, label_hash, first_date, last_date FROM item_labels")
+            conn.execute("DROP TABLE item_labels")
+    return conn
+
+
+def _record_span(conn, table, key, day, previous_day, next_day):
+    """
+    Note that the row identified by key (a {column: value} dict) was seen on
+    day, in the span table `table`. A span that already covers day is left
+    alone; one that reaches the previous recorded day (or starts on the next
+    one) grows to include day; otherwise a new span is added. Returns
+    "covered", "extended" or "new".
+    """
+    where = " AND ".join(f"{column} = ?" for column in key)
+    values = list(key.values())
+    if conn.execute(f"SELECT 1 FROM {table} WHERE {where} AND first_date <= ? AND last_date >= ? LIMIT 1",
+                    values + [day, day]).fetchone():
+        return "covered"
+    if conn.execute(f"UPDATE {table} SET last_date = MAX(last_date, ?) WHERE id = (SELECT id FROM {table}"
+                    f" WHERE {where} AND last_date >= ? AND last_date < ? ORDER BY last_date DESC LIMIT 1)",
+                    [day] + values + [previous_day, day]).rowcount:
+        return "extended"
+    if next_day and conn.execute(f"UPDATE {table} SET first_date = MIN(first_date, ?) WHERE id = (SELECT id FROM"
+                                 f" {table} WHERE {where} AND first_date <= ? AND first_date > ?"
+                                 f" ORDER BY first_date LIMIT 1)", [day] + values + [next_day, day]).rowcount:
+        return "extended"
+    columns = list(key) + ["first_date", "last_date"]
+    conn.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                 values + [day, day])
+    return "new"
+
+
+def record_day(conn, menus, day=None, job=None):
+    """
+    Record menus, an iterable of (unit, menu, {category: [meals]}), as served
+    on day (an ISO date, default today). Returns counts of what was stored.
+    """
+    day = day or Date.today().isoformat()
+    counts = {"menus": 0, "extended": 0, "new_spans": 0, "new_item_sets": 0, "new_labels": 0}
+    with conn:
+        previous_day = conn.execute("SELECT MAX(date) FROM days WHERE date < ?", (day,)).fetchone()[0] or day
+        next_day = conn.execute("SELECT MIN(date) FROM days WHERE date > ?", (day,)).fetchone()[0]
+        for unit, menu, categories in menus:
+            items = menu_items(categories)
+            if not items:
+                continue
+            counts["menus"] += 1
+            menu_hash = _hash(items)
+            if conn.execute("INSERT OR IGNORE INTO menus VALUES (?, ?)", (menu_hash, len(items))).rowcount:
+                conn.executemany("INSERT INTO menu_items VALUES (?, ?, ?, ?, ?)",
+                                 [(menu_hash, i, *item) for i, item in enumerate(items)])
+                counts["new_item_sets"] += 1
+
+            # Served on the previous recorded day (or already covered): carry the span on
+            span = _record_span(conn, "spans", {"unit": unit, "menu": menu, "menu_hash": menu_hash},
+                                day, previous_day, next_day)
+            counts["new_spans" if span == "new" else "extended"] += 1
+
+            for meals in categories.values():
+                for meal in meals:
+                    if meal.get("nutrition"):
+                        counts["new_labels"] += _record_label(conn, meal["name"], meal["nutrition"],
+                                                              day, previous_day, next_day)
+
+        conn.execute("INSERT INTO days VALUES (?, ?, ?) ON CONFLICT (date) DO UPDATE SET recorded_at = excluded.recorded_at,"
+                     " job = excluded.job", (day, time.strftime("%Y-%m-%dT%H:%M:%S"), job))
+    return counts
+
+
+def _record_label(conn, name, nutrition, day, previous_day, next_day):
+    label_hash = _hash(nutrition)
+    new = conn.execute("INSERT OR IGNORE INTO labels VALUES (?, ?)", (
+        label_hash, zlib.compress(json.dumps(nutrition, ensure_ascii=False).encode("utf-8"), 9))).rowcount
+    _record_span(conn, "label_spans", {"name": name, "label_hash": label_hash}, day, previous_day, next_day)
+    return new
+
+
+def record_stream(stream_path=DEFAULT_STREAM, path=DEFAULT_DB, day=None, job=None):
+    """Record a crawl's item stream as the menus served on day"""
+    conn = connect(path)
+    try:
+        return record_day(conn, iter_menus(stream_path), day, job)
+    finally:
+        conn.close()
+
+
+def served(conn, unit, day, halal=None):
+    """What unit served on day: {menu: {category: [(name, is_halal)]}}"""
+    sql = ("SELECT s.menu, i.category, i.name, i.is_halal FROM spans s"
+           " JOIN menu_items i ON i.menu_hash = s.menu_hash"
+           " WHERE s.unit = ? AND s.first_date <= ? AND s.last_date >= ?")
+    params = [unit, day, day]
+    if halal is not None:
+        sql += " AND i.is_halal = ?"
+        params.append(int(halal))
+    result = {}
+    for menu, category, name, is_halal in conn.execute(sql + " ORDER BY s.id, i.position", params):
+        meals = result.setdefault(menu, {}).setdefault(category, [])
+        if (name, bool(is_halal)) not in meals:
+            meals.append((name, bool(is_halal)))
+    return result
+
+
+def frequency(conn, item):
+    """
+    How often item (a name, case-insensitive) was served: per unit, the
+    number of recorded days it was on some menu, and its first and last date
+    """
+    return [
+        {"unit": unit, "days": days, "first_date": first, "last_date": last}
+        for unit, days, first, last in conn.execute(
+            "SELECT s.unit, COUNT(DISTINCT d.date), MIN(d.date), MAX(d.date) FROM spans s"
+            " JOIN days d ON d.date BETWEEN s.first_date AND s.last_date"
+            " WHERE s.menu_hash IN (SELECT menu_hash FROM menu_items WHERE name = ? COLLATE NOCASE)"
+            " GROUP BY s.unit ORDER BY 2 DESC, s.unit", (item,))
+    ]
+
+
+def label_on(conn, item, day):
+    """The nutrition label item carried on day, or None"""
+    row = conn.execute("SELECT l.body FROM label_spans ls JOIN labels l ON l.hash = ls.label_hash"
+                       " WHERE ls.name = ? AND ls.first_date <= ? AND ls.last_date >= ?"
+                       " ORDER BY ls.id DESC LIMIT 1", (item, day, day)).fetchone()
+    return json.loads(zlib.decompress(row[0])) if row else None
+
+
+def stats(conn):
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ("days", "spans", "menus", "menu_items", "labels", "label_spans")}
+    first, last = conn.execute("SELECT MIN(date), MAX(date) FROM days").fetchone()
+    counts["first_date"], counts["last_date"] = first, last
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and query the dated menu history")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="record a crawl's item stream as one day's menus")
+    record.add_argument("--stream", default=DEFAULT_STREAM)
+    record.add_argument("--date", help="ISO date the menus were served (default: today)")
+    find = commands.add_parser("served", help="what a unit served on a date")
+    find.add_argument("unit")
+    find.add_argument("date")
+    find.add_argument("--halal", action="store_true", help="only halal items")
+    often = commands.add_parser("frequency", help="on how many recorded days an item was served, per unit")
+    often.add_argument("item")
+    commands.add_parser("stats", help="rows stored and dates covered")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        counts = record_stream(args.stream, args.db, args.date)
+        print(f"[✓] {counts['menus']} menus recorded: {counts['extended']} unchanged, {counts['new_spans']} new or "
+              f"changed ({counts['new_item_sets']} new item sets, {counts['new_labels']} new labels)")
+        return
+
+    conn = connect(args.db)
+    start = time.perf_counter()
+    if args.command == "served":
+        result = served(conn, args.unit, args.date, halal=True if args.halal else None)
+        for menu, categories in result.items():
+            print(menu)
+            for category, meals in categories.items():
+                print(f"  {category}:")
+                for name, is_halal in meals:
+                    print(f"    - {name}{' [H]' if is_halal else ''}")
+        if not result:
+            print(f"Nothing recorded for {args.unit} on {args.date}")
+    elif args.command == "frequency":
+        rows = frequency(conn, args.item)
+        for row in rows:
+            print(f"  {row['unit']:<32}{row['days']:>5} days  ({row['first_date']} to {row['last_date']})")
+        if not rows:
+            print(f"{args.item} does not appear in the history")
+    else:
+        for key, value in stats(conn).items():
+            print(f"  {key:<12}{value}")
+        print(f"  {'size':<12}{os.path.getsize(args.db) / 1024:.0f} KB")
+    print(f"[⏱] {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
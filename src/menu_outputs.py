@@ -0,0 +1,192 @@
+"""
+Text and PDF menus written from a crawl; the sinks at the bottom plug into
+crawl_engine.run().
+
+halal_menus.txt/.pdf list only the halal meals; all_menus.txt/.pdf list every
+meal as (name, is_halal) with halal rows in green and the rest in salmon.
+The sinks write the PDFs one cached fragment per restaurant (see
+pdf_sections.py), so only restaurants whose menu or hours changed are
+rendered again.
+"""
+
+import os
+from datetime import datetime
+
+from reportlab.platypus import Paragraph, Spacer, KeepTogether
+
+from pdf_render import styles, category_table, build_pdf, content_hash, published_hash
+import pdf_sections
+from pdf_sections import SECTION_CACHE_DIR
+import run_metrics
+
+
+def write_menus_txt(menus, dining_hours, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for restaurant, categories in menus.items():
+            # Add the hours if available
+            hours = dining_hours.get(restaurant, "Hours not available")
+            f.write(f"{restaurant} - {hours}\n")
+
+            for category, meals in categories.items():
+                if not meals:
+                    continue
+                f.write(f"  {category}:\n")
+                for meal in meals:
+                    f.write(f"    - {meal}\n")
+            f.write("\n")
+
+
+def _restaurant_header(restaurant, hours):
+    s = styles()
+    # Add restaurant name and hours information
+    return [Paragraph(restaurant, s["title"]), Paragraph(f"{hours}", s["subtitle"]), Spacer(0, 6)]
+
+
+def _halal_section(restaurant, categories, hours):
+    elements = []
+    # The header is kept together with the first category
+    header_elements = _restaurant_header(restaurant, hours)
+    first_category_added = False
+
+    for category, meals in categories.items():
+        if not meals:
+            continue
+
+        category_elements = [category_table(category, meals), Spacer(1, 10)]
+        if not first_category_added:
+            header_elements.extend(category_elements)
+            first_category_added = True
+            elements.append(KeepTogether(header_elements))
+        else:
+            # Wrap subsequent categories individually
+            elements.append(KeepTogether(category_elements))
+
+    # Add extra space between restaurants
+    elements.append(Spacer(1, 10))
+    return elements
+
+
+def _all_section(restaurant, categories, hours):
+    elements = _restaurant_header(restaurant, hours)
+
+    for category, meals in categories.items():
+        if not meals:
+            continue
+        # Halal rows in green, the rest in salmon
+        elements.append(category_table(category, [meal for meal, _ in meals],
+                                       [is_halal for _, is_halal in meals]))
+        elements.append(Spacer(1, 10))
+
+    elements.append(Spacer(1, 10))
+    return elements
+
+
+_SECTIONS = {"halal": _halal_section, "all": _all_section}
+
+
+def _render_section(path, kind, restaurant, categories, hours):
+    """One restaurant as a PDF fragment of its own (see pdf_sections.py)"""
+    build_pdf(path, _SECTIONS[kind](restaurant, categories, hours))
+
+
+def _write_pdf(kind, menus, dining_hours, path, date_today, digest=None):
+    elements = [Paragraph(f"Halal @ Duke - {date_today}", styles()["title"]), Spacer(1, 12)]
+    for restaurant, categories in menus.items():
+        elements.extend(_SECTIONS[kind](restaurant, categories, dining_hours.get(restaurant, "Hours not available")))
+    build_pdf(path, elements, digest=digest)
+
+
+def write_halal_pdf(menus, dining_hours, path, date_today, digest=None):
+    _write_pdf("halal", menus, dining_hours, path, date_today, digest)
+
+
+def write_all_pdf(menus, dining_hours, path, date_today, digest=None):
+    _write_pdf("all", menus, dining_hours, path, date_today, digest)
+
+
+def write_sectioned_pdf(kind, menus, dining_hours, path, date_today, cache_dir=SECTION_CACHE_DIR, digest=None):
+    """
+    The same menus PDF, one restaurant per cached fragment behind a title page
+    listing the restaurants and their hours. Falls back to write_halal_pdf /
+    write_all_pdf (one document build) without pypdf.
+    """
+    if not pdf_sections.available():
+        _write_pdf(kind, menus, dining_hours, path, date_today, digest)
+        return
+    s = styles()
+    title_story = [Paragraph(f"Halal @ Duke - {date_today}", s["title"]), Spacer(1, 12)]
+    sections = []
+    for restaurant, categories in menus.items():
+        hours = dining_hours.get(restaurant, "Hours not available")
+        title_story.append(Paragraph(f"{restaurant} - {hours}", s["subtitle"]))
+        sections.append((kind, restaurant, categories, hours))
+    reused = pdf_sections.write_sectioned_pdf(path, f"{kind}_menus", title_story, sections, _render_section,
+                                              cache_dir=cache_dir, digest=digest)
+    print(f"[✓] {len(sections) - reused} restaurant sections rendered, {reused} reused")
+
+
+class _MenuSink:
+    """
+    Collects the (small) per-restaurant meal lists, writes TXT and PDF on
+    close. The PDF is only rendered when its content differs from what the
+    existing file was built from (see pdf_render.published_hash()).
+    """
+
+    def __init__(self, kind, txt_path, pdf_path):
+        self.kind = kind
+        self.txt_path = txt_path
+        self.pdf_path = pdf_path
+        self.outputs = (txt_path, pdf_path)
+
+    def open(self, hours):
+        self.hours = hours
+        self.menus = {}
+
+    def add(self, restaurant, categories):
+        kept = {}
+        for category, meals in categories.items():
+            entries = self.entries(meals)
+            if entries:
+                kept[category] = entries
+        if kept:
+            self.menus[restaurant] = kept
+
+    def close(self):
+        txt_name = os.path.basename(self.txt_path)
+        pdf_name = os.path.basename(self.pdf_path)
+        with run_metrics.stage("txt_write", txt_name):
+            write_menus_txt(self.menus, self.hours, self.txt_path)
+        print(f"[✓] Data written to {txt_name}")
+
+        date_today = datetime.today().strftime('%A, %B %d, %Y')
+        # Only the hours of the restaurants listed are shown
+        hours = {restaurant: self.hours.get(restaurant, "Hours not available") for restaurant in self.menus}
+        digest = content_hash(self.kind, self.menus, hours, date_today)
+        if published_hash(self.pdf_path) == digest:
+            print(f"[=] {pdf_name} already shows this content, not re-rendered")
+            return
+        print("\n[✔] Generating colorful PDF...")
+        with run_metrics.stage("pdf_build", pdf_name):
+            write_sectioned_pdf(self.kind, self.menus, self.hours, self.pdf_path, date_today, digest=digest)
+        print(f"[✓] PDF saved as '{pdf_name}'")
+
+
+class HalalMenusSink(_MenuSink):
+    def __init__(self, txt_path="outputs/halal_menus.txt", pdf_path="docs/outputs/halal_menus.pdf"):
+        super().__init__("halal", txt_path, pdf_path)
+
+    def entries(self, meals):
+        names = []
+        for meal in meals:
+            # A meal listed on several menus shows up once
+            if meal["is_halal"] and meal["name"] not in names:
+                names.append(meal["name"])
+        return names
+
+
+class AllMenusSink(_MenuSink):
+    def __init__(self, txt_path="outputs/all_menus.txt", pdf_path="outputs/all_menus.pdf"):
+        super().__init__("all", txt_path, pdf_path)
+
+    def entries(self, meals):
+        return [(meal["name"], meal["is_halal"]) for meal in meals]
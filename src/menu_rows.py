@@ -0,0 +1,68 @@
+"""
+Menu table rows as plain records, shared by the Selenium and HTTP crawls.
+
+extract_menu_rows() reads the whole `table.table` item table with a single
+execute_script call instead of several WebDriver round-trips per row, and
+group_rows() applies the scrapers' category rules to the resulting records.
+
+Each record is {"kind", "category", "name", "is_halal", "nutrition_id"}:
+kind is "category" for itemGroupRow rows (category set, the rest empty) or
+"item" for itemPrimaryRow/itemAlternateRow rows (category empty).
+"""
+
+EXTRACT_ROWS_JS = """
+var out = [];
+document.querySelectorAll("table.table tbody tr").forEach(function (tr) {
+    var cls = tr.className || "";
+    if (cls.indexOf("itemGroupRow") !== -1) {
+        var button = tr.querySelector("div[role='button']");
+        out.push({kind: "category", category: button ? button.innerText.trim() : null,
+                  name: null, is_halal: false, nutrition_id: null});
+    } else if (cls.indexOf("itemPrimaryRow") !== -1 || cls.indexOf("itemAlternateRow") !== -1) {
+        var meal = tr.querySelector("td a.cbo_nn_itemHover");
+        if (!meal) return;
+        var isHalal = Array.prototype.some.call(meal.querySelectorAll("img"), function (img) {
+            return (img.getAttribute("alt") || "").trim().toLowerCase().indexOf("halal") !== -1;
+        });
+        var link = tr.querySelector("a[id^='showNutrition_'].cbo_nn_itemHover");
+        out.push({kind: "item", category: null, name: meal.innerText.trim().split("\\n")[0],
+                  is_halal: isHalal, nutrition_id: link ? link.id : null});
+    }
+});
+return out;
+"""
+
+
+def extract_menu_rows(driver):
+    """Every row of the currently displayed item table, in one WebDriver call"""
+    return driver.execute_script(EXTRACT_ROWS_JS) or []
+
+
+def group_rows(rows, unit_data, strict_categories, on_item, unique=False):
+    """
+    Append item rows to unit_data[category] using the scrapers' category rules.
+
+    With strict_categories (the regular menu loop), items before the first
+    category or under an unreadable one are dropped; otherwise (auto-loaded
+    item panels) they land in "Uncategorized". on_item(row) builds the value
+    appended for each meal; with unique, values already listed are skipped.
+    """
+    current_category = None
+    for row in rows:
+        if row["kind"] == "category":
+            current_category = row["category"]
+            if not current_category and not strict_categories:
+                current_category = "Uncategorized"
+            if current_category and current_category not in unit_data:
+                unit_data[current_category] = []
+        elif row["name"]:
+            if not current_category:
+                if strict_categories:
+                    continue
+                current_category = "Uncategorized"
+                unit_data.setdefault(current_category, [])
+            meal = on_item(row)
+            if unique and meal in unit_data[current_category]:
+                continue
+            unit_data[current_category].append(meal)
+    return unit_data
@@ -0,0 +1,121 @@
+"""
+Per-menu snapshot of the previous crawl, for delta runs.
+
+For every unit and menu we keep a fingerprint of its item rows (category
+headers, meal names and halal flags, and for nutrition crawls the label each
+item currently has in the label cache) together with the grouped data that was
+built from them. A changed or expired label therefore counts as a changed
+menu, so labels are never carried forward for longer than the cache keeps them. On the next run a menu whose rows hash the same is carried
+forward from the snapshot, skipping the category walk and any nutrition
+modals, and if no menu changed at all the outputs don't need rebuilding.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+from menu_rows import group_rows
+
+AUTO_MENU = "(auto-loaded)"
+
+
+def rows_fingerprint(rows, labels=None):
+    """
+    Hash of the menu rows that determine its output (see menu_rows.py).
+    labels, a LabelCache, adds each item's cached label fingerprint.
+    """
+    key = [(r["kind"], r["category"], r["name"], r["is_halal"]) for r in rows]
+    if labels is not None:
+        key.append([labels.label_fingerprint(r["nutrition_id"], r["name"])
+                    for r in rows if r["kind"] == "item" and r.get("nutrition_id")])
+    return hashlib.sha1(json.dumps(key, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def merge_menu(unit_data, menu_data, unique=False):
+    """Fold one menu's grouped categories into its unit, like group_rows() would have"""
+    for category, meals in menu_data.items():
+        target = unit_data.setdefault(category, [])
+        for meal in meals:
+            if unique and meal in target:
+                continue
+            target.append(meal)
+    return unit_data
+
+
+def group_menu(snapshot, unit, menu, rows, strict_categories, on_item, unique=False, labels=None):
+    """
+    group_rows() for a single menu into a fresh dict, served from the snapshot
+    instead when its rows (and, given labels, their cached labels) are
+    unchanged. snapshot may be None (no delta mode).
+    """
+    if snapshot is None:
+        return group_rows(rows, {}, strict_categories, on_item, unique)
+    menu_data = snapshot.lookup(unit, menu, rows_fingerprint(rows, labels))
+    if menu_data is None:
+        menu_data = group_rows(rows, {}, strict_categories, on_item, unique)
+        # Building the menu refreshed its labels in the cache
+        snapshot.record(unit, menu, rows_fingerprint(rows, labels), menu_data)
+    return menu_data
+
+
+class MenuSnapshot:
+    def __init__(self, path):
+        self.path = path
+        stored = self._load()
+        self.units = stored.get("units", {})
+        self.previous_meta = stored.get("meta")
+        self.meta = None  # anything else the outputs depend on, e.g. date and hours
+        self.touched = {}
+        self.reused = 0
+        self.refreshed = 0
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[!] Ignoring unreadable menu snapshot {self.path}: {e}")
+            return {}
+
+    def _read(self):
+        return self._load().get("units", {})
+
+    def lookup(self, unit, menu, fingerprint):
+        """Stored grouped data for this menu if its rows are unchanged, else None"""
+        entry = self.units.get(unit, {}).get(menu)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        self.touched.setdefault(unit, {})[menu] = entry
+        self.reused += 1
+        # Stored as JSON, so tuples (full_scrape's (name, is_halal)) come back as lists
+        return {c: [tuple(m) if isinstance(m, list) else m for m in meals] for c, meals in entry["data"].items()}
+
+    def record(self, unit, menu, fingerprint, menu_data):
+        self.touched.setdefault(unit, {})[menu] = {"fingerprint": fingerprint, "data": menu_data}
+        self.refreshed += 1
+
+    def changed(self):
+        """True if any menu (or the meta) differs from the snapshot"""
+        if self.refreshed or self.meta != self.previous_meta:
+            return True
+        return {u: set(m) for u, m in self.touched.items()} != {u: set(m) for u, m in self.units.items()}
+
+    def save(self, merge=False):
+        """
+        Write this run's menus as the new snapshot. With merge, units other
+        processes saved meanwhile (parallel workers) are kept.
+        """
+        units = self._read() if merge else {}
+        units.update(self.touched)
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"meta": self.meta, "units": units}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def report(self, prefix=""):
+        print(f"{prefix}[Δ] Menu snapshot: {self.reused} menus unchanged, {self.refreshed} re-scraped")
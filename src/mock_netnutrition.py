@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for netnutrition.cbord.com/nn-prod/Duke, for benchmarks and
+offline crawl tests.
+
+The recorded fixtures under src/fixtures/netnutrition/ (unit card, menu link,
+item table rows and a nutrition label) are used as templates to synthesize a
+site of any size, e.g. 30 units x 10 menus x 50 items. Every fifth unit shows
+its items straight away (no menu list) and every tenth has none, like the real
+site. The home page carries a small script that stands in for NetNutrition's
+own, so Chrome crawls click through units, menus, "Back" and nutrition dialogs
+exactly as they do live, and the same AJAX endpoints serve the --http crawl.
+
+    python src/mock_netnutrition.py --units 30 --menus 10 --items 50 --latency-ms 80
+    python src/nutri_scrape.py --base-url http://127.0.0.1:8765/nn-prod/Duke
+
+GET /__stats returns how many requests each endpoint served; POST /__reset
+zeroes the counters.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+
+from nn_client import FIXTURES_DIR, UNIT_ENDPOINT, MENU_ENDPOINT, NUTRITION_ENDPOINT, ENDPOINTS
+
+PREFIX = "/nn-prod/Duke"
+DISCLAIMER_COOKIE = "nn_mobile_disc"
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>NetNutrition (mock)</title>
+<style>
+  .hidden {{ display: none; }}
+  #nutritionModal {{ position: fixed; top: 10%; left: 10%; background: #fff; border: 1px solid #333; }}
+</style>
+</head>
+<body>
+<div id="cbo_nn_mobileDisclaimer" class="modal{disclaimer_class}">
+  <button type="button" class="btn btn-primary" onclick="javascript:NetNutrition.UI.setIgnoreMobileDisc();">Continue</button>
+</div>
+<div id="navBar" class="hidden"><a href="#" onclick="javascript:NetNutrition.UI.goBack();">Back</a></div>
+<div id="unitsPanel">
+{unit_cards}
+</div>
+<div id="menuPanel" class="hidden"></div>
+<div id="itemPanel" class="hidden"></div>
+<div id="nutritionModal" class="hidden">
+  <button type="button" id="btn_nn_nutrition_close" onclick="javascript:NetNutrition.UI.closeNutrition();">Close</button>
+  <div id="nutritionLabel"></div>
+</div>
+<script>
+var NetNutrition = {{UI: (function () {{
+  var view = "units";
+  function el(id) {{ return document.getElementById(id); }}
+  function show(id, on) {{ el(id).classList.toggle("hidden", !on); }}
+  function setView(next) {{
+    view = next;
+    show("unitsPanel", view === "units");
+    show("menuPanel", view === "menus");
+    show("itemPanel", view === "items" || view === "unitItems");
+    show("navBar", view !== "units");
+  }}
+  function post(endpoint, field, oid, done) {{
+    fetch("{prefix}/" + endpoint, {{method: "POST",
+      headers: {{"Content-Type": "application/x-www-form-urlencoded", "X-Requested-With": "XMLHttpRequest"}},
+      body: field + "=" + oid}}).then(function (r) {{ return r.text(); }}).then(done);
+  }}
+  function applyPanels(text) {{
+    JSON.parse(text).panels.forEach(function (p) {{ el(p.id).innerHTML = p.html; }});
+  }}
+  return {{
+    setIgnoreMobileDisc: function () {{
+      document.cookie = "{cookie}=1; path=/";
+      el("cbo_nn_mobileDisclaimer").classList.add("hidden");
+    }},
+    unitsSelectUnit: function (oid) {{
+      post("{unit_endpoint}", "unitOid", oid, function (text) {{
+        applyPanels(text);
+        setView(el("menuPanel").innerHTML.trim() ? "menus" : "unitItems");
+      }});
+    }},
+    menuListSelectMenu: function (oid) {{
+      post("{menu_endpoint}", "menuOid", oid, function (text) {{ applyPanels(text); setView("items"); }});
+    }},
+    goBack: function () {{ setView(view === "items" ? "menus" : "units"); }},
+    getItemNutritionLabelOnClick: function (event, oid) {{
+      post("{nutrition_endpoint}", "detailOid", oid, function (html) {{
+        el("nutritionLabel").innerHTML = html;
+        show("nutritionModal", true);
+      }});
+    }},
+    closeNutrition: function () {{ show("nutritionModal", false); }}
+  }};
+}})()}};
+</script>
+</body>
+</html>
+"""
+
+NO_ITEMS_HTML = '<div class="alert">There are no items available for the selected menu.</div>'
+
+
+def _read_fixture(name):
+    with open(f"{FIXTURES_DIR}/{name}", "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _panel_html(name, panel_id):
+    panels = json.loads(_read_fixture(name))["panels"]
+    return next(p["html"] for p in panels if p["id"] == panel_id)
+
+
+class MockSite:
+    """The synthetic site: recorded fixture markup repeated to the requested size"""
+
+    def __init__(self, units=30, menus=10, items=50, category_every=10, halal_every=3):
+        self.unit_count = units
+        self.menu_count = menus
+        self.item_count = items
+        self.category_every = category_every
+        self.halal_every = halal_every
+        self._load_templates()
+
+    def _load_templates(self):
+        home = _read_fixture("home.html")
+        self.unit_card = re.search(r'(<div class="card unit">.*?</div>\s*</div>)', home, re.DOTALL).group(1)
+        table = _panel_html("menu_101.json", "itemPanel")
+        self.table_head = table[:table.index("<tr class=\"itemGroupRow\"")]
+        self.table_tail = table[table.rindex("</tr>") + len("</tr>"):]
+        self.group_row = re.search(r'(<tr class="itemGroupRow">.*?</tr>)', table).group(1)
+        self.item_row = re.search(r'(<tr class="itemPrimaryRow">.*?</tr>)', table).group(1)
+        menu_list = _panel_html("unit_1.json", "menuPanel")
+        self.menu_link = re.search(r'(<a [^>]*cbo_nn_menuLink[^>]*>.*?</a>)', menu_list).group(1)
+        self.menu_list_head = menu_list[:menu_list.index("<a ")]
+        self.menu_list_tail = menu_list[menu_list.rindex("</a>") + len("</a>"):]
+        self.label = _read_fixture("label_5001.html")
+
+    # --- Shape of the site ---
+
+    def unit_kind(self, unit):
+        if unit % 10 == 0:
+            return "empty"
+        if unit % 5 == 0:
+            return "auto"
+        return "menus"
+
+    def unit_name(self, unit):
+        return f"Mock Unit {unit:02d}"
+
+    def item_id(self, menu_oid, index):
+        return menu_oid * 1000 + index
+
+    def item_name(self, item_id):
+        return f"Mock Item {item_id}"
+
+    # --- Rendered HTML ---
+
+    def home(self, disclaimer_accepted=False):
+        cards = []
+        for unit in range(1, self.unit_count + 1):
+            card = self.unit_card.replace("unitsSelectUnit(1)", f"unitsSelectUnit({unit})")
+            card = card.replace(">Marketplace<", f">{self.unit_name(unit)}<")
+            cards.append(card)
+        return _PAGE.format(
+            disclaimer_class=" hidden" if disclaimer_accepted else "",
+            unit_cards="\n".join(cards), prefix=PREFIX, cookie=DISCLAIMER_COOKIE,
+            unit_endpoint=UNIT_ENDPOINT, menu_endpoint=MENU_ENDPOINT, nutrition_endpoint=NUTRITION_ENDPOINT,
+        )
+
+    def item_table(self, menu_oid):
+        rows = []
+        for index in range(self.item_count):
+            if index % self.category_every == 0:
+                rows.append(self.group_row.replace("Breakfast Meats", f"Category {index // self.category_every + 1}"))
+            item_id = self.item_id(menu_oid, index)
+            row = self.item_row.replace("5001", str(item_id)).replace("Chicken Sausage Link", self.item_name(item_id))
+            if item_id % self.halal_every:
+                row = row.replace('alt="Halal" title="Halal"', 'alt="Vegan" title="Vegan"')
+            rows.append(row)
+        return self.table_head + "".join(rows) + self.table_tail
+
+    def unit_panels(self, unit):
+        kind = self.unit_kind(unit)
+        if kind == "empty":
+            return {"menuPanel": "", "itemPanel": NO_ITEMS_HTML}
+        if kind == "auto":
+            return {"menuPanel": "", "itemPanel": self.item_table(unit * 100)}
+        links = [
+            self.menu_link.replace("menuListSelectMenu(101)", f"menuListSelectMenu({unit * 100 + m})")
+                          .replace(">Breakfast<", f">Menu {m}<")
+            for m in range(1, self.menu_count + 1)
+        ]
+        return {"menuPanel": self.menu_list_head + "".join(links) + self.menu_list_tail, "itemPanel": ""}
+
+    def menu_panels(self, menu_oid):
+        return {"itemPanel": self.item_table(menu_oid)}
+
+    def nutrition_label(self, item_id):
+        return self.label.replace("Chicken Sausage Link", self.item_name(item_id))
+
+
+def _panels_json(panels):
+    return json.dumps({"success": True, "panels": [{"id": k, "html": v} for k, v in panels.items()]})
+
+
+def make_handler(site, latency_ms=0, jitter_ms=0):
+    stats = Counter()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _delay(self):
+            if latency_ms or jitter_ms:
+                time.sleep(max(0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000)
+
+        def _count(self, key):
+            with lock:
+                stats[key] += 1
+
+        def _send(self, body, content_type="text/html; charset=utf-8", status=200):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/__stats":
+                with lock:
+                    return self._send(json.dumps(dict(stats)), "application/json")
+            if self.path.rstrip("/") != PREFIX:
+                return self._send("not found", status=404)
+            self._count("home")
+            self._delay()
+            accepted = f"{DISCLAIMER_COOKIE}=1" in (self.headers.get("Cookie") or "")
+            self._send(site.home(disclaimer_accepted=accepted))
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            if self.path == "/__reset":
+                with lock:
+                    stats.clear()
+                return self._send("{}", "application/json")
+            endpoint = self.path[len(PREFIX) + 1:] if self.path.startswith(PREFIX + "/") else None
+            if endpoint not in ENDPOINTS:
+                return self._send("not found", status=404)
+            field, _ = ENDPOINTS[endpoint]
+            try:
+                oid = int(form[field][0])
+            except (KeyError, ValueError):
+                return self._send("bad request", status=400)
+            self._count(endpoint)
+            self._delay()
+            if endpoint == UNIT_ENDPOINT:
+                self._send(_panels_json(site.unit_panels(oid)), "application/json")
+            elif endpoint == MENU_ENDPOINT:
+                self._send(_panels_json(site.menu_panels(oid)), "application/json")
+            else:
+                self._send(site.nutrition_label(oid))
+
+    return Handler
+
+
+def start_server(site, port=0, latency_ms=0, jitter_ms=0):
+    """Serve site in a background thread; returns (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(site, latency_ms, jitter_ms))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}{PREFIX}"
+
+
+def add_site_arguments(parser):
+    parser.add_argument("--units", type=int, default=30, help="dining units on the home page")
+    parser.add_argument("--menus", type=int, default=10, help="menus per unit")
+    parser.add_argument("--items", type=int, default=50, help="items per menu")
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="random +/- spread on that delay")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic NetNutrition site built from the recorded fixtures")
+    add_site_arguments(parser)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    site = MockSite(args.units, args.menus, args.items)
+    server, base_url = start_server(site, args.port, args.latency_ms, args.jitter_ms)
+    print(f"[✓] Mock NetNutrition at {base_url} "
+          f"({args.units} units x {args.menus} menus x {args.items} items, {args.latency_ms:.0f}ms latency)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+Browserless client for Duke's NetNutrition site.
+
+The NetNutrition page drives everything through a handful of AJAX endpoints:
+clicking a unit, a menu link or a nutrition link just POSTs the object's id
+and swaps the returned HTML into a panel. This client calls those endpoints
+directly with a requests.Session, so a full crawl (nutrition labels included)
+needs no Chrome at all.
+
+For offline work, FixtureSession replays responses recorded under
+src/fixtures/netnutrition/ (or any directory captured with RecordingSession),
+e.g. `python src/nutri_scrape.py --http --fixtures src/fixtures/netnutrition`.
+"""
+
+import json
+import os
+import re
+import time
+
+import requests
+from bs4 import BeautifulSoup
+
+from menu_snapshot import group_menu, merge_menu, AUTO_MENU
+from nutrition_label import parse_nutrition_label
+import run_metrics
+from retry_scheduler import RetryScheduler
+
+BASE_URL = "https://netnutrition.cbord.com/nn-prod/Duke"
+
+# Endpoint -> (form field holding the object id, fixture file name pattern)
+UNIT_ENDPOINT = "Unit/SelectUnitFromUnitsList"
+MENU_ENDPOINT = "Menu/SelectMenu"
+NUTRITION_ENDPOINT = "NutritionDetail/ShowItemNutritionLabel"
+ENDPOINTS = {
+    UNIT_ENDPOINT: ("unitOid", "unit_{}.json"),
+    MENU_ENDPOINT: ("menuOid", "menu_{}.json"),
+    NUTRITION_ENDPOINT: ("detailOid", "label_{}.html"),
+}
+HOME_FIXTURE = "home.html"
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "netnutrition")
+
+_OID_RE = re.compile(r"\((?:[^,()]*,\s*)?(\d+)\)")
+
+
+def _oid_from_onclick(onclick):
+    """Pull the numeric id out of e.g. "NetNutrition.UI.menuListSelectMenu(1234);" """
+    match = _OID_RE.search(onclick or "")
+    return int(match.group(1)) if match else None
+
+
+def _first_line(elem):
+    text = elem.get_text("\n").strip()
+    return text.split("\n")[0].strip()
+
+
+def parse_units(html):
+    """List the dining unit cards on the home page as [{oid, name, status}]"""
+    soup = BeautifulSoup(html, "html.parser")
+    units = []
+    for card in soup.select(".card.unit"):
+        link = card.find("a")
+        if link is None:
+            continue
+        badge = card.select_one(".badge")
+        units.append({
+            "oid": _oid_from_onclick(link.get("onclick")),
+            "name": link.get_text(strip=True),
+            "status": badge.get_text(strip=True).lower() if badge else "",
+        })
+    return units
+
+
+def parse_menus(html):
+    """List the menu links of the first card block in the menu panel as [{oid, label}]"""
+    soup = BeautifulSoup(html, "html.parser")
+    block = soup.select_one("#cbo_nn_menuDataList div.card-block")
+    if block is None:
+        return []
+    return [
+        {"oid": _oid_from_onclick(link.get("onclick")), "label": link.get_text(strip=True)}
+        for link in block.select("a.cbo_nn_menuLink")
+    ]
+
+
+def parse_item_rows(html):
+    """Flatten the item table into the row records described in menu_rows.py"""
+    soup = BeautifulSoup(html, "html.parser")
+    rows = []
+    for tr in soup.select("table.table tbody tr"):
+        classes = tr.get("class") or []
+        if "itemGroupRow" in classes:
+            button = tr.select_one("div[role='button']")
+            rows.append({"kind": "category", "category": button.get_text(strip=True) if button else None,
+                         "name": None, "is_halal": False, "nutrition_id": None})
+        elif "itemPrimaryRow" in classes or "itemAlternateRow" in classes:
+            meal_elem = tr.select_one("td a.cbo_nn_itemHover")
+            if meal_elem is None:
+                continue
+            nutrition_link = tr.select_one("a[id^='showNutrition_'].cbo_nn_itemHover")
+            rows.append({
+                "kind": "item",
+                "category": None,
+                "name": _first_line(meal_elem),
+                "is_halal": any("halal" in (img.get("alt") or "").strip().lower()
+                                for img in meal_elem.find_all("img")),
+                "nutrition_id": nutrition_link.get("id") if nutrition_link else None,
+            })
+    return rows
+
+
+def has_no_items(html):
+    return "There are no items available" in html
+
+
+class NetNutritionClient:
+    """Thin wrapper over the NetNutrition AJAX endpoints"""
+
+    def __init__(self, session=None, base_url=BASE_URL, limiter=None):
+        self.session = session or requests.Session()
+        self.base_url = base_url.rstrip("/")
+        self.limiter = limiter  # a retry_scheduler.TokenBucket spacing out requests
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) dukeislam-scraper",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+
+    def _post(self, endpoint, oid):
+        field, _ = ENDPOINTS[endpoint]
+        if self.limiter is not None:
+            self.limiter.take()
+        response = self.session.post(f"{self.base_url}/{endpoint}", data={field: oid})
+        response.raise_for_status()
+        return response
+
+    def _panels(self, endpoint, oid):
+        """POST and return the swapped-in panels as {panel id: html}"""
+        payload = self._post(endpoint, oid).json()
+        return {panel["id"]: panel["html"] for panel in payload.get("panels", [])}
+
+    def units(self):
+        if self.limiter is not None:
+            self.limiter.take()
+        response = self.session.get(self.base_url)
+        response.raise_for_status()
+        return parse_units(response.text)
+
+    def open_unit(self, unit_oid):
+        """Return (menus, item_html); item_html is set when the unit auto-loads its items"""
+        panels = self._panels(UNIT_ENDPOINT, unit_oid)
+        menus = parse_menus(panels.get("menuPanel", ""))
+        return menus, panels.get("itemPanel")
+
+    def menu_items(self, menu_oid):
+        return self._panels(MENU_ENDPOINT, menu_oid).get("itemPanel", "")
+
+    def nutrition_label_html(self, nutrition_id):
+        """Label HTML for a row's "showNutrition_<id>" link id (or the bare id)"""
+        detail_oid = str(nutrition_id).replace("showNutrition_", "")
+        return self._post(NUTRITION_ENDPOINT, detail_oid).text
+
+
+def crawl(client, with_nutrition=True, label_cache=None, snapshot=None, on_menu=None, scheduler=None):
+    """
+    Crawl every unit and menu over HTTP into nutri_scrape's halal_data shape.
+    With on_menu(unit_index, name, menu_index, label, menu_data), each menu is
+    handed off as soon as it is grouped instead of being collected.
+
+    Units, and menus that fail within their unit, run as tasks of `scheduler`
+    (a retry_scheduler.RetryScheduler, created if not given), so a failed
+    request is retried with backoff instead of dropping the menu or unit.
+    """
+    if scheduler is None:
+        scheduler = RetryScheduler()
+    # A delta run only reuses a menu while its items' cached labels are unchanged
+    labels = label_cache if with_nutrition else None
+
+    def build_meal(row):
+        nutrition_data = None
+        if with_nutrition and row["nutrition_id"] and label_cache is not None:
+            nutrition_data = label_cache.get(row["nutrition_id"], row["name"])
+        if with_nutrition and row["nutrition_id"] and nutrition_data is None:
+            try:
+                with run_metrics.stage("nutrition_fetch"):
+                    label_html = client.nutrition_label_html(row["nutrition_id"])
+                with run_metrics.stage("nutrition_parse"):
+                    nutrition_data = parse_nutrition_label(label_html)
+                if label_cache is not None:
+                    label_cache.put(row["nutrition_id"], row["name"], nutrition_data)
+            except Exception as e:
+                print(f"      [X] Nutrition label failed for {row['name']}: {e}")
+        return {"name": row["name"], "is_halal": row["is_halal"], "nutrition": nutrition_data}
+
+    def rows_of(item_html):
+        with run_metrics.stage("row_parse"):
+            return parse_item_rows(item_html)
+
+    halal_data = {}
+    item_counts = {}
+
+    def take(unit_index, name, menu_index, label, menu_data):
+        item_counts[name] = item_counts.get(name, 0) + sum(len(m) for m in menu_data.values())
+        if on_menu is not None:
+            on_menu(unit_index, name, menu_index, label, menu_data)
+        else:
+            merge_menu(halal_data.setdefault(name, {}), menu_data)
+
+    def menu_task(unit_index, unit, menu_index, menu):
+        name = unit["name"]
+        with run_metrics.stage("menu", f"{name} / {menu['label']}"):
+            item_html = client.menu_items(menu["oid"])
+            if not has_no_items(item_html):
+                rows = rows_of(item_html)
+                take(unit_index, name, menu_index, menu["label"],
+                     group_menu(snapshot, name, menu["label"], rows, True, build_meal, labels=labels))
+        return menu["label"]
+
+    def unit_task(unit_index, unit):
+        name = unit["name"]
+        unit_start = time.perf_counter()
+        menus, item_html = client.open_unit(unit["oid"])
+        if not menus:
+            if item_html and not has_no_items(item_html):
+                with run_metrics.stage("menu", f"{name} / {AUTO_MENU}"):
+                    rows = rows_of(item_html)
+                    take(unit_index, name, 0, AUTO_MENU,
+                         group_menu(snapshot, name, AUTO_MENU, rows, False, build_meal, labels=labels))
+        for menu_index, menu in enumerate(menus):
+            try:
+                menu_task(unit_index, unit, menu_index, menu)
+            except Exception as e:
+                scheduler.defer(f"{name} / {menu['label']}", menu_task, unit_index, unit, menu_index, menu, error=e)
+        run_metrics.record("unit", time.perf_counter() - unit_start, name)
+        print(f"[✓] {name}: {item_counts.get(name, 0)} items")
+        return name
+
+    units = client.units()
+    print(f"Found {len(units)} total units.")
+    for unit_index, unit in enumerate(units):
+        scheduler.call(unit["name"], unit_task, unit_index, unit)
+        scheduler.run(wait=False)
+    scheduler.run()
+
+    # Restaurants in unit order, as a sequential crawl would have found them
+    halal_data = {unit["name"]: halal_data[unit["name"]] for unit in units if halal_data.get(unit["name"])}
+    return halal_data
+
+
+class FixtureResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} fixture response")
+
+
+def _fixture_name(base_url, url, data):
+    """The fixture file recorded for a request, or None for an endpoint this client doesn't use"""
+    path = url[len(base_url):].strip("/") if url.startswith(base_url) else url
+    if not path:
+        return HOME_FIXTURE
+    if path not in ENDPOINTS:
+        return None
+    field, pattern = ENDPOINTS[path]
+    if field not in (data or {}):
+        return None
+    return pattern.format(data[field])
+
+
+class FixtureSession:
+    """Stand-in for requests.Session that replays recorded responses from a directory"""
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, base_url=BASE_URL):
+        self.fixtures_dir = fixtures_dir
+        self.base_url = base_url.rstrip("/")
+        self.headers = {}
+
+    def _load(self, url, data=None):
+        name = _fixture_name(self.base_url, url, data)
+        path = os.path.join(self.fixtures_dir, name) if name else None
+        if path is None or not os.path.exists(path):
+            return FixtureResponse("", status_code=404)
+        with open(path, "r", encoding="utf-8") as f:
+            return FixtureResponse(f.read())
+
+    def get(self, url, **kwargs):
+        return self._load(url)
+
+    def post(self, url, data=None, **kwargs):
+        return self._load(url, data)
+
+
+class RecordingSession(requests.Session):
+    """requests.Session that also saves every response as a fixture for FixtureSession"""
+
+    def __init__(self, fixtures_dir, base_url=BASE_URL):
+        super().__init__()
+        self.fixtures_dir = fixtures_dir
+        self.base_url = base_url.rstrip("/")
+        os.makedirs(fixtures_dir, exist_ok=True)
+
+    def request(self, method, url, data=None, **kwargs):
+        response = super().request(method, url, data=data, **kwargs)
+        name = _fixture_name(self.base_url, url, data)
+        if response.ok and name:
+            with open(os.path.join(self.fixtures_dir, name), "w", encoding="utf-8") as f:
+                f.write(response.text)
+        return response
@@ -2,13 +2,34 @@
 """
 Script to split nutri_menus.json into individual restaurant files
 and create an index.json for easy lookup.
+
+The split is one streaming pass: restaurants are decoded from nutri_menus.json
+one at a time, each shard's content is hashed (its created_at stamp aside),
+and only shards whose hash differs from the one recorded in the previous
+index.json are written again. index.json records every shard's sha256 and
+size, so the web app and other consumers can re-fetch only the shards that
+changed, and summary_stats.json is computed from the same pass. The
+minified, gzip and brotli variants of the shards (see compress_outputs.py)
+are brought up to date afterwards.
 """
 
+import hashlib
 import json
 import os
 import re
 from datetime import datetime
 
+import compress_outputs
+
+INPUT_FILE = "outputs/nutri_menus.json"
+OUTPUT_DIR = "outputs/restaurants"
+INDEX_FILE = "outputs/restaurants/index.json"
+STATS_FILE = "outputs/restaurants/summary_stats.json"
+
+_RESTAURANTS_KEY = re.compile(r'"restaurants"\s*:\s*\[')
+_SKIP = re.compile(r'[\s,]*')
+
+
 def sanitize_filename(name):
     """Convert restaurant name to a safe filename"""
     # Replace spaces and special characters with underscores
@@ -17,99 +38,97 @@ def sanitize_filename(name):
     filename = filename.strip('_').lower()  # Remove leading/trailing underscores and lowercase
     return filename
 
-def split_restaurants():
-    """Split the main nutrition file into individual restaurant files"""
-    
-    # Read the main nutrition file
-    input_file = "outputs/nutri_menus.json"
-    if not os.path.exists(input_file):
-        print(f"Error: {input_file} not found!")
-        return
-    
-    print(f"Reading {input_file}...")
+
+def iter_json_restaurants(input_file=INPUT_FILE, chunk_size=1 << 20):
+    """
+    Yield the objects of nutri_menus.json's "restaurants" array one at a time,
+    reading the file in chunks instead of loading the whole document
+    """
+    decoder = json.JSONDecoder()
     with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Create output directory for individual restaurant files
-    output_dir = "outputs/restaurants"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Index to track all restaurants and their files
-    index = {
-        "created_at": datetime.now().isoformat(),
-        "total_restaurants": len(data.get("restaurants", [])),
-        "restaurants": {}
-    }
-    
-    print(f"Processing {len(data.get('restaurants', []))} restaurants...")
-    
-    for restaurant in data.get("restaurants", []):
-        restaurant_name = restaurant.get("name", "Unknown")
-        print(f"  Processing: {restaurant_name}")
-        
-        # Create safe filename
-        safe_name = sanitize_filename(restaurant_name)
-        filename = f"{safe_name}.json"
-        filepath = os.path.join(output_dir, filename)
-        
-        # Create individual restaurant file
-        restaurant_data = {
-            "name": restaurant_name,
-            "hours": restaurant.get("hours", "Hours not available"),
-            "categories": restaurant.get("categories", []),
-            "total_items": sum(len(cat.get("meals", [])) for cat in restaurant.get("categories", [])),
-            "halal_items": sum(
-                len([meal for meal in cat.get("meals", []) if meal.get("is_halal", False)]) 
-                for cat in restaurant.get("categories", [])
-            ),
-            "created_at": datetime.now().isoformat()
-        }
-        
-        # Write individual restaurant file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(restaurant_data, f, indent=2, ensure_ascii=False)
-        
-        # Add to index
-        index["restaurants"][restaurant_name] = {
-            "filename": filename,
-            "safe_name": safe_name,
-            "hours": restaurant.get("hours", "Hours not available"),
-            "total_items": restaurant_data["total_items"],
-            "halal_items": restaurant_data["halal_items"],
-            "categories_count": len(restaurant.get("categories", []))
-        }
-    
-    # Write index file
-    index_file = "outputs/restaurants/index.json"
-    with open(index_file, 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n✅ Split complete!")
-    print(f"   📁 Created {len(index['restaurants'])} restaurant files in {output_dir}/")
-    print(f"   📋 Created index file: {index_file}")
-    print(f"   📊 Total items across all restaurants: {sum(r['total_items'] for r in index['restaurants'].values())}")
-    print(f"   🥗 Total halal items: {sum(r['halal_items'] for r in index['restaurants'].values())}")
+        buffer = ""
+        eof = False
 
-def create_summary_stats():
-    """Create additional summary statistics"""
-    index_file = "outputs/restaurants/index.json"
-    
-    if not os.path.exists(index_file):
-        print("Index file not found. Run split_restaurants() first.")
-        return
-    
-    with open(index_file, 'r', encoding='utf-8') as f:
-        index = json.load(f)
-    
-    restaurants = index["restaurants"]
-    
-    # Calculate statistics
-    stats = {
+        def more(size=chunk_size):
+            nonlocal buffer, eof
+            chunk = f.read(size)
+            eof = not chunk
+            buffer += chunk
+            return not eof
+
+        # Find the start of the array (the "timestamp" before it is tiny)
+        while True:
+            match = _RESTAURANTS_KEY.search(buffer)
+            if match:
+                buffer = buffer[match.end():]
+                break
+            if not more():
+                return
+
+        while True:
+            position = _SKIP.match(buffer).end()
+            if position == len(buffer):
+                buffer = ""
+                if not more():
+                    raise ValueError(f"{input_file}: unterminated restaurants array")
+                continue
+            if buffer[position] == "]":
+                return
+            try:
+                restaurant, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The object runs past the buffer: read on (at least doubling
+                # the buffer, so a large restaurant is not re-parsed per chunk)
+                if not more(max(chunk_size, len(buffer))):
+                    raise
+                continue
+            buffer = buffer[end:]
+            yield restaurant
+
+
+def shard_hash(restaurant_data):
+    """sha256 of a shard's content, leaving out its created_at stamp"""
+    content = {k: v for k, v in restaurant_data.items() if k != "created_at"}
+    payload = json.dumps(content, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _load_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """Write data as indented JSON (atomically); returns its size in bytes"""
+    text = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    return len(text)
+
+
+def _published_shard_hash(filepath, previous):
+    """The hash of the shard already on disk, from the last index or (for older indexes) the file itself"""
+    if not os.path.exists(filepath):
+        return None
+    if previous and previous.get("sha256"):
+        return previous["sha256"]
+    existing = _load_json(filepath)
+    return shard_hash(existing) if existing else None
+
+
+def summary_stats(restaurants):
+    """Summary statistics from the index's per-restaurant entries"""
+    return {
         "summary": {
             "total_restaurants": len(restaurants),
             "total_items": sum(r["total_items"] for r in restaurants.values()),
             "total_halal_items": sum(r["halal_items"] for r in restaurants.values()),
-            "average_items_per_restaurant": round(sum(r["total_items"] for r in restaurants.values()) / len(restaurants), 1),
+            "average_items_per_restaurant": round(sum(r["total_items"] for r in restaurants.values()) / len(restaurants), 1) if restaurants else 0,
             "restaurants_with_halal": len([r for r in restaurants.values() if r["halal_items"] > 0])
         },
         "top_restaurants_by_items": sorted(
@@ -125,21 +144,125 @@ def create_summary_stats():
             key=lambda x: x[1], reverse=True
         )[:10]
     }
-    
-    # Write summary stats
-    stats_file = "outputs/restaurants/summary_stats.json"
-    with open(stats_file, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, indent=2, ensure_ascii=False)
-    
-    print(f"📈 Summary statistics written to: {stats_file}")
+
+
+def create_summary_stats():
+    """Create additional summary statistics (split_restaurants() already writes them; kept for existing callers)"""
+    index = _load_json(INDEX_FILE)
+    if index is None:
+        print("Index file not found. Run split_restaurants() first.")
+        return None
+
+    stats = summary_stats(index["restaurants"])
+    _write_json(STATS_FILE, stats)
+    print(f"📈 Summary statistics written to: {STATS_FILE}")
+    return stats
+
+
+def split_restaurants(input_file=INPUT_FILE, output_dir=OUTPUT_DIR):
+    """
+    Split the main nutrition file into individual restaurant files, writing
+    only the shards that changed, then index.json and summary_stats.json.
+    Returns the index, or None if there is nothing to split.
+    """
+    if not os.path.exists(input_file):
+        print(f"Error: {input_file} not found!")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    index_file = os.path.join(output_dir, os.path.basename(INDEX_FILE))
+    stats_file = os.path.join(output_dir, os.path.basename(STATS_FILE))
+    previous_index = _load_json(index_file) or {}
+    previous = previous_index.get("restaurants", {})
+
+    print(f"Streaming {input_file}...")
+    entries = {}
+    written = 0
+    for restaurant in iter_json_restaurants(input_file):
+        restaurant_name = restaurant.get("name", "Unknown")
+        safe_name = sanitize_filename(restaurant_name)
+        filename = f"{safe_name}.json"
+        filepath = os.path.join(output_dir, filename)
+        categories = restaurant.get("categories", [])
+
+        restaurant_data = {
+            "name": restaurant_name,
+            "hours": restaurant.get("hours", "Hours not available"),
+            "categories": categories,
+            "total_items": sum(len(cat.get("meals", [])) for cat in categories),
+            "halal_items": sum(
+                len([meal for meal in cat.get("meals", []) if meal.get("is_halal", False)])
+                for cat in categories
+            ),
+        }
+        digest = shard_hash(restaurant_data)
+        old = previous.get(restaurant_name)
+
+        if digest == _published_shard_hash(filepath, old):
+            size = os.path.getsize(filepath)
+            updated_at = (old or {}).get("updated_at") or (_load_json(filepath) or {}).get("created_at")
+            print(f"  Unchanged: {restaurant_name}")
+        else:
+            updated_at = datetime.now().isoformat()
+            restaurant_data["created_at"] = updated_at
+            size = _write_json(filepath, restaurant_data)
+            written += 1
+            print(f"  Written:   {restaurant_name}")
+
+        entries[restaurant_name] = {
+            "filename": filename,
+            "safe_name": safe_name,
+            "hours": restaurant_data["hours"],
+            "total_items": restaurant_data["total_items"],
+            "halal_items": restaurant_data["halal_items"],
+            "categories_count": len(categories),
+            "sha256": digest,
+            "bytes": size,
+            "updated_at": updated_at,
+        }
+
+    # Shards of restaurants that are gone
+    current_files = {entry["filename"] for entry in entries.values()}
+    removed = []
+    for name, entry in previous.items():
+        if name not in entries and entry.get("filename") not in current_files:
+            stale = os.path.join(output_dir, entry["filename"])
+            if os.path.exists(stale):
+                os.remove(stale)
+            removed.append(name)
+
+    # The index (and its created_at) only changes when some shard did
+    if entries != previous or not os.path.exists(index_file):
+        index = {
+            "created_at": datetime.now().isoformat(),
+            "total_restaurants": len(entries),
+            "content_sha256": hashlib.sha256("".join(e["sha256"] for e in entries.values()).encode()).hexdigest(),
+            "restaurants": entries,
+        }
+        _write_json(index_file, index)
+    else:
+        index = previous_index
+
+    stats = summary_stats(entries)
+    stats_changed = _load_json(stats_file) != json.loads(json.dumps(stats))
+    if stats_changed:
+        _write_json(stats_file, stats)
+
+    print("\n✅ Split complete!")
+    print(f"   📁 {written} of {len(entries)} restaurant files written in {output_dir}/ "
+          f"({len(entries) - written} unchanged, {len(removed)} removed)")
+    print(f"   📋 Index file: {index_file}")
+    print(f"   📊 Total items across all restaurants: {stats['summary']['total_items']}")
+    print(f"   🥗 Total halal items: {stats['summary']['total_halal_items']}")
+    print(f"📈 Summary statistics {'written to' if stats_changed else 'unchanged in'}: {stats_file}")
     print(f"   🏪 {stats['summary']['total_restaurants']} restaurants")
-    print(f"   🍽️  {stats['summary']['total_items']} total menu items")
-    print(f"   🥗 {stats['summary']['total_halal_items']} halal items")
     print(f"   📊 {stats['summary']['average_items_per_restaurant']} average items per restaurant")
+    return index
+
 
 if __name__ == "__main__":
     print("🔄 Starting restaurant file splitting...")
-    split_restaurants()
-    print("\n📊 Generating summary statistics...")
-    create_summary_stats()
+    if split_restaurants() is not None:
+        print("\n🗜️  Writing minified and compressed shards...")
+        compress_outputs.print_report(compress_outputs.publish([os.path.join(OUTPUT_DIR, "*.json")]))
     print("\n✨ All done!")
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Columnar NumPy form of the nutrition data.
+
+nutri_menus.json keeps each item's nutrients as a dict of {amount, unit,
+daily_value_percent} and its calories as a string, so any question across
+all items is a Python loop over nested dicts. This converts them once into
+a dense float32 matrix (items x nutrients, NaN where a label has no value)
+with every nutrient in one unit, plus per-item restaurant, category and
+halal arrays, saved to outputs/nutrients.npz. The aggregates below work on
+whole columns at a time.
+
+Nutrient names are normalised on the way in: "Protein <" (a "<1g" amount) is
+Protein, "Potas." is Potassium, and the "Include 12 g Added Sugars" rows
+become an Added Sugars column. Mass units (g, mg, mcg, ...) are converted to
+the nutrient's usual unit (see CANONICAL_UNITS, grams otherwise); any other
+unit gets a column of its own, e.g. "Vitamin A (IU)".
+
+    python src/nutrient_matrix.py build                        # from outputs/nutri_menus.json
+    python src/nutrient_matrix.py build --shards outputs/restaurants
+    python src/nutrient_matrix.py stats --nutrient Sodium --halal -k 10
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from nutri_split import iter_json_restaurants, INPUT_FILE, OUTPUT_DIR
+
+DEFAULT_PATH = "outputs/nutrients.npz"
+
+CALORIES = "Calories"
+PROTEIN = "Protein"
+
+NUTRIENT_ALIASES = {"Potas.": "Potassium"}
+_ADDED_SUGARS = re.compile(r"Include ([\d.]+)\s*([a-zA-Z]+) Added Sugars")
+_NUMBER = re.compile(r"[\d.]+")
+
+# Grams per unit
+_MASS_UNITS = {"g": 1.0, "mg": 1e-3, "mcg": 1e-6, "ug": 1e-6, "µg": 1e-6, "kg": 1e3, "oz": 28.349523125}
+CANONICAL_UNITS = {
+    "Cholesterol": "mg", "Sodium": "mg", "Potassium": "mg", "Calcium": "mg", "Iron": "mg",
+    "Magnesium": "mg", "Zinc": "mg", "Vitamin C": "mg", "Vitamin D": "mcg", "Vitamin A": "mcg",
+}
+# Label order first; anything else follows in the order it was first seen
+LEADING_COLUMNS = (CALORIES, "Total Fat", "Saturated Fat", "Trans Fat", "Cholesterol", "Sodium",
+                   "Total Carbohydrate", "Dietary Fiber", "Total Sugars", "Added Sugars", PROTEIN)
+
+
+def normalize_nutrient(name, info):
+    """(column, unit, value) for a label row, or None when it has no amount"""
+    amount = info.get("amount")
+    unit = info.get("unit")
+    match = _ADDED_SUGARS.match(name)
+    if match:
+        name, amount, unit = "Added Sugars", float(match.group(1)), match.group(2)
+    name = NUTRIENT_ALIASES.get(name.rstrip(" <"), name.rstrip(" <"))
+    if not isinstance(amount, (int, float)):
+        return None
+
+    canonical = CANONICAL_UNITS.get(name, "g")
+    if unit is None:
+        return name, canonical, float(amount)
+    factor = _MASS_UNITS.get(unit.lower())
+    if factor is None:
+        return f"{name} ({unit})", unit, float(amount)
+    return name, canonical, amount * factor / _MASS_UNITS[canonical]
+
+
+def parse_calories(text):
+    if text is None:
+        return None
+    match = _NUMBER.search(str(text))
+    try:
+        return float(match.group()) if match else None
+    except ValueError:
+        return None
+
+
+class NutrientMatrix:
+    """
+    values[i, j] is nutrient j (nutrients[j], in units[j]) of item i; item i
+    is items[i] at restaurants[restaurant[i]], in categories[category[i]]
+    (which belongs to restaurants[category_restaurant[category[i]]]).
+    """
+
+    FIELDS = ("values", "nutrients", "units", "items", "halal", "restaurant", "restaurants",
+              "category", "categories", "category_restaurant")
+
+    def __init__(self, **arrays):
+        for field in self.FIELDS:
+            setattr(self, field, arrays[field])
+
+    @classmethod
+    def from_restaurants(cls, restaurants):
+        """Build from (name, categories) pairs, categories as [{"name", "meals"}] like nutri_menus.json"""
+        items, halal, restaurant_ids, category_ids = [], [], [], []
+        restaurant_names, category_names, category_restaurant = [], [], []
+        columns = {CALORIES: 0}
+        units = {CALORIES: "kcal"}
+        rows, cols, values = [], [], []
+
+        for restaurant_name, categories in restaurants:
+            restaurant_names.append(restaurant_name)
+            for category in categories:
+                category_names.append(category.get("name", ""))
+                category_restaurant.append(len(restaurant_names) - 1)
+                for meal in category.get("meals", []):
+                    row = len(items)
+                    items.append(meal.get("name", ""))
+                    halal.append(bool(meal.get("is_halal")))
+                    restaurant_ids.append(len(restaurant_names) - 1)
+                    category_ids.append(len(category_names) - 1)
+                    nutrition = meal.get("nutrition") or {}
+                    calories = parse_calories(nutrition.get("calories"))
+                    if calories is not None:
+                        rows.append(row)
+                        cols.append(0)
+                        values.append(calories)
+                    for key in ("nutrition_facts", "secondary_nutrients"):
+                        for name, info in (nutrition.get(key) or {}).items():
+                            normalized = normalize_nutrient(name, info)
+                            if normalized is None:
+                                continue
+                            column, unit, value = normalized
+                            if column not in columns:
+                                columns[column] = len(columns)
+                                units[column] = unit
+                            rows.append(row)
+                            cols.append(columns[column])
+                            values.append(value)
+
+        names = sorted(columns, key=lambda c: (LEADING_COLUMNS.index(c) if c in LEADING_COLUMNS
+                                                else len(LEADING_COLUMNS), columns[c]))
+        position = np.empty(len(columns), dtype=np.intp)
+        position[[columns[c] for c in names]] = np.arange(len(names))
+
+        matrix = np.full((len(items), len(names)), np.nan, dtype=np.float32)
+        if rows:
+            matrix[np.array(rows), position[np.array(cols)]] = np.array(values, dtype=np.float32)
+        return cls(
+            values=matrix,
+            nutrients=np.array(names, dtype=str),
+            units=np.array([units[c] for c in names], dtype=str),
+            items=np.array(items, dtype=str),
+            halal=np.array(halal, dtype=bool),
+            restaurant=np.array(restaurant_ids, dtype=np.int32),
+            restaurants=np.array(restaurant_names, dtype=str),
+            category=np.array(category_ids, dtype=np.int32),
+            categories=np.array(category_names, dtype=str),
+            category_restaurant=np.array(category_restaurant, dtype=np.int32),
+        )
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(**{field: data[field] for field in cls.FIELDS})
+
+    def save(self, path=DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, **{field: getattr(self, field) for field in self.FIELDS})
+        os.replace(tmp_path, path)
+
+    def column(self, nutrient):
+        matches = np.flatnonzero(self.nutrients == nutrient)
+        if not len(matches):
+            raise KeyError(f"No {nutrient!r} column (have: {', '.join(self.nutrients)})")
+        return self.values[:, matches[0]]
+
+
+def restaurants_from_json(input_file=INPUT_FILE):
+    for restaurant in iter_json_restaurants(input_file):
+        yield restaurant.get("name", "Unknown"), restaurant.get("categories", [])
+
+
+def restaurants_from_shards(shard_dir=OUTPUT_DIR):
+    for path in sorted(glob.glob(os.path.join(shard_dir, "*.json"))):
+        if os.path.basename(path) in ("index.json", "summary_stats.json"):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            restaurant = json.load(f)
+        yield restaurant.get("name", "Unknown"), restaurant.get("categories", [])
+
+
+# Aggregates: one value per restaurant unless noted, NaN where a restaurant has no data
+
+def group_counts(m, mask=None):
+    """Items per restaurant (only those where mask is True, if given)"""
+    groups = m.restaurant if mask is None else m.restaurant[mask]
+    return np.bincount(groups, minlength=len(m.restaurants))
+
+
+def group_mean(m, values, mask=None):
+    """Mean of values (one per item) per restaurant, ignoring NaN"""
+    ok = ~np.isnan(values) if mask is None else ~np.isnan(values) & mask
+    sums = np.bincount(m.restaurant[ok], weights=values[ok], minlength=len(m.restaurants))
+    counts = np.bincount(m.restaurant[ok], minlength=len(m.restaurants))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts > 0, sums / counts, np.nan)
+
+
+def group_percentiles(m, values, q=(50, 90), mask=None):
+    """
+    Percentiles (linear interpolation, as np.percentile) of values per
+    restaurant, ignoring NaN: an array of shape (len(q), restaurants)
+    """
+    ok = ~np.isnan(values) if mask is None else ~np.isnan(values) & mask
+    groups = m.restaurant[ok]
+    order = np.lexsort((values[ok], groups))
+    ordered = values[ok][order].astype(np.float64)
+    counts = np.bincount(groups, minlength=len(m.restaurants))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+
+    result = np.full((len(q), len(m.restaurants)), np.nan)
+    has = counts > 0
+    for i, percentile in enumerate(q):
+        rank = (counts[has] - 1) * (percentile / 100.0)
+        low = np.floor(rank).astype(np.intp)
+        high = np.minimum(low + 1, counts[has] - 1)
+        fraction = rank - low
+        result[i, has] = (ordered[starts[has] + low] * (1 - fraction) + ordered[starts[has] + high] * fraction)
+    return result
+
+
+def protein_per_calorie(m):
+    """Grams of protein per kcal for every item, NaN without both values (or with 0 kcal)"""
+    calories = m.column(CALORIES)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(calories > 0, m.column(PROTEIN) / calories, np.nan)
+
+
+def top_k(values, k=10, mask=None):
+    """Indices of the k largest values (NaN never counts), largest first"""
+    candidates = np.flatnonzero(~np.isnan(values) if mask is None else ~np.isnan(values) & mask)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-values[candidates], k - 1)[:k]]
+    return candidates[np.argsort(-values[candidates], kind="stable")]
+
+
+def summary_stats(m):
+    """nutri_split's summary_stats.json, computed from the matrix"""
+    items = group_counts(m)
+    halal = group_counts(m, m.halal)
+    categories = np.bincount(m.category_restaurant, minlength=len(m.restaurants))
+    names = m.restaurants.tolist()
+
+    def top(counts):
+        order = np.argsort(-counts, kind="stable")[:10]
+        return [(names[i], int(counts[i])) for i in order]
+
+    return {
+        "summary": {
+            "total_restaurants": len(names),
+            "total_items": int(items.sum()),
+            "total_halal_items": int(halal.sum()),
+            "average_items_per_restaurant": round(float(items.mean()), 1) if len(names) else 0,
+            "restaurants_with_halal": int((halal > 0).sum()),
+        },
+        "top_restaurants_by_items": top(items),
+        "top_restaurants_by_halal": top(halal),
+        "restaurants_by_category_count": top(categories),
+    }
+
+
+def _print_stats(m, nutrient, halal_only, k):
+    mask = m.halal if halal_only else None
+    values = m.column(nutrient)
+    unit = m.units[np.flatnonzero(m.nutrients == nutrient)[0]]
+
+    start = time.perf_counter()
+    counts = group_counts(m, mask)
+    means = group_mean(m, values, mask)
+    p50, p90 = group_percentiles(m, values, (50, 90), mask)
+    ratio = protein_per_calorie(m)
+    best = top_k(ratio, k, mask)
+    stats = summary_stats(m)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    scope = "halal items" if halal_only else "items"
+    print(f"{nutrient} ({unit}) per restaurant, {scope}:")
+    print(f"  {'restaurant':<32}{'items':>7}{'mean':>10}{'p50':>10}{'p90':>10}")
+    for i in np.argsort(-np.nan_to_num(means, nan=-np.inf), kind="stable"):
+        if counts[i]:
+            print(f"  {m.restaurants[i]:<32}{counts[i]:>7}{means[i]:>10.1f}{p50[i]:>10.1f}{p90[i]:>10.1f}")
+    print(f"\nTop {k} {scope} by protein per 100 kcal:")
+    for i in best:
+        print(f"  {ratio[i] * 100:>6.1f} g  {m.items[i]} ({m.restaurants[m.restaurant[i]]})")
+    print(f"\n[⏱] Means, percentiles, top-k and summary stats ({stats['summary']['total_restaurants']} "
+          f"restaurants) over {len(m.items)} items x {len(m.nutrients)} nutrients in {elapsed:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the NumPy nutrient matrix")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="the .npz file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="convert nutri_menus.json (or the restaurant shards) to .npz")
+    build.add_argument("--json", default=INPUT_FILE)
+    build.add_argument("--shards", help="read the per-restaurant files in this directory instead")
+    stats = commands.add_parser("stats", help="per-restaurant aggregates and top items")
+    stats.add_argument("--nutrient", default=CALORIES)
+    stats.add_argument("--halal", action="store_true", help="only halal items")
+    stats.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        source = restaurants_from_shards(args.shards) if args.shards else restaurants_from_json(args.json)
+        m = NutrientMatrix.from_restaurants(source)
+        m.save(args.path)
+        print(f"[✓] {len(m.items)} items x {len(m.nutrients)} nutrients written to {args.path} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return
+
+    start = time.perf_counter()
+    m = NutrientMatrix.load(args.path)
+    print(f"[⏱] Loaded {args.path} in {(time.perf_counter() - start) * 1000:.1f} ms\n")
+    _print_stats(m, args.nutrient, args.halal, args.k)
+
+
+if __name__ == "__main__":
+    main()
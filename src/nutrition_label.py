@@ -0,0 +1,268 @@
+"""
+Parse a NetNutrition nutrition label from its HTML.
+
+Produces the nutrition_data dict every scraper stores, from the
+#cbo_nn_nutritionDialogInner markup: the HTTP crawl gets it from the label
+endpoint (or fixtures), and the Chrome crawl reads the open dialog's outerHTML
+in one WebDriver call instead of looking up each field of the live dialog.
+
+The label only has a few dozen elements we care about, all recognisable by
+class, so instead of building a full document tree this walks the markup once
+with the standard library's HTMLParser, collecting the text of those elements
+as it goes; the nutrient and serving patterns are compiled once at import.
+
+    python src/nutrition_label.py src/fixtures/netnutrition/label_5001.html
+"""
+
+import json
+import re
+import sys
+from html.parser import HTMLParser
+
+_SPACES = re.compile(r"\s+")
+_SERVINGS = re.compile(r'(\d+)\s*Servings per container')
+_SERVING_SIZE = re.compile(r'Serving Size\s*(.+)')
+_SERVING_UNITS = re.compile(r'\b\d+.*(?:oz|g|ml|cup|piece|slice|tbsp|tsp|fl oz|lb|lbs|portion)\b', re.IGNORECASE)
+# e.g. "Total Fat 25g", "Saturated Fat 9g", "Trans Fat NA"
+_NUTRIENT = re.compile(r'(.+?)\s+([\d.]+(?:\.\d+)?[a-zA-Z]*|NA)$')
+_AMOUNT = re.compile(r'([\d.]+)(.*)')
+
+DIALOG_ID = "cbo_nn_nutritionDialogInner"
+
+# Elements without an end tag, which never go on the open-element stack
+_VOID = frozenset(("area", "base", "br", "col", "embed", "hr", "img", "input",
+                   "link", "meta", "param", "source", "track", "wbr"))
+_SKIP_TEXT = frozenset(("script", "style", "template"))
+
+_SINGLE = {
+    "cbo_nn_LabelHeader": "item_name",
+    "cbo_nn_LabelBottomBorderLabel": "serving_info",
+    "cbo_nn_LabelIngredients": "ingredients",
+    "cbo_nn_LabelAllergens": "allergens",
+}
+_ROW_CLASSES = ("cbo_nn_LabelBorderedSubHeader", "cbo_nn_LabelNoBorderSubHeader")
+
+
+def _text(strings):
+    """Approximate Selenium's .text: visible text with one line per block"""
+    lines = (_SPACES.sub(" ", line).strip() for line in "\n".join(strings).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _inline_text(strings):
+    return " ".join(" ".join(strings).split())
+
+
+class _Row:
+    __slots__ = ("bordered", "secondary", "left", "right")
+
+    def __init__(self, bordered, secondary):
+        self.bordered = bordered
+        self.secondary = secondary
+        self.left = None
+        self.right = None
+
+
+class _LabelScanner(HTMLParser):
+    """
+    One pass over the label markup. Every open element we want the text of
+    gets a list on the stack entry; each text node is added to all of them.
+    """
+
+    def __init__(self, scoped):
+        super().__init__(convert_charrefs=True)
+        self.scoped = scoped     # only read inside #cbo_nn_nutritionDialogInner
+        self.depth_in_dialog = 0 if scoped else 1
+        self.stack = []          # (tag, [text lists], flags)
+        self.singles = {}        # key -> text list (first match only)
+        self.calories = None
+        self.rows = []
+        self.sub_header = 0      # open .cbo_nn_LabelSubHeader elements
+        self.secondary = 0       # open .cbo_nn_LabelSecondaryTable elements
+        self.skip_text = 0
+        self.current_row = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID:
+            return
+        classes = ()
+        element_id = None
+        for name, value in attrs:
+            if name == "class" and value:
+                classes = value.split()
+            elif name == "id":
+                element_id = value
+        if self.scoped and not self.depth_in_dialog and element_id != DIALOG_ID:
+            self.stack.append((tag, (), 0))
+            return
+
+        sinks = []
+        flags = 0
+        if self.scoped:
+            self.depth_in_dialog += 1
+            flags |= 1
+        if tag in _SKIP_TEXT:
+            self.skip_text += 1
+            flags |= 2
+        for cls in classes:
+            key = _SINGLE.get(cls)
+            if key is not None and key not in self.singles:
+                self.singles[key] = []
+                sinks.append(self.singles[key])
+            elif cls == "cbo_nn_LabelSubHeader":
+                self.sub_header += 1
+                flags |= 4
+            elif cls == "cbo_nn_LabelSecondaryTable":
+                self.secondary += 1
+                flags |= 8
+            elif cls in _ROW_CLASSES and self.current_row is None:
+                row = _Row(cls == _ROW_CLASSES[0], self.secondary > 0)
+                self.rows.append(row)
+                self.current_row = row
+                flags |= 16
+            elif cls == "font-22" and self.sub_header and self.calories is None:
+                self.calories = []
+                sinks.append(self.calories)
+            elif cls == "inline-div-left" and self.current_row is not None and self.current_row.left is None:
+                self.current_row.left = []
+                sinks.append(self.current_row.left)
+            elif cls == "inline-div-right" and self.current_row is not None and self.current_row.right is None:
+                self.current_row.right = []
+                sinks.append(self.current_row.right)
+        self.stack.append((tag, sinks, flags))
+
+    def handle_endtag(self, tag):
+        # Tolerate unclosed elements: pop back to the matching open tag, if any
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > depth:
+            _, _, flags = self.stack.pop()
+            if flags & 1:
+                self.depth_in_dialog -= 1
+            if flags & 2:
+                self.skip_text -= 1
+            if flags & 4:
+                self.sub_header -= 1
+            if flags & 8:
+                self.secondary -= 1
+            if flags & 16:
+                self.current_row = None
+
+    def handle_data(self, data):
+        if self.skip_text or not self.depth_in_dialog:
+            return
+        for _, sinks, _ in self.stack:
+            for sink in sinks:
+                sink.append(data)
+
+
+def _parse_serving(serving_text):
+    serving_info = {}
+    lines = serving_text.split('\n')
+
+    # Extract servings per container
+    for line in lines:
+        if 'Servings per container' in line:
+            servings_match = _SERVINGS.search(line)
+            if servings_match:
+                serving_info["servings_per_container"] = int(servings_match.group(1))
+            break
+
+    # Extract serving size - look for the line that contains serving size info
+    for line in lines:
+        if 'Serving Size' in line:
+            serving_size_match = _SERVING_SIZE.search(line)
+            if serving_size_match:
+                serving_info["serving_size"] = serving_size_match.group(1).strip()
+        elif line.strip() and 'Servings per container' not in line:
+            # A serving size line without the "Serving Size" label
+            if _SERVING_UNITS.search(line):
+                if "serving_size" not in serving_info:
+                    serving_info["serving_size"] = line.strip()
+    return serving_info
+
+
+def parse_nutrient(left_text, right_text):
+    """Turn a label row like ("Total Fat 25g", "38%") into (name, info)"""
+    match = _NUTRIENT.match(left_text)
+    if not match:
+        return left_text, {"amount": None, "unit": None, "daily_value_percent": None}
+
+    nutrient_name = match.group(1).strip()
+    amount_str = match.group(2).strip()
+    nutrient_info = {}
+
+    # Parse amount and unit
+    if amount_str == "NA":
+        nutrient_info["amount"] = None
+        nutrient_info["unit"] = None
+    else:
+        amount_match = _AMOUNT.match(amount_str)
+        try:
+            nutrient_info["amount"] = float(amount_match.group(1))
+        except ValueError:
+            nutrient_info["amount"] = amount_match.group(1)
+        nutrient_info["unit"] = amount_match.group(2) or None
+
+    # Parse daily value percentage
+    nutrient_info["daily_value_percent"] = None
+    daily_value_str = right_text.replace('%', '').strip()
+    if daily_value_str:
+        try:
+            nutrient_info["daily_value_percent"] = float(daily_value_str)
+        except ValueError:
+            pass
+
+    return nutrient_name, nutrient_info
+
+
+def parse_nutrition_label(html):
+    """Parse label HTML (the #cbo_nn_nutritionDialogInner markup) into nutrition_data"""
+    scanner = _LabelScanner(scoped=DIALOG_ID in html)
+    scanner.feed(html)
+    scanner.close()
+    singles = scanner.singles
+
+    nutrition_data = {}
+    nutrition_data["item_name"] = _text(singles["item_name"]) if "item_name" in singles else None
+    nutrition_data["serving_info"] = (_parse_serving(_text(singles["serving_info"]))
+                                      if "serving_info" in singles else None)
+    nutrition_data["calories"] = _text(scanner.calories) if scanner.calories is not None else None
+
+    # Main nutrition facts: every bordered row, the secondary table's included
+    nutrition_facts = {}
+    for row in scanner.rows:
+        if not row.bordered or row.left is None or row.right is None:
+            continue
+        left_text = _inline_text(row.left)
+        # Skip the added sugars row with "Include NA"
+        if "Include NA" in left_text:
+            continue
+        nutrient_name, nutrient_info = parse_nutrient(left_text, _inline_text(row.right))
+        nutrition_facts[nutrient_name] = nutrient_info
+    nutrition_data["nutrition_facts"] = nutrition_facts
+
+    # Secondary nutrients (vitamins/minerals), skipping any already listed above
+    secondary_nutrients = {}
+    for row in scanner.rows:
+        if not row.secondary or row.left is None or row.right is None:
+            continue
+        nutrient_name, nutrient_info = parse_nutrient(_inline_text(row.left), _inline_text(row.right))
+        if nutrient_name in nutrition_facts:
+            continue
+        secondary_nutrients[nutrient_name] = nutrient_info
+    nutrition_data["secondary_nutrients"] = secondary_nutrients
+
+    nutrition_data["ingredients"] = _text(singles["ingredients"]) if "ingredients" in singles else None
+    nutrition_data["allergens"] = _text(singles["allergens"]) if "allergens" in singles else None
+
+    return nutrition_data
+
+
+if __name__ == "__main__":
+    for label_path in sys.argv[1:]:
+        with open(label_path, "r", encoding="utf-8") as f:
+            print(json.dumps(parse_nutrition_label(f.read()), indent=2, ensure_ascii=False))
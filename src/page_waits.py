@@ -0,0 +1,183 @@
+"""
+Event-driven page waits shared by the NetNutrition scrapers.
+
+Instead of sleeping a fixed SECONDS_TO_WAIT after every click, the scrapers
+block only until the page is actually ready: the item/menu panels have been
+re-rendered, the nutrition dialog has opened or closed, or the unit cards are
+back after clicking "Back". Every wait has its own timeout and the time spent
+waiting is tracked separately from the time spent working.
+
+Clicks go through a script call rather than WebDriver's clickElement, so a
+rate limit has to be applied here: given a limiter (a
+retry_scheduler.TokenBucket), every click takes a token first.
+"""
+
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Seconds to wait for each condition before giving up and carrying on
+TIMEOUTS = {
+    "page": 15,          # initial NetNutrition load
+    "panel": 10,         # item/menu panel re-render after clicking a unit or menu
+    "units": 10,         # unit cards visible again after "Back"
+    "menus": 10,         # menu links visible again after "Back"
+    "filter": 3,         # unit list refresh after toggling a preference filter
+    "modal_open": 5,     # nutrition dialog loaded
+    "modal_closed": 3,   # nutrition dialog dismissed
+}
+
+POLL_FREQUENCY = 0.05
+
+ITEM_PANELS = ("#itemPanel", "#cbo_nn_menuDataList")
+UNIT_CARDS = ".card.unit"
+MENU_LINKS = "#cbo_nn_menuDataList a.cbo_nn_menuLink"
+NUTRITION_DIALOG = "#cbo_nn_nutritionDialogInner"
+DISCLAIMER_BUTTON = 'button[onclick*="setIgnoreMobileDisc"]'
+
+# Plant a hidden sentinel inside each matching element. When the site swaps a
+# panel's HTML the sentinel disappears with it, which is how we detect that the
+# content changed without shipping the whole panel back on every poll.
+_MARK_JS = """
+var selectors = arguments[0], token = arguments[1], marked = [];
+selectors.forEach(function (sel, i) {
+    var el = document.querySelector(sel);
+    if (!el) { marked.push(false); return; }
+    var s = document.createElement('span');
+    s.id = token + i;
+    s.hidden = true;
+    el.appendChild(s);
+    marked.push(true);
+});
+return marked;
+"""
+
+_CHANGED_JS = """
+var selectors = arguments[0], token = arguments[1], marked = arguments[2];
+for (var i = 0; i < selectors.length; i++) {
+    if (marked[i]) {
+        if (!document.getElementById(token + i)) return true;
+    } else if (document.querySelector(selectors[i])) {
+        return true;
+    }
+}
+return false;
+"""
+
+_VISIBLE_JS = """
+var els = document.querySelectorAll(arguments[0]);
+for (var i = 0; i < els.length; i++) {
+    if (els[i].offsetParent !== null || els[i].getClientRects().length) return true;
+}
+return false;
+"""
+
+
+class PageWaits:
+    """Condition waits bound to one driver, with wait-vs-work accounting"""
+
+    def __init__(self, driver, timeouts=None, limiter=None):
+        self.driver = driver
+        self.limiter = limiter
+        self.timeouts = dict(TIMEOUTS, **(timeouts or {}))
+        self.started = time.perf_counter()
+        self.stats = {}  # kind -> {"count", "seconds", "timeouts"}
+        self._tokens = 0
+
+    # --- Low-level helpers ---
+
+    def _wait(self, kind, condition):
+        """Block until condition(driver) is truthy or the kind's timeout expires"""
+        stat = self.stats.setdefault(kind, {"count": 0, "seconds": 0.0, "timeouts": 0})
+        start = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, self.timeouts[kind], poll_frequency=POLL_FREQUENCY).until(condition)
+            ok = True
+        except TimeoutException:
+            stat["timeouts"] += 1
+            print(f"[!] Timed out after {self.timeouts[kind]}s waiting for {kind}")
+            ok = False
+        stat["count"] += 1
+        stat["seconds"] += time.perf_counter() - start
+        return ok
+
+    def mark(self, selectors):
+        """Plant sentinels in the given elements; returns a handle for until_changed()"""
+        self._tokens += 1
+        token = f"__nn_wait_{self._tokens}_"
+        selectors = list(selectors)
+        marked = self.driver.execute_script(_MARK_JS, selectors, token)
+        return selectors, token, marked
+
+    def until_changed(self, handle, kind="panel"):
+        selectors, token, marked = handle
+        return self._wait(kind, lambda d: d.execute_script(_CHANGED_JS, selectors, token, marked))
+
+    def until_visible(self, selector, kind):
+        return self._wait(kind, lambda d: d.execute_script(_VISIBLE_JS, selector))
+
+    def until_hidden(self, selector, kind):
+        return self._wait(kind, lambda d: not d.execute_script(_VISIBLE_JS, selector))
+
+    def is_visible(self, selector):
+        """One-shot check, no waiting"""
+        return self.driver.execute_script(_VISIBLE_JS, selector)
+
+    def click(self, elem):
+        if self.limiter is not None:
+            self.limiter.take()
+        self.driver.execute_script("arguments[0].click();", elem)
+
+    # --- Page-level waits used by the scrapers ---
+
+    def page_ready(self):
+        """Initial load: either the mobile disclaimer or the unit list is showing"""
+        return self._wait("page", lambda d: d.execute_script(_VISIBLE_JS, f"{DISCLAIMER_BUTTON}, {UNIT_CARDS}"))
+
+    def click_and_wait_for_units(self, elem):
+        """Click something that returns to (or reveals) the unit list"""
+        self.click(elem)
+        return self.until_visible(UNIT_CARDS, "units")
+
+    def click_and_wait_for_filter(self, elem):
+        handle = self.mark([UNIT_CARDS])
+        self.click(elem)
+        return self.until_changed(handle, "filter")
+
+    def click_and_wait_for_panel(self, elem):
+        """Click a unit or menu link and wait for the item/menu panel to re-render"""
+        handle = self.mark(ITEM_PANELS)
+        self.click(elem)
+        return self.until_changed(handle, "panel")
+
+    def click_and_wait_for_menus(self, elem):
+        """Click "Back" from an item table to the menu list"""
+        self.click(elem)
+        return self.until_visible(MENU_LINKS, "menus")
+
+    def click_and_wait_for_modal(self, elem):
+        """Click a nutrition link and wait for a freshly loaded label"""
+        handle = self.mark([NUTRITION_DIALOG])
+        self.click(elem)
+        return (self.until_changed(handle, "modal_open")
+                and self.until_visible(NUTRITION_DIALOG, "modal_open"))
+
+    def click_and_wait_modal_closed(self, elem):
+        self.click(elem)
+        return self.until_hidden(NUTRITION_DIALOG, "modal_closed")
+
+    # --- Reporting ---
+
+    def wait_seconds(self):
+        return sum(s["seconds"] for s in self.stats.values())
+
+    def report(self):
+        total = time.perf_counter() - self.started
+        waited = self.wait_seconds()
+        working = total - waited
+        pct = (waited / total * 100) if total else 0
+        print(f"\n[⏱] {total:.1f}s total: {waited:.1f}s waiting on the page ({pct:.0f}%), {working:.1f}s working")
+        for kind, s in sorted(self.stats.items()):
+            avg = s["seconds"] / s["count"] if s["count"] else 0
+            print(f"    {kind:<13} {s['count']:>5} waits  {s['seconds']:>7.1f}s  avg {avg:.2f}s  timeouts {s['timeouts']}")
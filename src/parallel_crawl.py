@@ -0,0 +1,107 @@
+"""
+Crawl NetNutrition dining units with a pool of headless Chrome workers.
+
+Every dining unit is independent, so each worker process boots its own
+driver, dismisses the mobile disclaimer, and then keeps claiming the next
+unclaimed unit index until the unit list is exhausted. Results come back
+tagged with their unit index and are returned in index order, so the output
+is identical to a single-browser crawl no matter which worker finished first.
+
+Workers are always forked: the crawl functions they run read module globals
+(the driver, the label cache, the stream) set up by the parent before the
+pool starts, which a spawned or forkserver process would not inherit.
+"""
+
+import multiprocessing as mp
+import queue
+import time
+
+
+def _claim_next(counter):
+    """Atomically take the next unit index from the shared counter"""
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    return index
+
+
+def _worker(worker_id, start_browser, crawl_unit, count_units, finish_worker, counter, results):
+    driver = None
+    try:
+        driver = start_browser()
+        total = count_units()
+        while True:
+            index = _claim_next(counter)
+            if index >= total:
+                break
+            try:
+                name, unit_data = crawl_unit(index)
+                results.put(("unit", index, name, unit_data, None))
+            except Exception as e:
+                results.put(("unit", index, None, None, str(e)))
+    except Exception as e:
+        print(f"[X] Worker {worker_id} failed to start: {e}")
+    finally:
+        if finish_worker is not None:
+            try:
+                finish_worker()
+            except Exception as e:
+                print(f"[X] Worker {worker_id} cleanup failed: {e}")
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        results.put(("done", worker_id, None, None, None))
+
+
+def crawl_in_parallel(workers, start_browser, crawl_unit, count_units, finish_worker=None):
+    """
+    Run crawl_unit(index) for every dining unit across `workers` processes.
+
+    start_browser() must boot a driver for the calling process and return it,
+    count_units() returns how many units that driver sees, and crawl_unit()
+    returns (name, unit_data) and leaves the driver back on the unit list
+    (unit_data may be None when crawl_unit() writes its output itself).
+    finish_worker(), if given, runs in each worker just before it exits (e.g. to
+    flush per-process caches). All of these must be module-level functions so
+    they can be sent to workers.
+    Returns a list of (index, name, unit_data) sorted by unit index.
+    """
+    ctx = mp.get_context("fork")
+    counter = ctx.Value("i", 0)
+    results = ctx.Queue()
+
+    print(f"[⚙] Starting {workers} crawl workers...")
+    start = time.perf_counter()
+    procs = [
+        ctx.Process(target=_worker, args=(i, start_browser, crawl_unit, count_units, finish_worker, counter, results))
+        for i in range(workers)
+    ]
+    for p in procs:
+        p.start()
+
+    collected = []
+    finished = 0
+    while finished < len(procs):
+        try:
+            kind, index, name, unit_data, error = results.get(timeout=5)
+        except queue.Empty:
+            # A worker that died hard (e.g. Chrome took the process down) never reports "done"
+            if not any(p.is_alive() for p in procs):
+                print("[!] All workers exited; some units may be missing")
+                break
+            continue
+        if kind == "done":
+            finished += 1
+        elif error:
+            print(f"[X] Unit #{index} failed: {error}")
+        else:
+            print(f"[✓] Unit #{index} done: {name}")
+            collected.append((index, name, unit_data))
+
+    for p in procs:
+        p.join()
+
+    print(f"[✓] {len(collected)} units crawled by {workers} workers in {time.perf_counter() - start:.1f}s")
+    return sorted(collected, key=lambda r: r[0])
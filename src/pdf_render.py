@@ -0,0 +1,163 @@
+"""
+ReportLab pieces shared by halal_menus.pdf, all_menus.pdf and
+muslim_calendar.pdf.
+
+Paragraph styles are created once per process (styles()) and every table
+shape has one module-level TableStyle, instead of a fresh style sheet per
+document, a fresh command list per table and, in all_menus.pdf, a fresh
+ParagraphStyle per meal. The halal / non-halal colouring of all_menus.pdf is
+a handful of table-level BACKGROUND commands (one per run of same-coloured
+rows) rather than a background on every meal's paragraph.
+
+Every PDF is built byte-for-byte reproducibly (ReportLab's invariant mode
+fixes the creation date and document ID) and records a hash of the content it
+was built from in its Keywords, so a caller can skip rendering when the
+published file already shows the same content (see published_hash()), and a
+re-render of unchanged content leaves git nothing to commit.
+"""
+
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Table, TableStyle
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_LEFT, TA_CENTER
+
+# Part of every content hash: bump when the PDFs' layout changes
+LAYOUT_VERSION = 1
+# pypdf writes the "-" and ":" of the Keywords string as octal escapes
+_HASH_TAG = re.compile(rb"content(?:-|\\055)sha256(?::|\\072)([0-9a-f]{64})")
+
+DUKE_BLUE = colors.HexColor("#012169")
+HALAL_COLOR = colors.lightgreen
+OTHER_COLOR = colors.salmon
+
+CATEGORY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor("#003366")),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor("#f0f4f7")),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+])
+
+EVENT_INFO_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
+    ("BOX", (0, 0), (-1, -1), 0.25, DUKE_BLUE),
+    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("LEFTPADDING", (0, 0), (-1, -1), 6),
+    ("RIGHTPADDING", (0, 0), (-1, -1), 6),
+    ("TOPPADDING", (0, 0), (-1, -1), 4),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 4),
+])
+
+DIVIDER_STYLE = TableStyle([
+    ('LINEABOVE', (0, 0), (-1, -1), 0.4, DUKE_BLUE),
+])
+
+
+@lru_cache(maxsize=None)
+def styles():
+    """The paragraph styles of all three PDFs, by name"""
+    sheet = getSampleStyleSheet()
+    return {
+        # Menus
+        "title": sheet['Title'],
+        "normal": sheet['Normal'],
+        "subtitle": ParagraphStyle(
+            'Subtitle',
+            parent=sheet['Normal'],
+            fontName='Helvetica-Oblique',
+            fontSize=10,
+            textColor=colors.HexColor("#444444"),
+            alignment=TA_CENTER,
+            spaceAfter=12
+        ),
+        "table_header": ParagraphStyle(
+            'TableHeader',
+            parent=sheet['Normal'],
+            fontName='Helvetica-Bold',
+            fontSize=10,
+            textColor=colors.white,
+            alignment=TA_LEFT,
+            spaceAfter=6
+        ),
+        # Calendar
+        "header": ParagraphStyle(name='Header', fontSize=20, leading=24, textColor=DUKE_BLUE, spaceAfter=20),
+        "event_title": ParagraphStyle(name='EventTitle', fontSize=14, leading=16, spaceBefore=12, spaceAfter=6,
+                                      textColor=DUKE_BLUE, fontName="Helvetica-Bold"),
+        "event_info": ParagraphStyle(name='EventInfo', fontSize=11, leading=14),
+        "description": ParagraphStyle(name='Description', fontSize=10, leading=13, spaceAfter=10),
+    }
+
+
+def halal_row_colors(halal_flags, first_row=1):
+    """BACKGROUND commands colouring table rows by halal flag, one per run of equal flags"""
+    commands = []
+    start = 0
+    for i in range(1, len(halal_flags) + 1):
+        if i == len(halal_flags) or halal_flags[i] != halal_flags[start]:
+            color = HALAL_COLOR if halal_flags[start] else OTHER_COLOR
+            commands.append(('BACKGROUND', (0, first_row + start), (-1, first_row + i - 1), color))
+            start = i
+    return commands
+
+
+def category_table(category, meals, halal_flags=None):
+    """A menu category: a header row, then one row per meal (coloured when halal_flags is given)"""
+    s = styles()
+    normal = s["normal"]
+    data = [[Paragraph(category, s["table_header"])]]
+    data.extend([Paragraph(meal, normal)] for meal in meals)
+    t = Table(data, colWidths=[500])
+    t.setStyle(CATEGORY_TABLE_STYLE)
+    if halal_flags is not None:
+        t.setStyle(halal_row_colors(halal_flags))
+    return t
+
+
+def event_info_table(rows):
+    """The calendar's label / value box for one event"""
+    t = Table(rows, colWidths=[60, 360])
+    t.setStyle(EVENT_INFO_TABLE_STYLE)
+    return t
+
+
+def divider(width=450):
+    return Table([[""]], colWidths=[width], style=DIVIDER_STYLE)
+
+
+def content_hash(*parts):
+    """Hash of everything a PDF shows (JSON-serialisable parts), plus the layout version"""
+    payload = json.dumps([LAYOUT_VERSION, *parts], ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_keywords(digest):
+    return f"content-sha256:{digest}"
+
+
+def published_hash(path):
+    """The content hash recorded in the PDF at path, or None"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        match = _HASH_TAG.search(f.read())
+    return match.group(1).decode("ascii") if match else None
+
+
+def build_pdf(path, story, digest=None, **margins):
+    """Lay out story as a reproducible letter-size PDF at path, tagged with digest"""
+    SimpleDocTemplate(path, pagesize=letter, invariant=1,
+                      keywords=hash_keywords(digest) if digest else "", **margins).build(story)
@@ -0,0 +1,99 @@
+"""
+PDFs assembled from separately rendered, cached sections.
+
+Laying out all_menus.pdf or halal_menus.pdf in one doc.build() renders every
+restaurant again on every run, serially, even when a single menu changed.
+Instead, each section (a restaurant, for the menus) is rendered as a PDF
+fragment of its own, named after a hash of exactly the data it shows, under
+outputs/cache/pdf_sections/<name>/. Fragments missing from the cache are
+rendered in a process pool; the rest are reused as they are. The final PDF is
+a freshly rendered title page followed by the fragments' pages, merged with
+pypdf, and fragments no longer used are removed from the cache.
+
+pypdf is optional: without it (available() is False) callers fall back to
+building the whole document in one go.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pdf_render import build_pdf, content_hash, hash_keywords
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+SECTION_CACHE_DIR = "outputs/cache/pdf_sections"
+# Bump when a section's layout changes, so cached fragments are re-rendered
+SECTION_VERSION = 2
+
+
+def available():
+    return PdfWriter is not None
+
+
+def section_hash(name, args):
+    return content_hash(SECTION_VERSION, name, args)[:32]
+
+
+def _render(job):
+    render, path, args = job
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    render(tmp_path, *args)
+    os.replace(tmp_path, path)
+
+
+def write_sectioned_pdf(path, name, title_story, sections, render, workers=None, cache_dir=SECTION_CACHE_DIR,
+                        digest=None):
+    """
+    Write path as a title page (title_story) followed by one fragment per
+    entry of sections. render(fragment_path, *args) must lay out the fragment
+    for one sections entry (a tuple of JSON-serialisable args) and be a
+    module-level function, so pool workers can run it. digest is recorded as
+    the merged PDF's content hash. Returns how many fragments were reused
+    from the cache.
+    """
+    directory = os.path.join(cache_dir, name)
+    os.makedirs(directory, exist_ok=True)
+
+    fragments = []
+    missing = []
+    for args in sections:
+        fragment = os.path.join(directory, section_hash(name, args) + ".pdf")
+        fragments.append(fragment)
+        if not os.path.exists(fragment):
+            missing.append((render, fragment, args))
+
+    if len(missing) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(missing))) as pool:
+            list(pool.map(_render, missing))
+    else:
+        for job in missing:
+            _render(job)
+
+    # The title page carries the date, so it is the one part rendered every time
+    title_path = os.path.join(directory, f"title.{os.getpid()}.tmp")
+    build_pdf(title_path, title_story)
+    writer = PdfWriter()
+    try:
+        writer.append(title_path)
+        for fragment in fragments:
+            writer.append(fragment)
+        if digest:
+            writer.add_metadata({"/Keywords": hash_keywords(digest)})
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            writer.write(f)
+        os.replace(tmp_path, path)
+    finally:
+        writer.close()
+        os.remove(title_path)
+
+    used = set(fragments)
+    for entry in os.listdir(directory):
+        entry_path = os.path.join(directory, entry)
+        if entry.endswith(".pdf") and entry_path not in used:
+            os.remove(entry_path)
+
+    return len(fragments) - len(missing)
@@ -0,0 +1,164 @@
+"""
+Retries for failed crawl tasks, and a request-rate limit.
+
+A unit or menu that raises used to be dropped on the spot (the menu loop broke
+out of its restaurant, a unit error just clicked "Back" and moved on), so one
+slow response could cost a whole restaurant until the next full run. Instead,
+the crawls now run each unit, and each menu that failed within its unit, as a
+task of a RetryScheduler: a failed task goes back into the queue to run again
+after an exponentially growing, jittered delay, until it succeeds, runs out of
+attempts, or the process' retry budget is spent (so a site outage doesn't turn
+into an endless retry loop). Other units carry on while a retry waits.
+
+Every task's outcome (ok / failed, attempts, errors, seconds) is kept and ends
+up in the run's metrics.json (see run_metrics.py).
+
+TokenBucket spaces out the requests themselves: the Chrome crawl takes a token
+before every page load (throttle_driver) and every click (PageWaits.click, since
+the scrapers click through a script call, not WebDriver's clickElement), and the
+HTTP crawl before every request, so parallel workers and the fast HTTP mode stay
+under the site's throttling.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 2.0
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_RETRY_BUDGET = 25
+DEFAULT_RATE = 4.0  # requests per second, shared by all workers
+
+# WebDriver commands that make the page talk to the site (script clicks are
+# throttled by PageWaits.click, as a script call alone may not)
+THROTTLED_COMMANDS = ("clickElement", "get", "refresh")
+
+
+class TokenBucket:
+    """Allow `rate` acquisitions per second on average, bursts of up to `burst`"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.waited = 0.0
+        self.lock = threading.Lock()
+
+    def take(self):
+        """Block until a token is free and take it; returns the seconds waited"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is the queue ahead of us; sleep it off outside the lock
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+def throttle_driver(driver, bucket):
+    """Take a token from bucket before each of the driver's page-loading commands"""
+    execute = driver.execute
+
+    def throttled(driver_command, params=None):
+        if driver_command in THROTTLED_COMMANDS:
+            bucket.take()
+        return execute(driver_command, params)
+
+    driver.execute = throttled
+    return driver
+
+
+class RetryScheduler:
+    """
+    Runs tasks, re-queueing the ones that raise with exponential backoff.
+
+    recover(), if given, is called after every failure to get back to a known
+    state (e.g. reload the unit list) before anything else runs.
+    """
+
+    def __init__(self, attempts=DEFAULT_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, budget=DEFAULT_RETRY_BUDGET, recover=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.recover = recover
+        self.queue = []  # (due, seq, key, fn, args)
+        self.seq = itertools.count()
+        self.outcomes = {}
+
+    def _outcome(self, key):
+        return self.outcomes.setdefault(key, {"status": "pending", "attempts": 0, "errors": [], "seconds": 0.0})
+
+    def backoff(self, attempt):
+        """Delay before retry number `attempt` (1-based): doubling, capped, with ±50% jitter"""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * random.uniform(0.5, 1.5)
+
+    def failed(self, key, fn, args, error):
+        """Record a failed attempt of key and re-queue it if attempts and budget allow"""
+        outcome = self._outcome(key)
+        outcome["errors"].append(f"{type(error).__name__}: {error}".strip()[:300])
+        if self.recover is not None:
+            try:
+                self.recover()
+            except Exception as e:
+                outcome["errors"].append(f"recovery failed: {type(e).__name__}: {e}"[:300])
+        if outcome["attempts"] < self.attempts and self.budget > 0:
+            self.budget -= 1
+            delay = self.backoff(outcome["attempts"])
+            outcome["status"] = "retrying"
+            heapq.heappush(self.queue, (time.monotonic() + delay, next(self.seq), key, fn, args))
+            print(f"[↻] {key} failed ({outcome['errors'][-1][:80]}), retry in {delay:.1f}s")
+        else:
+            outcome["status"] = "failed"
+            print(f"[X] {key} failed after {outcome['attempts']} attempt(s): {outcome['errors'][-1][:80]}")
+
+    def call(self, key, fn, *args):
+        """Run fn(*args) now; on failure queue a retry and return None"""
+        outcome = self._outcome(key)
+        outcome["attempts"] += 1
+        start = time.perf_counter()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            outcome["seconds"] += time.perf_counter() - start
+            self.failed(key, fn, args, e)
+            return None
+        outcome["seconds"] += time.perf_counter() - start
+        outcome["status"] = "ok"
+        return result
+
+    def defer(self, key, fn, *args, error):
+        """Count an attempt that already failed elsewhere and schedule fn(*args) to retry it"""
+        self._outcome(key)["attempts"] += 1
+        self.failed(key, fn, args, error)
+
+    def run(self, wait=True):
+        """Run the queued retries that are due (with wait, sleep until every retry has run)"""
+        while self.queue:
+            due = self.queue[0][0]
+            now = time.monotonic()
+            if due > now:
+                if not wait:
+                    return
+                time.sleep(due - now)
+            _, _, key, fn, args = heapq.heappop(self.queue)
+            self.call(key, fn, *args)
+
+    def pending(self):
+        return len(self.queue)
+
+    def report(self, prefix=""):
+        statuses = [o["status"] for o in self.outcomes.values()]
+        retried = sum(1 for o in self.outcomes.values() if o["status"] == "ok" and o["attempts"] > 1)
+        print(f"{prefix}[↻] Tasks: {statuses.count('ok')} ok ({retried} after a retry), "
+              f"{statuses.count('failed')} failed")
@@ -0,0 +1,168 @@
+"""
+Numbers about a scraper run, for benchmarks and regression tracking.
+
+Each stage of a run (hours fetch, driver boot, disclaimer, every unit, menu,
+row extraction and nutrition label open/parse/close, TXT write, PDF build...)
+is timed with stage(), and every WebDriver command a crawl browser sends is
+counted (by wrapping the driver's execute()). Parallel workers each hold their
+own numbers, so every process drops a part file next to the metrics file when
+it finishes, and the parent merges them into the single metrics JSON: per
+stage count, total, p50/p95/max and the slowest labelled samples (e.g. which
+units took longest), plus WebDriver call counts and the outcome of every
+retry-scheduled crawl task (see retry_scheduler.py).
+"""
+
+import glob
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+DEFAULT_PATH = "outputs/metrics.json"
+SLOWEST_KEPT = 3
+
+webdriver_calls = Counter()
+samples = {}  # stage -> [[seconds, label], ...]
+tasks = {}    # task key -> outcome
+
+
+def record(name, seconds, label=None):
+    """Add one sample of `name` (label e.g. the unit's name)"""
+    # list.append is atomic, so startup threads can record side by side
+    samples.setdefault(name, []).append([seconds, label])
+
+
+@contextmanager
+def stage(name, label=None):
+    """Time the enclosed block as one sample of `name`"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, label)
+
+
+def timed(name, fn):
+    """fn wrapped so each call is recorded as a sample of `name`"""
+    def wrapper(*args, **kwargs):
+        with stage(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def record_tasks(outcomes):
+    """Keep a RetryScheduler's task outcomes for the metrics file"""
+    tasks.update(outcomes)
+
+
+def count_webdriver_calls(driver):
+    """Count every command this driver sends from now on"""
+    execute = driver.execute
+
+    def counted(driver_command, params=None):
+        webdriver_calls[driver_command] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counted
+    return driver
+
+
+def save_part(metrics_path):
+    """
+    Leave this process' numbers for the parent to merge, and start over (so a
+    parent flushing before it forks workers doesn't hand them its samples).
+    """
+    os.makedirs(os.path.dirname(metrics_path) or ".", exist_ok=True)
+    with open(f"{metrics_path}.part_{os.getpid()}_{time.time_ns()}", "w", encoding="utf-8") as f:
+        json.dump({"webdriver_calls": dict(webdriver_calls), "samples": samples, "tasks": tasks}, f)
+    webdriver_calls.clear()
+    samples.clear()
+    tasks.clear()
+
+
+def collect_parts(metrics_path):
+    """Merge and remove every part file, together with this process' unsaved numbers"""
+    calls = Counter(webdriver_calls)
+    merged = {name: list(values) for name, values in samples.items()}
+    outcomes = dict(tasks)
+    for path in glob.glob(f"{glob.escape(metrics_path)}.part_*"):
+        with open(path, "r", encoding="utf-8") as f:
+            part = json.load(f)
+        os.remove(path)
+        calls.update(part.get("webdriver_calls", {}))
+        for name, values in part.get("samples", {}).items():
+            merged.setdefault(name, []).extend(values)
+        outcomes.update(part.get("tasks", {}))
+    return calls, merged, outcomes
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize_stages(merged):
+    stages = {}
+    for name, values in merged.items():
+        durations = sorted(seconds for seconds, _ in values)
+        entry = {
+            "count": len(durations),
+            "total_seconds": round(sum(durations), 3),
+            "p50_seconds": round(percentile(durations, 50), 4),
+            "p95_seconds": round(percentile(durations, 95), 4),
+            "max_seconds": round(durations[-1], 4),
+        }
+        labelled = sorted((v for v in values if v[1]), key=lambda v: v[0], reverse=True)
+        if labelled:
+            entry["slowest"] = [{"label": label, "seconds": round(seconds, 3)}
+                                for seconds, label in labelled[:SLOWEST_KEPT]]
+        stages[name] = entry
+    return dict(sorted(stages.items(), key=lambda kv: kv[1]["total_seconds"], reverse=True))
+
+
+def summarize_tasks(outcomes):
+    statuses = [o["status"] for o in outcomes.values()]
+    return {
+        "ok": statuses.count("ok"),
+        "ok_after_retry": sum(1 for o in outcomes.values() if o["status"] == "ok" and o["attempts"] > 1),
+        "failed": statuses.count("failed"),
+        "by_task": {key: dict(o, seconds=round(o["seconds"], 3)) for key, o in sorted(outcomes.items())},
+    }
+
+
+def write_metrics(metrics_path, wall_seconds, items, extra=None):
+    calls, merged, outcomes = collect_parts(metrics_path)
+    metrics = {
+        "wall_seconds": round(wall_seconds, 3),
+        "items": items,
+        "items_per_second": round(items / wall_seconds, 2) if wall_seconds else 0,
+        "webdriver_calls": {"total": sum(calls.values()), "by_command": dict(calls.most_common())},
+        "stages": summarize_stages(merged),
+        "tasks": summarize_tasks(outcomes),
+    }
+    metrics.update(extra or {})
+    os.makedirs(os.path.dirname(metrics_path) or ".", exist_ok=True)
+    with open(metrics_path, "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2, ensure_ascii=False)
+    return metrics
+
+
+def print_summary(metrics, top=8):
+    print(f"\n[⏱] {metrics['items']} items in {metrics['wall_seconds']:.1f}s "
+          f"({metrics['items_per_second']:.1f}/s), {metrics['webdriver_calls']['total']} WebDriver calls")
+    print(f"    {'stage':<18}{'count':>7}{'total s':>10}{'p50 s':>9}{'p95 s':>9}")
+    for name, s in list(metrics["stages"].items())[:top]:
+        print(f"    {name:<18}{s['count']:>7}{s['total_seconds']:>10.1f}{s['p50_seconds']:>9.3f}{s['p95_seconds']:>9.3f}")
+    slow_units = metrics["stages"].get("unit", {}).get("slowest", [])
+    if slow_units:
+        print("    slowest units: " + ", ".join(f"{u['label']} ({u['seconds']:.1f}s)" for u in slow_units))
+    t = metrics["tasks"]
+    if t["by_task"]:
+        print(f"    tasks: {t['ok']} ok ({t['ok_after_retry']} after a retry), {t['failed']} failed")
+        for key, outcome in t["by_task"].items():
+            if outcome["status"] != "ok":
+                print(f"      [X] {key}: {outcome['errors'][-1] if outcome['errors'] else outcome['status']}")
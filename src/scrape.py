@@ -4,7 +4,8 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.options import Options
-import time
+from menu_rows import extract_menu_rows, group_rows
+from page_waits import PageWaits
 
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
@@ -19,34 +20,35 @@ options.add_argument("--no-default-browser-check")
 options.add_argument("--disable-default-apps")
 options.add_argument("--guest")  # Optional: forces a guest session
 
-SECONDS_TO_WAIT = 1
-
 # Initialize driver
 print("Initializing Chrome driver...")
 driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
 driver.get("https://netnutrition.cbord.com/nn-prod/Duke")
+waits = PageWaits(driver)
+waits.page_ready()
 print("Page loaded.")
 
-def safe_click(by, selector, desc="element", delay=SECONDS_TO_WAIT):
+def safe_click(by, selector, desc="element", wait=None):
     try:
         elem = driver.find_element(by, selector)
-        driver.execute_script("arguments[0].click();", elem)
+        (wait or waits.click)(elem)
         print(f"[✓] Clicked {desc}")
-        time.sleep(delay)
         return True
     except Exception as e:
         print(f"[X] Could not click {desc}: {e}")
         return False
 
+def log_meal(row):
+    print(f"      [Meal] {row['name']}")
+    return row["name"]
+
 # Step 1: Dismiss modal
 print("\n[Step 1] Dismissing modal...")
-time.sleep(SECONDS_TO_WAIT)
-safe_click(By.XPATH, '//button[contains(@onclick, "setIgnoreMobileDisc")]', "Continue button")
+safe_click(By.XPATH, '//button[contains(@onclick, "setIgnoreMobileDisc")]', "Continue button", wait=waits.click_and_wait_for_units)
 
 # Step 2: Click "Only show Halal" in traitsPanel
 print("\n[Step 2] Applying Halal filter...")
-time.sleep(SECONDS_TO_WAIT)
-safe_click(By.ID, "pref_-99", "Halal filter")
+safe_click(By.ID, "pref_-99", "Halal filter", wait=waits.click_and_wait_for_filter)
 
 # Step 3: Iterate through open dining units
 print("\n[Step 3] Iterating through dining units...")
@@ -63,8 +65,7 @@ for unit in units:
 
         name = unit.find_element(By.TAG_NAME, "a").text.strip()
         print(f"\n[Unit] Opening: {name}")
-        driver.execute_script("arguments[0].click();", unit.find_element(By.TAG_NAME, "a"))
-        time.sleep(SECONDS_TO_WAIT)
+        waits.click_and_wait_for_panel(unit.find_element(By.TAG_NAME, "a"))
 
         # Locate menu panel
         menu_links = []
@@ -91,46 +92,12 @@ for unit in units:
                     if name not in halal_data:
                         halal_data[name] = {}
 
-                    rows = driver.find_elements(By.CSS_SELECTOR, "table.table tbody tr")
+                    rows = extract_menu_rows(driver)
                     print(f"  Found {len(rows)} rows in menu table.")
-
-                    current_category = None
-
-                    for idx, row in enumerate(rows):
-                        row_class = row.get_attribute("class")
-                        print(f"    Row {idx} class: {row_class}")
-
-                        if "itemGroupRow" in row_class:
-                            try:
-                                category_text = row.find_element(By.CSS_SELECTOR, "div[role='button']").text.strip()
-                                current_category = category_text
-                                print(f"\n    [Category] {current_category}")
-                                if current_category and current_category not in halal_data[name]:
-                                    halal_data[name][current_category] = []
-                            except NoSuchElementException as e:
-                                print(f"    [X] Failed to extract category: {e}")
-                                current_category = "Uncategorized"
-                                if current_category not in halal_data[name]:
-                                    halal_data[name][current_category] = []
-
-                        elif "itemPrimaryRow" in row_class or "itemAlternateRow" in row_class:
-                            if not current_category:
-                                current_category = "Uncategorized"
-                                if current_category not in halal_data[name]:
-                                    halal_data[name][current_category] = []
-                            try:
-                                meal_elem = row.find_element(By.CSS_SELECTOR, "td a.cbo_nn_itemHover")
-                                meal_full_text = meal_elem.get_attribute("innerText").strip()
-                                meal_name = meal_full_text.split("\n")[0]
-                                if meal_name:
-                                    print(f"      [Meal] {meal_name}")
-                                    if meal_name not in halal_data[name][current_category]:
-                                        halal_data[name][current_category].append(meal_name)
-                            except NoSuchElementException:
-                                print("      [!] Meal link not found in row.")
+                    group_rows(rows, halal_data[name], False, log_meal, unique=True)
 
                 # Go back to restaurant list
-                safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back to restaurant list")
+                safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back to restaurant list", wait=waits.click_and_wait_for_units)
                 continue  # Skip normal menu loop
             except NoSuchElementException:
                 print(f"  [X] Neither menu panel nor item panel found for {name}. Skipping.")
@@ -147,8 +114,7 @@ for unit in units:
                 menu_link = menu_links[i]
                 label = menu_link.text.strip()
                 print(f"\n[Menu] Clicking: {label}")
-                driver.execute_script("arguments[0].click();", menu_link)
-                time.sleep(SECONDS_TO_WAIT)
+                waits.click_and_wait_for_panel(menu_link)
 
                 item_panel = driver.find_element(By.ID, "itemPanel")
                 panel_text = item_panel.text
@@ -159,52 +125,24 @@ for unit in units:
                     if name not in halal_data:
                         halal_data[name] = {}
 
-                    rows = driver.find_elements(By.CSS_SELECTOR, "table.table tbody tr")
+                    rows = extract_menu_rows(driver)
                     print(f"  Found {len(rows)} rows in menu table.")
+                    group_rows(rows, halal_data[name], True, log_meal, unique=True)
 
-                    current_category = None
-
-                    for idx, row in enumerate(rows):
-                        row_class = row.get_attribute("class")
-                        print(f"    Row {idx} class: {row_class}")
-
-                        if "itemGroupRow" in row_class:
-                            try:
-                                category_text = row.find_element(By.CSS_SELECTOR, "div[role='button']").text.strip()
-                                current_category = category_text
-                                print(f"\n    [Category] {current_category}")
-                                if current_category and current_category not in halal_data[name]:
-                                    halal_data[name][current_category] = []
-                            except NoSuchElementException as e:
-                                print(f"    [X] Failed to extract category: {e}")
-                                current_category = None
-
-                        elif "itemPrimaryRow" in row_class or "itemAlternateRow" in row_class:
-                            if current_category:
-                                try:
-                                    meal_elem = row.find_element(By.CSS_SELECTOR, "td a.cbo_nn_itemHover")
-                                    meal_full_text = meal_elem.get_attribute("innerText").strip()
-                                    meal_name = meal_full_text.split("\n")[0]  # Get only the first line
-                                    if meal_name:
-                                        print(f"      [Meal] {meal_name}")
-                                        if meal_name not in halal_data[name][current_category]:
-                                            halal_data[name][current_category].append(meal_name)
-                                except NoSuchElementException:
-                                    print("      [!] Meal link not found in row.")
-
-                safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back to menu list")
+                safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back to menu list", wait=waits.click_and_wait_for_menus)
             except Exception as e:
                 print(f"[X] Error in menu loop for '{name}' - {label}: {e}")
                 break
 
-        safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back to restaurant list")
+        safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back to restaurant list", wait=waits.click_and_wait_for_units)
 
     except Exception as e:
         print(f"[X] Error with restaurant: {e}")
-        safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back (error recovery)")
+        safe_click(By.XPATH, '//a[contains(text(), "Back")]', "Back (error recovery)", wait=waits.click_and_wait_for_units)
         continue
 
 driver.quit()
+waits.report()
 
 print("\n[✔] Scraping complete. Writing to file...")
 
@@ -0,0 +1,38 @@
+"""
+Concurrent startup for the scrapers.
+
+Fetching Campus Hours, downloading the DukeGroups ICS feed and booting Chrome
+(chromedriver lookup plus the first page load) are all I/O-bound and
+independent, so they run side by side in a thread pool and are joined before
+the crawl starts. The startup phase then costs about as long as its slowest
+step instead of the sum of all of them.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def run_startup(tasks):
+    """
+    Run each of tasks {name: callable} in its own thread and wait for all of
+    them. Returns {name: result}; a task that raised re-raises here once every
+    other task has finished, so a half-booted browser is never left behind.
+    """
+    timings = {}
+
+    def timed(name, fn):
+        start = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(tasks) or 1) as pool:
+        futures = {name: pool.submit(timed, name, fn) for name, fn in tasks.items()}
+    wall = time.perf_counter() - start
+
+    steps = ", ".join(f"{name} {timings[name]:.1f}s" for name in tasks)
+    serial = sum(timings.values())
+    print(f"[⏱] Startup: {wall:.1f}s ({steps}; {serial:.1f}s if run one after another)")
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from ics_parser import iter_events, parse_events
+
+NOW = datetime(2026, 10, 17, tzinfo=timezone.utc)
+
+
+def feed(*events):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0"]
+    for event in events:
+        lines += ["BEGIN:VEVENT", *event, "END:VEVENT"]
+    lines.append("END:VCALENDAR")
+    return "\r\n".join(lines) + "\r\n"
+
+
+WEEKLY = [
+    "UID:jumuah",
+    "SUMMARY:Jumu'ah",
+    "DTSTART;TZID=America/New_York:20261002T133000",
+    "DTEND;TZID=America/New_York:20261002T143000",
+    "RRULE:FREQ=WEEKLY;BYDAY=FR;COUNT=6",
+    "EXDATE;TZID=America/New_York:20261016T133000",
+]
+MOVED = [
+    "UID:jumuah",
+    "SUMMARY:Jumu'ah (moved)",
+    "RECURRENCE-ID;TZID=America/New_York:20261023T133000",
+    "DTSTART;TZID=America/New_York:20261023T150000",
+    "DTEND;TZID=America/New_York:20261023T160000",
+]
+
+
+def test_weekly_rule_keeps_wall_clock_time_minus_exdates_with_overrides():
+    events = parse_events(feed(WEEKLY, MOVED))
+    starts = [(e.start, e.summary) for e in events]
+    assert starts == [
+        (datetime(2026, 10, 2, 17, 30, tzinfo=timezone.utc), "Jumu'ah"),
+        (datetime(2026, 10, 9, 17, 30, tzinfo=timezone.utc), "Jumu'ah"),
+        # 10-16 is an EXDATE, 10-23 was moved to 3 PM
+        (datetime(2026, 10, 23, 19, 0, tzinfo=timezone.utc), "Jumu'ah (moved)"),
+        (datetime(2026, 10, 30, 17, 30, tzinfo=timezone.utc), "Jumu'ah"),
+        # DST ended on 11-01: still 1:30 PM in New York
+        (datetime(2026, 11, 6, 18, 30, tzinfo=timezone.utc), "Jumu'ah"),
+    ]
+    assert all(e.recurrence_id is not None for e in events)
+
+
+def test_monthly_by_ordinal_weekday():
+    events = parse_events(feed([
+        "UID:halaqa",
+        "SUMMARY:Halaqa",
+        "DTSTART;TZID=America/New_York:20261027T190000",
+        "DURATION:PT1H",
+        "RRULE:FREQ=MONTHLY;BYDAY=-1TU;UNTIL=20270201T000000Z",
+    ]))
+    assert [e.start.astimezone(ZoneInfo("America/New_York")).date().isoformat() for e in events] == [
+        "2026-10-27", "2026-11-24", "2026-12-29", "2027-01-26"]
+    assert all(e.end - e.start == timedelta(hours=1) for e in events)
+
+
+def test_unreadable_rule_is_listed_once_at_dtstart(capsys):
+    stats = {}
+    events = list(iter_events(feed([
+        "UID:bad",
+        "SUMMARY:Bad rule",
+        "DTSTART:20261020T220000Z",
+        "RRULE:FREQ=WEEKLY;INTERVAL=x",
+    ]), stats=stats))
+    assert [e.start for e in events] == [datetime(2026, 10, 20, 22, 0, tzinfo=timezone.utc)]
+    assert stats["bad_rules"] == 1
+    assert "Unreadable RRULE" in capsys.readouterr().out
+
+
+def test_recurrence_window_limits_only_recurrences():
+    one_offs = [
+        ["UID:past", "SUMMARY:Past", "DTSTART:20250101T170000Z", "DTEND:20250101T180000Z"],
+        ["UID:far", "SUMMARY:Far ahead", "DTSTART;VALUE=DATE:20280301"],
+    ]
+    events = parse_events(feed(WEEKLY, MOVED, *one_offs),
+                          recurrence_window=(NOW, NOW + timedelta(days=14)))
+    assert [e.summary for e in events] == ["Past", "Jumu'ah (moved)", "Jumu'ah", "Far ahead"]
+
+
+def test_folded_lines_escapes_and_chunked_input_agree():
+    text = feed([
+        "UID:folded",
+        "SUMMARY:Iftar\\, dinner\\; and\\n talk",
+        "DESCRIPTION:A long descrip",
+        " tion",
+        "DTSTART:20261101T220000Z",
+    ])
+    events = parse_events(text)
+    assert events[0].summary == "Iftar, dinner; and\n talk"
+    assert events[0].description == "A long description"
+    for size in (1, 7, 64):
+        assert parse_events(text[i:i + size] for i in range(0, len(text), size)) == events
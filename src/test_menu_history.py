@@ -0,0 +1,64 @@
+import pytest
+
+import menu_history
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = menu_history.connect(str(tmp_path / "history.db"))
+    yield conn
+    conn.close()
+
+
+def menus(*names, label=None):
+    meals = [{"name": name, "is_halal": True} for name in names]
+    if label is not None:
+        meals[0]["nutrition"] = label
+    return [("Marketplace", "Lunch", {"Entrees": meals})]
+
+
+def spans(conn, table="spans"):
+    return conn.execute(f"SELECT first_date, last_date FROM {table} ORDER BY first_date").fetchall()
+
+
+def test_unchanged_menu_extends_its_span(conn):
+    for day in ("2026-10-14", "2026-10-15", "2026-10-16"):
+        counts = menu_history.record_day(conn, menus("Shawarma", "Rice"), day)
+    assert counts["extended"] == 1 and counts["new_spans"] == 0
+    assert spans(conn) == [("2026-10-14", "2026-10-16")]
+    assert menu_history.served(conn, "Marketplace", "2026-10-15") == {
+        "Lunch": {"Entrees": [("Shawarma", True), ("Rice", True)]}}
+
+
+def test_changed_menu_starts_a_new_span(conn):
+    menu_history.record_day(conn, menus("Shawarma"), "2026-10-14")
+    menu_history.record_day(conn, menus("Falafel"), "2026-10-15")
+    menu_history.record_day(conn, menus("Shawarma"), "2026-10-16")
+    # Shawarma's span must not stretch over the day Falafel was served
+    assert spans(conn) == [("2026-10-14", "2026-10-14"), ("2026-10-15", "2026-10-15"),
+                           ("2026-10-16", "2026-10-16")]
+    assert [row["days"] for row in menu_history.frequency(conn, "shawarma")] == [2]
+
+
+def test_re_recording_an_earlier_day_never_shrinks_a_span(conn):
+    for day in ("2026-10-14", "2026-10-15", "2026-10-16"):
+        menu_history.record_day(conn, menus("Shawarma"), day)
+    counts = menu_history.record_day(conn, menus("Shawarma"), "2026-10-15")
+    assert counts["new_spans"] == 0
+    assert spans(conn) == [("2026-10-14", "2026-10-16")]
+
+
+def test_recording_the_day_before_a_span_extends_it_backwards(conn):
+    menu_history.record_day(conn, menus("Shawarma"), "2026-10-16")
+    menu_history.record_day(conn, menus("Shawarma"), "2026-10-15")
+    assert spans(conn) == [("2026-10-15", "2026-10-16")]
+
+
+def test_label_that_changes_back_gets_a_new_span(conn):
+    a, b = {"calories": "500"}, {"calories": "450"}
+    for day, label in (("2026-10-14", a), ("2026-10-15", b), ("2026-10-16", a)):
+        menu_history.record_day(conn, menus("Shawarma", label=label), day)
+    assert spans(conn, "label_spans") == [("2026-10-14", "2026-10-14"), ("2026-10-15", "2026-10-15"),
+                                          ("2026-10-16", "2026-10-16")]
+    assert menu_history.label_on(conn, "Shawarma", "2026-10-15") == b
+    assert menu_history.label_on(conn, "Shawarma", "2026-10-16") == a
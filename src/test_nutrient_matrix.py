@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from nutrient_matrix import NutrientMatrix, group_percentiles, normalize_nutrient
+
+
+@pytest.mark.parametrize("name, info, expected", [
+    ("Protein", {"amount": 12, "unit": "g"}, ("Protein", "g", 12.0)),
+    ("Protein <", {"amount": 1, "unit": "g"}, ("Protein", "g", 1.0)),
+    ("Sodium", {"amount": 0.5, "unit": "g"}, ("Sodium", "mg", 500.0)),
+    ("Potas.", {"amount": 300, "unit": "mg"}, ("Potassium", "mg", 300.0)),
+    ("Total Fat", {"amount": 1500, "unit": "mg"}, ("Total Fat", "g", 1.5)),
+    ("Vitamin A", {"amount": 400, "unit": "IU"}, ("Vitamin A (IU)", "IU", 400.0)),
+    ("Include 12 g Added Sugars", {"amount": None, "unit": None}, ("Added Sugars", "g", 12.0)),
+    ("Cholesterol", {"amount": 20, "unit": None}, ("Cholesterol", "mg", 20.0)),
+])
+def test_normalize_nutrient(name, info, expected):
+    column, unit, value = normalize_nutrient(name, info)
+    assert (column, unit) == expected[:2]
+    assert value == pytest.approx(expected[2])
+
+
+def test_normalize_nutrient_without_amount():
+    assert normalize_nutrient("Iron", {"amount": "-", "unit": "mg"}) is None
+
+
+def meal(name, sodium=None):
+    facts = {} if sodium is None else {"Sodium": {"amount": sodium, "unit": "mg"}}
+    return {"name": name, "nutrition": {"nutrition_facts": facts}}
+
+
+def test_group_percentiles_match_numpy_per_restaurant():
+    sodium = {"A": [300, 100, 200, 900], "B": [50], "C": [None, None]}
+    m = NutrientMatrix.from_restaurants(
+        (name, [{"name": "Menu", "meals": [meal(f"{name}{i}", v) for i, v in enumerate(values)]}])
+        for name, values in sodium.items())
+
+    result = group_percentiles(m, m.column("Sodium"), q=(0, 50, 90))
+    for j, values in enumerate(sodium.values()):
+        present = [v for v in values if v is not None]
+        if present:
+            np.testing.assert_allclose(result[:, j], np.percentile(present, (0, 50, 90)))
+        else:
+            assert np.isnan(result[:, j]).all()
+
+
+def test_group_percentiles_with_mask():
+    m = NutrientMatrix.from_restaurants([("A", [{"name": "Menu", "meals": [
+        meal("x", 100), meal("y", 200), meal("z", 900)]}])])
+    result = group_percentiles(m, m.column("Sodium"), q=(50,), mask=m.items != "z")
+    assert result[0, 0] == pytest.approx(150)